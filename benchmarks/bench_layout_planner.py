@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试 - 多模块目录布局规划
+
+测量不同模块数下规划目录和实际创建目录的耗时，检查每个模块的平均耗时保持稳定（线性扩展）
+
+使用方法:
+    python benchmarks/bench_layout_planner.py
+    python benchmarks/bench_layout_planner.py --modules 10 100 1000 5000 --check
+"""
+
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+from pathlib import Path
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.layout_planner import plan_project_layout
+from scripts.core.output_writer import OutputWriter
+
+# 最大模块数与最小模块数的每模块耗时之比超过该值时视为非线性
+MAX_PER_MODULE_RATIO = 3.0
+
+
+def measure(module_count, create=True):
+    """测量一次规划（和创建）的耗时，返回 (目录数, 规划秒数, 创建秒数)"""
+    module_names = [f"module-{i}" for i in range(module_count)]
+    
+    start = time.perf_counter()
+    directories = plan_project_layout(module_names)
+    plan_seconds = time.perf_counter() - start
+    
+    create_seconds = 0.0
+    if create:
+        temp_dir = tempfile.mkdtemp()
+        try:
+            start = time.perf_counter()
+            OutputWriter(temp_dir).make_dirs(directories)
+            create_seconds = time.perf_counter() - start
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    return len(directories), plan_seconds, create_seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="多模块目录布局规划基准测试")
+    parser.add_argument('--modules', type=int, nargs='+', default=[10, 100, 1000, 5000], help='模块数列表')
+    parser.add_argument('--no-create', action='store_true', help='只测量规划，不实际创建目录')
+    parser.add_argument('--check', action='store_true', help='每模块规划耗时非线性增长时返回非零退出码')
+    args = parser.parse_args(argv)
+    
+    print(f"{'模块数':>8} {'目录数':>8} {'规划(ms)':>10} {'每模块(us)':>12} {'创建(ms)':>10}")
+    per_module = []
+    for module_count in args.modules:
+        directory_count, plan_seconds, create_seconds = measure(module_count, not args.no_create)
+        per_module.append(plan_seconds / max(module_count, 1))
+        print(f"{module_count:>8} {directory_count:>8} {plan_seconds * 1000:>10.2f} "
+              f"{per_module[-1] * 1e6:>12.2f} {create_seconds * 1000:>10.2f}")
+    
+    ratio = per_module[-1] / per_module[0] if per_module[0] else 0.0
+    print(f"每模块耗时比（最大/最小模块数）: {ratio:.2f}")
+    
+    if args.check and ratio > MAX_PER_MODULE_RATIO:
+        print(f"规划耗时非线性增长（比值超过 {MAX_PER_MODULE_RATIO}）")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试套件 - 生成、模板加载和配置存储
+
+覆盖以下场景，每个场景重复多次取耗时统计，并单独运行一次测量内存峰值（tracemalloc），
+结果写入JSON文件，便于跨版本对比：
+
+- ContextGenerator.generate（单模块、多模块配置）和提示词片段拼装
+- ProjectGenerator.generate_from_config（每个ORM分支）
+- TemplateManager.extract_templates_from_markdown（大模板文件）
+- ConfigManagerV2.list_history_configs / search_configs（大量历史配置文件）
+
+使用方法:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --history-sizes 10000 --repeat 3 --output results.json
+    python benchmarks/bench_suite.py --only context project --baseline results-1.0.json --max-regression 1.5
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import argparse
+import statistics
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.context_generator import ContextGenerator
+from scripts.core.project_generator import ProjectGenerator
+from scripts.core.template_manager import TemplateManager
+from scripts.configs_main.config_manager_v2 import ConfigManagerV2
+
+# 结果文件格式版本
+RESULTS_VERSION = 1
+
+# ProjectGenerator 渲染计划用到的全部模板
+PROJECT_TEMPLATE_NAMES = [
+    "pom.xml.j2", "module-pom.xml.j2", "Application.java.j2",
+    "controller/HelloController.java.j2", "entity/User.java.j2",
+    "repository/UserRepository.java.j2", "mapper/UserMapper.java.j2",
+    "mapper/UserMapper.xml.j2", "test/ApplicationTest.java.j2",
+    "application.yml.j2", "logback-spring.xml.j2", "README.md.j2",
+    ".gitignore.j2", "Dockerfile.j2", "docker-compose.yml.j2"
+]
+
+# 合成模板正文：引用常见的配置字段和过滤器，接近真实模板的渲染开销
+TEMPLATE_BODY = """// {name}
+// project: {{{{ config.name }}}} ({{{{ config.package }}}}, {{{{ config.version }}}})
+{{% for key, value in config.tech_stack.items() %}}
+// {{{{ key }}}} = {{{{ value }}}}
+{{% endfor %}}
+{{% if module %}}// module: {{{{ module.name }}}}{{% endif %}}
+{{% for i in range(40) %}}
+public static final String FIELD_{{{{ i }}}} = "{{{{ config.name | upper }}}}_{{{{ i }}}}";
+{{% endfor %}}"""
+
+
+@dataclass
+class BenchmarkCase:
+    """基准测试场景"""
+    name: str
+    group: str
+    run: Callable[[Any], Any]
+    setup: Optional[Callable[[], Any]] = None  # 每次运行前调用（不计时），返回值传给 run
+    params: Optional[Dict[str, Any]] = None
+
+
+def make_context_config(module_count=0):
+    """构造 ContextGenerator 配置"""
+    config = {
+        'project_name': 'bench-project',
+        'package_name': 'com.example.bench',
+        'version': '1.0.0',
+        'description': 'Benchmark project',
+        'jdk_version': '17',
+        'build_tool': 'Maven',
+        'spring_boot_version': '3.2.0',
+        'database': 'MySQL',
+        'orm_framework': 'MyBatis',
+        'cache': 'Redis',
+        'message_queue': 'RabbitMQ',
+        'include_swagger': True,
+        'include_security': True,
+        'include_actuator': True,
+        'generate_sample_code': True,
+        'generate_tests': True,
+        'generate_docker': True,
+        'generate_readme': True,
+        'is_multi_module': module_count > 0,
+        'modules': [
+            {'name': f'module-{i}', 'description': f'Module {i}', 'type': 'service'}
+            for i in range(module_count)
+        ]
+    }
+    return config
+
+
+def make_project_config(output_dir, orm):
+    """构造 ProjectGenerator 配置（orm 为 None 时不使用数据库）"""
+    tech_stack = {"database": "mysql", "orm": orm} if orm else {}
+    return {
+        "name": "bench-project",
+        "package": "com.example.bench",
+        "version": "1.0.0",
+        "project_type": "single",
+        "tech_stack": tech_stack,
+        "output_dir": output_dir,
+        "generate_sample_code": True,
+        "generate_tests": True,
+        "generate_docker": True
+    }
+
+
+def make_template_markdown(block_count):
+    """构造包含 block_count 个模板块的Markdown模板库"""
+    blocks = ["# Spring Boot 模板库\n"]
+    for i in range(block_count):
+        name = PROJECT_TEMPLATE_NAMES[i] if i < len(PROJECT_TEMPLATE_NAMES) else f"extra/Template{i}.java.j2"
+        blocks.append(f"## 模板 {i}\n\n说明文字。\n\n### {name}\n```jinja2\n{TEMPLATE_BODY.format(name=name)}\n```\n")
+    return "\n".join(blocks)
+
+
+def populate_history(manager, count):
+    """写入 count 个合成历史配置文件"""
+    content = manager._generate_history_markdown("__CONFIG_ID__", make_context_config(), {
+        'project_name': '__NAME__',
+        'creator': 'bench',
+        'project_type': '__TYPE__',
+        'template_id': 'spring-boot-basic'
+    })
+    content = re.sub(r"(\*\*(创建时间|更新时间)\*\*: )[^\n]+", r"\1__CREATED__", content)
+    
+    for i in range(count):
+        config_id = f"project-{i:06d}-20240101-000000"
+        created_at = f"2024-01-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}"
+        text = (content.replace("__CONFIG_ID__", config_id)
+                .replace("__NAME__", f"project-{i:06d}")
+                .replace("__TYPE__", "multi" if i % 2 else "single")
+                .replace("__CREATED__", created_at))
+        (manager.history_path / f"{config_id}.md").write_text(text, encoding='utf-8')
+
+
+def build_cases(workspace: Path, history_sizes: List[int], template_blocks: int,
+                only: Optional[List[str]] = None) -> List[BenchmarkCase]:
+    """构建基准测试场景（only 非空时只构建名称包含任一关键字的场景）"""
+    cases = []
+    counter = iter(range(1 << 30))
+    
+    def wanted(name):
+        return not only or any(keyword in name for keyword in only)
+    
+    def fresh_dir(prefix):
+        path = workspace / f"{prefix}-{next(counter)}"
+        path.mkdir()
+        return path
+    
+    # ContextGenerator：每次使用新的生成器和输出目录（冷渲染、全新写入）
+    for label, module_count in (("single", 0), ("multi", 8)):
+        config = make_context_config(module_count)
+        cases.append(BenchmarkCase(
+            name=f"context_generate_{label}",
+            group="context",
+            setup=lambda: ContextGenerator(output_base_dir=fresh_dir("context"), verbose=False),
+            run=lambda generator, config=config: generator.generate(config),
+            params={"modules": module_count}
+        ))
+    
+    # 提示词拼装：只调用片段模板构建方法（不经过渲染缓存和写入），衡量每个项目的拼装开销
+    assembler = ContextGenerator(output_base_dir=fresh_dir("context"), verbose=False)
+    assembly_config = make_context_config()
+    cases.append(BenchmarkCase(
+        name="context_prompt_assembly",
+        group="context",
+        run=lambda _: (
+            assembler._build_user_prompt(assembly_config),
+            assembler._build_gemini_commands(assembly_config),
+            assembler._build_claude_commands(assembly_config),
+            assembler._build_execution_plan(assembly_config, generated_at="-")
+        )
+    ))
+    
+    # ProjectGenerator：共享模板库和生成器，每次写入新的输出目录
+    templates_dir = workspace / "templates"
+    templates_dir.mkdir()
+    (templates_dir / "spring-boot-templates.md").write_text(
+        make_template_markdown(len(PROJECT_TEMPLATE_NAMES)), encoding='utf-8'
+    )
+    project_generator = ProjectGenerator(
+        template_manager=TemplateManager(str(templates_dir)),
+        bytecode_cache_dir=str(workspace / "bytecode-cache")
+    )
+    # 渲染计划的三个分支：MyBatis、JPA、无数据库（不生成实体和数据访问示例）
+    for orm in ("mybatis", "jpa", None):
+        cases.append(BenchmarkCase(
+            name=f"project_generate_{orm or 'no_database'}",
+            group="project",
+            setup=lambda orm=orm: make_project_config(str(fresh_dir("project")), orm),
+            run=lambda config: project_generator.generate_from_config(config, use_sequential_naming=False),
+            params={"orm": orm}
+        ))
+    
+    # 大模板文件解析
+    markdown = make_template_markdown(template_blocks)
+    template_manager = TemplateManager(str(templates_dir))
+    cases.append(BenchmarkCase(
+        name="template_extract_markdown",
+        group="template",
+        run=lambda _: template_manager.extract_templates_from_markdown(markdown),
+        params={"blocks": template_blocks, "bytes": len(markdown.encode('utf-8'))}
+    ))
+    
+    # 历史配置列表和搜索（准备数据耗时较长，未选中时跳过）
+    for size in history_sizes:
+        if not (wanted(f"config_list_history_{size}") or wanted(f"config_search_{size}")):
+            continue
+        manager = ConfigManagerV2(str(workspace / f"configs-{size}"))
+        populate_history(manager, size)
+        cases.append(BenchmarkCase(
+            name=f"config_list_history_{size}",
+            group="config",
+            run=lambda _, manager=manager: manager.list_history_configs(),
+            params={"files": size}
+        ))
+        cases.append(BenchmarkCase(
+            name=f"config_search_{size}",
+            group="config",
+            run=lambda _, manager=manager: manager.search_configs("project-0000", "history"),
+            params={"files": size}
+        ))
+    
+    return [case for case in cases if wanted(case.name)]
+
+
+def run_case(case: BenchmarkCase, repeat: int, warmup: int = 1) -> Dict[str, Any]:
+    """运行一个场景，返回耗时统计（毫秒）和内存峰值（字节）"""
+    def prepare():
+        return case.setup() if case.setup else None
+    
+    for _ in range(warmup):
+        case.run(prepare())
+    
+    timings = []
+    for _ in range(repeat):
+        state = prepare()
+        start = time.perf_counter()
+        case.run(state)
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    # tracemalloc 会显著拖慢执行，内存峰值单独测量
+    state = prepare()
+    tracemalloc.start()
+    try:
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        "name": case.name,
+        "group": case.group,
+        "params": case.params or {},
+        "repeat": repeat,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "stdev_ms": round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+        "peak_memory_bytes": peak
+    }
+
+
+def load_baseline(path) -> Dict[str, Dict[str, Any]]:
+    """读取基线结果文件，返回 场景名称 → 结果"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {result["name"]: result for result in data.get("results", [])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="生成器基准测试套件")
+    parser.add_argument('--repeat', type=int, default=5, help='每个场景的计时次数（默认 5）')
+    parser.add_argument('--history-sizes', type=int, nargs='+', default=[10000, 100000], help='历史配置文件数量列表')
+    parser.add_argument('--template-blocks', type=int, default=2000, help='大模板文件中的模板块数量')
+    parser.add_argument('--only', nargs='+', help='只运行名称包含任一关键字的场景')
+    parser.add_argument('--output', default='benchmark_results.json', help='结果JSON文件（默认 benchmark_results.json）')
+    parser.add_argument('--baseline', help='与之对比的基线结果JSON文件')
+    parser.add_argument('--max-regression', type=float, help='中位耗时超过基线的该倍数时返回非零退出码')
+    args = parser.parse_args(argv)
+    
+    baseline = load_baseline(args.baseline) if args.baseline else {}
+    output_path = Path(args.output).resolve()
+    # ContextGenerator 按相对路径查找提示词模板，切换到项目根目录运行
+    os.chdir(project_root)
+    
+    workspace = Path(tempfile.mkdtemp(prefix="bench-"))
+    results = []
+    try:
+        print(f"准备基准测试数据: {workspace}")
+        cases = build_cases(workspace, args.history_sizes, args.template_blocks, args.only)
+        
+        print(f"{'场景':<28} {'中位(ms)':>10} {'最小(ms)':>10} {'内存峰值(KB)':>14} {'对比基线':>10}")
+        for case in cases:
+            result = run_case(case, args.repeat)
+            base = baseline.get(case.name)
+            if base and base.get("median_ms"):
+                result["baseline_ratio"] = round(result["median_ms"] / base["median_ms"], 3)
+            results.append(result)
+            
+            ratio = f"{result['baseline_ratio']:.2f}x" if "baseline_ratio" in result else "-"
+            print(f"{case.name:<28} {result['median_ms']:>10.2f} {result['min_ms']:>10.2f} "
+                  f"{result['peak_memory_bytes'] / 1024:>14.1f} {ratio:>10}")
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+    
+    report = {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now().isoformat(timespec='seconds'),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine()
+        },
+        "parameters": {
+            "repeat": args.repeat,
+            "history_sizes": args.history_sizes,
+            "template_blocks": args.template_blocks
+        },
+        "results": results
+    }
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入: {output_path}")
+    
+    if args.max_regression:
+        regressions = [r for r in results if r.get("baseline_ratio", 0) > args.max_regression]
+        for result in regressions:
+            print(f"性能回退: {result['name']} 为基线的 {result['baseline_ratio']:.2f} 倍")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,17 +18,22 @@
 - v2.0.0 (2025-01-07): 配置管理系统V2重构
 
 使用方法:
-    python main.py
+    python main.py                                  # 交互式界面
+    python main.py batch manifest.jsonl [--workers N] [--timeout S]  # 批量生成
+    python main.py archive config.json [--format zip] [-o out.zip]   # 内存生成并导出归档
+    python main.py gc [--output DIR]                                 # 清理未引用的去重blob
+    python main.py generate --config config.json [--out DIR]         # 无交互生成（供CI调用）
+    python main.py serve [--port 8765 | --socket PATH]               # 常驻生成服务
+    python main.py client config.json [--archive tar.gz -o out.tgz]  # 向常驻服务发送生成请求
 """
 
 import sys
 import os
+import json
+import time
 import logging
+import argparse
 from pathlib import Path
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-from rich.prompt import Prompt, Confirm
 from datetime import datetime
 
 # 添加项目根目录到Python路径
@@ -54,26 +59,166 @@ def setup_logging():
     )
     return logging.getLogger(__name__)
 
-# 初始化日志
-logger = setup_logging()
 
-try:
-    from scripts.core.context_generator import ContextGenerator
-    from scripts.core.config_collector import ConfigCollector
-except ImportError as e:
-    print(f"导入错误: {e}")
-    print("请确保所有依赖已正确安装")
-    sys.exit(1)
+# 日志在 main() 中配置；rich、jinja2 和生成器模块在用到时才导入，缩短无界面命令的启动时间
+logger = logging.getLogger(__name__)
+
+from scripts.utils.lazy_console import LazyConsole
+from scripts.utils.tracing import enable_tracing, disable_tracing
+
+console = LazyConsole()
 
-console = Console()
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(
+        description="Java项目上下文工程生成器",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例用法:
+  %(prog)s                                   # 启动交互式界面
+  %(prog)s generate --config config.json     # 无交互生成到 ./output
+  %(prog)s serve --socket /tmp/gen.sock      # 启动常驻生成服务（模板常驻内存）
+  %(prog)s client config.json --socket /tmp/gen.sock  # 通过常驻服务生成
+  %(prog)s watch a.json b.json               # 模板或配置变化时自动重新生成
+  %(prog)s batch manifest.jsonl              # 按清单批量生成
+  %(prog)s batch manifest.json --workers 8   # 指定工作进程数
+  %(prog)s batch manifest.jsonl --dry-run    # 只估算文件数、磁盘占用和渲染耗时，不写入
+  %(prog)s archive config.json > out.tar.gz  # 不落盘，归档写到标准输出
+  %(prog)s gc                                # 清理 output/.blobs 中未引用的blob
+  %(prog)s compile-templates                 # 预编译全部模板（构建步骤，启动时跳过模板编译）
+  %(prog)s check-cache-prefix config.json    # 验证缓存友好布局的前缀在配置矩阵上逐字节一致
+  %(prog)s --trace trace.json generate --config config.json  # 记录各阶段耗时（Chrome trace格式）
+"""
+    )
+    parser.add_argument('--trace', metavar='FILE', help='将各阶段耗时写入Chrome trace格式的JSON文件（可用 chrome://tracing 或 Perfetto 打开）；只记录当前进程，不含 batch 的工作进程')
+    subparsers = parser.add_subparsers(dest='command')
+    
+    # 无交互生成命令
+    generate_parser = subparsers.add_parser('generate', help='按配置文件无交互生成上下文工程（适合CI等脚本调用）')
+    generate_parser.add_argument('--config', required=True, help='项目配置文件路径（JSON）')
+    generate_parser.add_argument('--out', default='./output', help='输出根目录，项目生成到其中的项目名称子目录（默认 ./output）')
+    generate_parser.add_argument('--dry-run', action='store_true', help='只渲染不写入，以JSON输出每个文件的路径、字节数和渲染耗时')
+    generate_parser.add_argument('--compact', action='store_true', help='精简模式：重复说明移到 shared_context.md，报告精简前后的token数')
+    generate_parser.add_argument('--token-budget', type=int, metavar='N', help='每个提示词产物的token预算，超出时按优先级裁剪章节（隐含 --compact）')
+    generate_parser.add_argument('--bundle', action='store_true', help='额外生成合并全部上下文文件的 context_bundle.md，斜杠命令只引用该文件')
+    generate_parser.add_argument('--cache-layout', action='store_true', help='缓存友好布局：与配置无关的说明在前、依赖配置的内容（含生成时间）在后，各项目共享相同的前缀')
+    generate_parser.add_argument('--max-tokens', type=int, metavar='N', help='全部产物的token总数上限，超出时退出码为1（产物和token_stats.json照常写入）')
+    
+    # 常驻生成服务
+    serve_parser = subparsers.add_parser('serve', help='启动常驻生成服务，模板环境常驻内存，通过本机HTTP或Unix套接字接收请求')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='监听地址，须为回环地址（默认 127.0.0.1）')
+    serve_parser.add_argument('--allow-remote', action='store_true', help='允许监听非回环地址（服务没有认证，仅在受信任的网络中使用）')
+    serve_parser.add_argument('--port', type=int, default=8765, help='监听端口（默认 8765）')
+    serve_parser.add_argument('--socket', help='改为监听Unix套接字')
+    serve_parser.add_argument('--output', default='./output', help='默认输出根目录（默认 ./output）')
+    
+    # 生成服务客户端
+    client_parser = subparsers.add_parser('client', help='向常驻生成服务发送生成请求')
+    client_parser.add_argument('config', help='项目配置文件路径（JSON）')
+    client_parser.add_argument('--server', default='http://127.0.0.1:8765', help='服务地址（默认 http://127.0.0.1:8765）')
+    client_parser.add_argument('--socket', help='通过Unix套接字连接服务')
+    client_parser.add_argument('--project', action='store_true', help='生成Spring Boot项目（默认生成上下文工程）')
+    client_parser.add_argument('--out', help='输出根目录（服务端路径，默认使用服务的输出根目录）')
+    client_parser.add_argument('--archive', choices=['tar.gz', 'zip'], help='在服务端内存中生成并返回归档')
+    client_parser.add_argument('-o', '--output', default='-', help='归档输出文件（默认 - 表示标准输出）')
+    
+    # 监视模式
+    watch_parser = subparsers.add_parser('watch', help='监视提示词模板和配置文件，变化后自动重新生成受影响的产物')
+    watch_parser.add_argument('configs', nargs='+', help='监视的项目配置文件（JSON）')
+    watch_parser.add_argument('--out', default='./output', help='输出根目录（默认 ./output）')
+    watch_parser.add_argument('--interval', type=float, default=0.5, help='轮询间隔秒数（默认 0.5）')
+    watch_parser.add_argument('--debounce', type=float, default=0.3, help='去抖时间秒数，连续保存只触发一次生成（默认 0.3）')
+    
+    # 批量生成命令
+    batch_parser = subparsers.add_parser('batch', help='从清单文件批量生成上下文工程')
+    batch_parser.add_argument('manifest', help='清单文件路径（JSON数组或JSONL，每项为一个项目配置）')
+    batch_parser.add_argument('--workers', type=int, help='工作进程数（默认读取 generator.max_concurrent_tasks）')
+    batch_parser.add_argument('--timeout', type=float, help='批次超时秒数（默认读取 generator.timeout_seconds）')
+    batch_parser.add_argument('--output', help='输出根目录（默认 ./output）')
+    batch_parser.add_argument('--report', help='将批量生成报告写入JSON文件')
+    batch_parser.add_argument('--dedup', action='store_true', help='内容相同的文件硬链接到输出根目录下的 .blobs 共享存储')
+    batch_parser.add_argument('--dry-run', action='store_true', help='只渲染不写入，汇总全部项目的文件数、字节数和渲染耗时')
+    
+    # 归档导出命令
+    archive_parser = subparsers.add_parser('archive', help='在内存中生成上下文工程并导出为归档')
+    archive_parser.add_argument('config', help='项目配置文件路径（JSON）')
+    archive_parser.add_argument('--format', choices=['tar.gz', 'zip'], default='tar.gz', help='归档格式（默认 tar.gz）')
+    archive_parser.add_argument('-o', '--output', default='-', help='归档输出文件（默认 - 表示标准输出）')
+    
+    # blob回收命令
+    gc_parser = subparsers.add_parser('gc', help='删除去重存储中不再被任何项目引用的blob')
+    gc_parser.add_argument('--output', default='./output', help='输出根目录（默认 ./output）')
+    
+    # 模板预编译命令
+    compile_parser = subparsers.add_parser('compile-templates', help='把全部模板预编译为Python模块，运行时源码未变化则跳过解析和编译')
+    compile_parser.add_argument('--out', help='预编译输出目录（默认 scripts/compiled_templates）')
+    
+    # 缓存前缀稳定性检查命令
+    prefix_parser = subparsers.add_parser('check-cache-prefix', help='以配置文件为基础构建配置矩阵，验证缓存友好布局下各产物的前缀逐字节一致')
+    prefix_parser.add_argument('config', help='基础配置文件路径（JSON）')
+    prefix_parser.add_argument('--bundle', action='store_true', help='同时检查合并上下文文件 context_bundle.md')
+    
+    return parser.parse_args(argv)
 
 
-def main():
+def main(argv=None):
     """主入口函数"""
+    args = parse_args(argv)
+    setup_logging()
+    
+    if args.trace:
+        enable_tracing()
+    
     try:
         logger.info("程序启动")
         
-        # 确保必要的目录存在
+        if args.command == 'generate':
+            exit_code = run_generate(args)
+            logger.info("程序正常结束")
+            sys.exit(exit_code)
+        
+        if args.command == 'serve':
+            exit_code = run_serve(args)
+            logger.info("程序正常结束")
+            sys.exit(exit_code)
+        
+        if args.command == 'client':
+            exit_code = run_client(args)
+            logger.info("程序正常结束")
+            sys.exit(exit_code)
+        
+        if args.command == 'watch':
+            exit_code = run_watch(args)
+            logger.info("程序正常结束")
+            sys.exit(exit_code)
+        
+        if args.command == 'batch':
+            exit_code = run_batch(args)
+            logger.info("程序正常结束")
+            sys.exit(exit_code)
+        
+        if args.command == 'archive':
+            exit_code = run_archive(args)
+            logger.info("程序正常结束")
+            sys.exit(exit_code)
+        
+        if args.command == 'gc':
+            exit_code = run_gc(args)
+            logger.info("程序正常结束")
+            sys.exit(exit_code)
+        
+        if args.command == 'compile-templates':
+            exit_code = run_compile_templates(args)
+            logger.info("程序正常结束")
+            sys.exit(exit_code)
+        
+        if args.command == 'check-cache-prefix':
+            exit_code = run_check_cache_prefix(args)
+            logger.info("程序正常结束")
+            sys.exit(exit_code)
+        
+        # 确保交互模式需要的目录存在
         ensure_directories()
         
         # 显示欢迎界面
@@ -115,10 +260,32 @@ def main():
         console.print("[yellow]💡 详细错误信息已记录到日志文件中[/yellow]")
         logger.error(error_msg, exc_info=True)
         sys.exit(1)
+    finally:
+        if args.trace:
+            write_trace(args.trace)
+
+
+def write_trace(path):
+    """写入追踪结果并停用追踪"""
+    tracer = disable_tracing()
+    if tracer is None:
+        return
+    
+    # 提示信息输出到标准错误，避免混入 archive 写到标准输出的归档数据
+    err_console = LazyConsole(stderr=True)
+    try:
+        tracer.write(path)
+        err_console.print(f"[blue]⏱️  追踪结果已写入: {path}（{len(tracer.events)} 个区间）[/blue]")
+    except OSError as e:
+        err_console.print(f"[red]❌ 写入追踪结果失败: {e}[/red]")
+        logger.error(f"写入追踪结果失败: {e}")
 
 
 def show_welcome():
     """显示欢迎界面"""
+    from rich.panel import Panel
+    from rich.text import Text
+    
     console.print(Panel.fit(
         Text("🚀 Java项目上下文工程生成器", style="bold blue"),
         subtitle="生成项目初始化的上下文提示词和Gemini斜杠命令",
@@ -129,6 +296,8 @@ def show_welcome():
 
 def interactive_main_menu():
     """交互式主菜单"""
+    from rich.prompt import Prompt
+    
     while True:
         console.print("[bold green]📋 请选择操作:[/bold green]")
         console.print("1. 🆕 生成上下文工程")
@@ -152,6 +321,11 @@ def interactive_main_menu():
 
 def generate_context_project():
     """生成上下文工程"""
+    from rich.panel import Panel
+    from rich.text import Text
+    from scripts.core.context_generator import ContextGenerator
+    from scripts.core.config_collector import ConfigCollector
+    
     console.print(Panel.fit(
         Text("🆕 生成上下文工程", style="bold green"),
         border_style="green"
@@ -203,6 +377,345 @@ def generate_context_project():
         logger.error(error_msg, exc_info=True)
 
 
+def run_generate(args):
+    """按配置文件无交互生成上下文工程，返回进程退出码
+    
+    标准输出只输出生成的项目路径，其余提示信息输出到标准错误，便于脚本解析
+    """
+    from contextlib import redirect_stdout
+    from scripts.core.context_generator import ContextGenerator, TokenThresholdExceeded
+    from scripts.validators.config_validator import ConfigValidator
+    
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    with redirect_stdout(sys.stderr):
+        errors = ConfigValidator().validate_config(config)
+        if errors:
+            for error in errors:
+                print(f"❌ {error}")
+            return 1
+        
+        generator = ContextGenerator(output_base_dir=args.out, verbose=False, create_dirs=not args.dry_run,
+                                     compact=args.compact, token_budget=args.token_budget,
+                                     token_threshold=args.max_tokens, bundle=args.bundle,
+                                     cache_layout=args.cache_layout)
+        if args.dry_run:
+            plan = generator.dry_run(config)
+        else:
+            try:
+                output_path = generator.generate(config)
+            except TokenThresholdExceeded:
+                # 超出token阈值：失败原因已由生成器输出，这里补充各文件的token数
+                if generator.last_token_stats:
+                    print_token_report(generator.last_token_stats)
+                return 1
+        
+        if generator.last_compact_result:
+            print_compact_report(generator.last_compact_result)
+        if generator.last_token_stats:
+            print_token_report(generator.last_token_stats)
+    
+    if args.dry_run:
+        print(json.dumps(plan.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print(output_path)
+    return 0
+
+
+def print_token_report(stats):
+    """输出各产物的token数和总数"""
+    for name, tokens in stats['files'].items():
+        print(f"{name}: {tokens} tokens")
+    line = f"token总数（估算）: {stats['total']}"
+    if stats['threshold'] is not None:
+        line += f"（阈值 {stats['threshold']}）"
+    print(line)
+
+
+def print_compact_report(result):
+    """输出精简模式各产物精简前后的token数"""
+    for item in result.artifacts:
+        line = f"{item.name}: {item.tokens_before} → {item.tokens_after} tokens"
+        if item.budget is not None:
+            line += f"（预算 {item.budget}{'，超出' if item.over_budget else ''}）"
+        if item.trimmed:
+            line += f"，省略 {len(item.trimmed)} 个章节"
+        print(line)
+    print(result.describe())
+
+
+def run_serve(args):
+    """启动常驻生成服务，返回进程退出码"""
+    import signal
+    from scripts.core.generation_server import GenerationService, create_server
+    
+    service = GenerationService(output_base_dir=args.output)
+    try:
+        server = create_server(service, args.host, args.port, args.socket, args.allow_remote)
+    except ValueError as e:
+        console.print(f"[red]❌ {e}[/red]")
+        return 1
+    compiled = service.warm_up()
+    
+    # 收到 SIGTERM（如被服务管理器停止）时与 Ctrl+C 一样正常退出，确保清理Unix套接字文件
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
+    address = args.socket or f"http://{server.server_address[0]}:{server.server_address[1]}"
+    console.print(f"[green]🚀 生成服务已启动: {address}（已预热 {compiled} 个模板，Ctrl+C 停止）[/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]👋 生成服务已停止[/yellow]")
+    finally:
+        server.server_close()
+    return 0
+
+
+def run_client(args):
+    """向常驻生成服务发送生成请求，返回进程退出码"""
+    from scripts.core.generation_client import GenerationClient
+    
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    client = GenerationClient(server_url=args.server, socket_path=args.socket)
+    kind = 'project' if args.project else 'context'
+    err_console = LazyConsole(stderr=True)
+    
+    try:
+        if args.archive:
+            data = client.archive(config, kind, args.archive)
+            if args.output == '-':
+                sys.stdout.buffer.write(data)
+                sys.stdout.buffer.flush()
+            else:
+                with open(args.output, 'wb') as f:
+                    f.write(data)
+                err_console.print(f"[green]📦 归档已写入: {args.output}（{len(data)} 字节）[/green]")
+        else:
+            print(client.generate(config, kind, args.out))
+    except ValueError as e:
+        err_console.print(f"[red]❌ {e}[/red]")
+        return 1
+    
+    return 0
+
+
+def run_watch(args):
+    """监视模板和配置文件并自动重新生成，返回进程退出码"""
+    from scripts.core.context_generator import ContextGenerator
+    from scripts.core.watcher import WatchSession, WATCHDOG_AVAILABLE
+    
+    generator = ContextGenerator(output_base_dir=args.out, verbose=False)
+    session = WatchSession(args.configs, generator, interval=args.interval, debounce=args.debounce)
+    
+    def report(result):
+        if result.changed_paths:
+            console.print(f"[cyan]🔄 检测到变化: {', '.join(result.changed_paths)}[/cyan]")
+        for config_path, names in result.rendered.items():
+            rendered = ', '.join(names) if names else '无（全部命中缓存）'
+            console.print(f"  {config_path}: 重新渲染 {rendered}")
+        for config_path, error in result.errors.items():
+            console.print(f"  [red]❌ {config_path}: {error}[/red]")
+        console.print(f"[green]✅ {result.describe()}[/green]")
+    
+    mode = "文件系统事件" if WATCHDOG_AVAILABLE else f"轮询（{args.interval}s）"
+    console.print(f"[blue]👀 监视模式已启动: {mode}，Ctrl+C 停止[/blue]")
+    try:
+        session.run(on_cycle=report)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]👋 监视模式已停止[/yellow]")
+    return 0
+
+
+def run_batch(args):
+    """按清单批量生成上下文工程，返回进程退出码"""
+    from scripts.core.batch_generator import BatchGenerator
+    
+    if args.dry_run:
+        return run_batch_dry_run(args)
+    
+    generator = BatchGenerator(
+        max_workers=args.workers,
+        timeout_seconds=args.timeout,
+        output_base_dir=args.output,
+        use_blob_store=args.dedup
+    )
+    console.print(
+        f"[blue]📦 批量生成: {args.manifest}（工作进程: {generator.max_workers}，"
+        f"超时: {generator.timeout_seconds:g}秒）[/blue]"
+    )
+    
+    report = generator.generate_from_manifest(args.manifest)
+    show_batch_report(report)
+    
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        console.print(f"[green]📄 报告已写入: {args.report}[/green]")
+    
+    return 0 if not report.failed else 1
+
+
+def run_batch_dry_run(args):
+    """预演批量生成：在当前进程中渲染全部项目并汇总输出计划，不写入任何文件"""
+    from contextlib import redirect_stdout
+    from scripts.core.batch_generator import load_manifest
+    from scripts.core.context_generator import ContextGenerator
+    from scripts.core.dry_run import summarize_plans
+    from scripts.validators.config_validator import ConfigValidator
+    
+    configs = load_manifest(args.manifest)
+    generator = ContextGenerator(output_base_dir=args.output, verbose=False, create_dirs=False)
+    validator = ConfigValidator()
+    plans, errors = [], {}
+    
+    console.print(f"[blue]🧪 预演批量生成: {args.manifest}（{len(configs)} 个项目，不写入文件）[/blue]")
+    start = time.perf_counter()
+    for index, config in enumerate(configs):
+        name = str(config.get('project_name') or f"#{index + 1}")
+        with redirect_stdout(sys.stderr):
+            validation_errors = validator.validate_config(config)
+        if validation_errors:
+            errors[name] = "; ".join(validation_errors)
+            continue
+        plans.append(generator.dry_run(config))
+    
+    summary = summarize_plans(plans)
+    summary["invalid"] = len(errors)
+    summary["wall_seconds"] = round(time.perf_counter() - start, 3)
+    
+    console.print(
+        f"[bold]项目: {summary['projects']}，文件: {summary['files']}，目录: {summary['directories']}，"
+        f"总大小: {summary['total_bytes']} 字节，渲染耗时: {summary['render_ms'] / 1000:.2f}s，"
+        f"预演耗时: {summary['wall_seconds']:.2f}s[/bold]"
+    )
+    for name, error in errors.items():
+        console.print(f"[red]❌ {name}: {error}[/red]")
+    
+    if args.report:
+        report = dict(summary, errors=errors, projects_detail=[plan.to_dict() for plan in plans])
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        console.print(f"[green]📄 报告已写入: {args.report}[/green]")
+    
+    return 0 if not errors else 1
+
+
+def run_archive(args):
+    """在内存中生成上下文工程并导出归档，返回进程退出码"""
+    from contextlib import redirect_stdout
+    from scripts.core.context_generator import ContextGenerator
+    from scripts.validators.config_validator import ConfigValidator
+    
+    # 归档可能写到标准输出，提示信息一律输出到标准错误
+    err_console = LazyConsole(stderr=True)
+    
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    # 验证器的提示同样不能混入标准输出中的归档数据
+    with redirect_stdout(sys.stderr):
+        errors = ConfigValidator().validate_config(config)
+    if errors:
+        for error in errors:
+            err_console.print(f"[red]❌ {error}[/red]")
+        return 1
+    
+    tree = ContextGenerator(verbose=False).generate_in_memory(config)
+    
+    if args.output == '-':
+        tree.export(sys.stdout.buffer, args.format)
+        sys.stdout.buffer.flush()
+    else:
+        with open(args.output, 'wb') as f:
+            tree.export(f, args.format)
+        err_console.print(f"[green]📦 归档已写入: {args.output}（{len(tree)} 个文件）[/green]")
+    
+    return 0
+
+
+def run_gc(args):
+    """删除去重存储中未被引用的blob，返回进程退出码"""
+    from scripts.core.blob_store import BlobStore
+    
+    store = BlobStore(args.output)
+    result = store.gc()
+    stats = store.get_stats()
+    
+    console.print(
+        f"[green]🧹 已删除 {result.removed} 个未引用的blob（{result.removed_bytes} 字节），"
+        f"保留 {result.kept} 个[/green]"
+    )
+    console.print(f"[blue]📦 去重存储: {stats['blobs']} 个blob，共节省 {stats['saved_bytes']} 字节[/blue]")
+    return 0
+
+
+def run_compile_templates(args):
+    """预编译上下文工程和Spring Boot项目的全部模板，返回进程退出码"""
+    from scripts.core.context_generator import ContextGenerator
+    from scripts.core.project_generator import ProjectGenerator
+    from scripts.core.template_precompile import DEFAULT_COMPILED_DIR, CONTEXT_TEMPLATES, PROJECT_TEMPLATES
+    
+    base_dir = Path(args.out) if args.out else DEFAULT_COMPILED_DIR
+    context_count = ContextGenerator(verbose=False, create_dirs=False).compile_templates(base_dir / CONTEXT_TEMPLATES)
+    project_count = ProjectGenerator().compile_templates(base_dir / PROJECT_TEMPLATES)
+    
+    console.print(
+        f"[green]✅ 已预编译 {context_count + project_count} 个模板到 {base_dir}"
+        f"（上下文工程 {context_count}，Spring Boot项目 {project_count}）[/green]"
+    )
+    return 0
+
+
+def run_check_cache_prefix(args):
+    """在配置矩阵上检查缓存友好布局的前缀稳定性，前缀不一致时返回1"""
+    from scripts.core.context_generator import ContextGenerator
+    from scripts.core.cache_layout import build_config_matrix, check_prefix_stability
+    
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    generator = ContextGenerator(verbose=False, create_dirs=False, cache_layout=True, bundle=args.bundle)
+    report = check_prefix_stability(build_config_matrix(config), generator)
+    for name, size in report.prefix_sizes.items():
+        status = "❌ 不一致（配置 #%d）" % report.unstable[name] if name in report.unstable else "✅"
+        console.print(f"{name}: 前缀 {size}/{report.total_sizes[name]} 字节 {status}")
+    
+    if report.stable:
+        console.print(f"[green]✅ {report.describe()}[/green]")
+        return 0
+    console.print(f"[red]❌ {report.describe()}[/red]")
+    return 1
+
+
+def show_batch_report(report):
+    """显示批量生成报告"""
+    from rich.table import Table
+    
+    table = Table(title="批量生成结果")
+    table.add_column("#", justify="right")
+    table.add_column("项目")
+    table.add_column("状态")
+    table.add_column("耗时(s)", justify="right")
+    table.add_column("输出路径 / 错误")
+    
+    for result in report.results:
+        status = "[green]成功[/green]" if result.success else "[red]失败[/red]"
+        detail = result.output_path if result.success else result.error
+        table.add_row(str(result.index + 1), result.project_name, status,
+                      f"{result.elapsed_seconds:.3f}", detail)
+    
+    console.print(table)
+    console.print(
+        f"[bold]总计: {len(report.results)}，成功: {len(report.succeeded)}，"
+        f"失败: {len(report.failed)}，总耗时: {report.elapsed_seconds:.2f}s[/bold]"
+    )
+
+
 def show_generated_files(output_path):
     """显示生成的文件列表"""
     console.print("\n[blue]📄 生成的文件:[/blue]")
@@ -217,6 +730,9 @@ def show_generated_files(output_path):
 
 def show_history_configs():
     """显示历史配置"""
+    from rich.panel import Panel
+    from rich.text import Text
+    
     console.print(Panel.fit(
         Text("📋 历史配置", style="bold blue"),
         border_style="blue"
@@ -230,7 +746,8 @@ def show_history_configs():
     
     configs = []
     for item in output_dir.iterdir():
-        if item.is_dir():
+        # 跳过生成中的暂存目录（以 "." 开头）
+        if item.is_dir() and not item.name.startswith("."):
             config_file = item / "config.json"
             if config_file.exists():
                 configs.append(item.name)
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+批量生成器模块
+负责从清单文件读取多个项目配置，并通过进程池并发生成上下文工程
+"""
+
+import json
+import time
+import logging
+import multiprocessing
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# system.json 缺失时使用的默认值，与 ConfigManagerV2 的默认系统配置保持一致
+DEFAULT_MAX_CONCURRENT_TASKS = 4
+DEFAULT_TIMEOUT_SECONDS = 300
+
+# 工作进程内复用的生成器实例，避免每个项目重复初始化模板环境
+_worker_generator = None
+_worker_key = None
+
+
+@dataclass
+class BatchTaskResult:
+    """单个项目的批量生成结果"""
+    index: int
+    project_name: str
+    success: bool
+    output_path: str = ""
+    error: str = ""
+    elapsed_seconds: float = 0.0
+
+
+@dataclass
+class BatchReport:
+    """批量生成汇总报告"""
+    results: List[BatchTaskResult] = field(default_factory=list)
+    max_workers: int = 1
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def succeeded(self) -> List[BatchTaskResult]:
+        return [r for r in self.results if r.success]
+    
+    @property
+    def failed(self) -> List[BatchTaskResult]:
+        return [r for r in self.results if not r.success]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典"""
+        return {
+            "total": len(self.results),
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "max_workers": self.max_workers,
+            "timeout_seconds": self.timeout_seconds,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "results": [asdict(r) for r in self.results]
+        }
+
+
+def load_manifest(manifest_path: str) -> List[Dict[str, Any]]:
+    """
+    读取批量生成清单
+    
+    支持两种格式：JSON数组（[config, ...]）或 JSONL（每行一个配置）
+    
+    Args:
+        manifest_path: 清单文件路径
+    
+    Returns:
+        List[Dict[str, Any]]: 项目配置列表
+    
+    Raises:
+        FileNotFoundError: 清单文件不存在
+        ValueError: 清单格式无效
+    """
+    path = Path(manifest_path)
+    if not path.is_file():
+        raise FileNotFoundError(f"清单文件不存在：{manifest_path}")
+    
+    content = path.read_text(encoding='utf-8').strip()
+    if not content:
+        return []
+    
+    if content.startswith('['):
+        try:
+            configs = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"清单JSON格式无效：{e}")
+    else:
+        configs = []
+        for line_no, line in enumerate(content.splitlines(), 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                configs.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"清单第{line_no}行JSON格式无效：{e}")
+    
+    for i, config in enumerate(configs):
+        if not isinstance(config, dict):
+            raise ValueError(f"清单第{i + 1}项不是配置对象")
+    
+    return configs
+
+
+def load_generator_settings(config_base_path: str = None) -> Dict[str, Any]:
+    """
+    从系统配置（system/system.json）读取生成器并发设置
+    
+    Args:
+        config_base_path: 配置根目录，默认为 scripts/configs_main
+    
+    Returns:
+        Dict[str, Any]: 包含 max_concurrent_tasks 和 timeout_seconds 的字典
+    """
+    settings = {
+        "max_concurrent_tasks": DEFAULT_MAX_CONCURRENT_TASKS,
+        "timeout_seconds": DEFAULT_TIMEOUT_SECONDS
+    }
+    
+    if config_base_path is None:
+        config_base_path = Path(__file__).parent.parent / "configs_main"
+    
+    try:
+        from ..configs_main.config_manager_v2 import ConfigManagerV2
+        system_config = ConfigManagerV2(str(config_base_path)).load_system_config()
+        generator = system_config.generator or {}
+        if generator.get("max_concurrent_tasks"):
+            settings["max_concurrent_tasks"] = int(generator["max_concurrent_tasks"])
+        if generator.get("timeout_seconds"):
+            settings["timeout_seconds"] = float(generator["timeout_seconds"])
+    except Exception as e:
+        logger.warning(f"读取系统配置失败，使用默认并发设置: {e}")
+    
+    return settings
+
+
+def _generate_project(index: int, config: Dict[str, Any], output_base_dir: Optional[str],
+                      use_blob_store: bool = False) -> BatchTaskResult:
+    """
+    工作进程入口：验证并生成单个项目的上下文工程
+    
+    必须是模块级函数，以便进程池序列化
+    """
+    global _worker_generator, _worker_key
+    
+    start = time.perf_counter()
+    project_name = str(config.get('project_name') or f"#{index + 1}")
+    
+    try:
+        from ..validators.config_validator import ConfigValidator
+        from .context_generator import ContextGenerator
+        
+        errors = ConfigValidator().validate_config(config)
+        if errors:
+            raise ValueError("; ".join(errors))
+        
+        if _worker_generator is None or _worker_key != (output_base_dir, use_blob_store):
+            _worker_generator = ContextGenerator(output_base_dir=output_base_dir, verbose=False,
+                                                 use_blob_store=use_blob_store)
+            _worker_key = (output_base_dir, use_blob_store)
+        
+        output_path = _worker_generator.generate(config)
+        return BatchTaskResult(
+            index=index,
+            project_name=project_name,
+            success=True,
+            output_path=output_path,
+            elapsed_seconds=time.perf_counter() - start
+        )
+    except Exception as e:
+        return BatchTaskResult(
+            index=index,
+            project_name=project_name,
+            success=False,
+            error=f"{type(e).__name__}: {e}",
+            elapsed_seconds=time.perf_counter() - start
+        )
+
+
+class BatchGenerator:
+    """批量上下文工程生成器"""
+    
+    def __init__(self, max_workers: int = None, timeout_seconds: float = None,
+                 output_base_dir: str = None, config_base_path: str = None, use_blob_store: bool = False):
+        """
+        初始化批量生成器
+        
+        Args:
+            max_workers: 工作进程数，默认读取 generator.max_concurrent_tasks
+            timeout_seconds: 整个批次的超时时间（秒），默认读取 generator.timeout_seconds
+            output_base_dir: 输出根目录，默认为 ./output
+            config_base_path: 系统配置根目录，默认为 scripts/configs_main
+            use_blob_store: 是否将内容相同的产物硬链接到输出根目录下的内容寻址存储
+        """
+        settings = load_generator_settings(config_base_path)
+        self.max_workers = max(1, int(max_workers or settings["max_concurrent_tasks"]))
+        self.timeout_seconds = float(timeout_seconds or settings["timeout_seconds"])
+        self.output_base_dir = output_base_dir
+        self.use_blob_store = use_blob_store
+    
+    def generate_from_manifest(self, manifest_path: str) -> BatchReport:
+        """
+        从清单文件批量生成
+        
+        Args:
+            manifest_path: 清单文件路径（JSON数组或JSONL）
+        
+        Returns:
+            BatchReport: 批量生成报告
+        """
+        return self.generate_all(load_manifest(manifest_path))
+    
+    def generate_all(self, configs: List[Dict[str, Any]]) -> BatchReport:
+        """
+        并发生成多个项目
+        
+        单个项目失败不会中断批次；超过批次超时仍未完成的项目记为失败，其工作进程随之终止。
+        只有一个工作进程时同样在进程池中执行，批次超时照常生效
+        
+        Args:
+            configs: 项目配置列表
+        
+        Returns:
+            BatchReport: 批量生成报告（结果按清单顺序排列）
+        """
+        workers = min(self.max_workers, len(configs)) or 1
+        report = BatchReport(max_workers=workers, timeout_seconds=self.timeout_seconds)
+        start = time.perf_counter()
+        
+        logger.info(f"开始批量生成，项目数: {len(configs)}，工作进程数: {workers}")
+        
+        results = self._run_in_pool(configs, workers) if configs else []
+        
+        report.results = sorted(results, key=lambda r: r.index)
+        report.elapsed_seconds = time.perf_counter() - start
+        
+        logger.info(
+            f"批量生成结束，成功: {len(report.succeeded)}，失败: {len(report.failed)}，"
+            f"耗时: {report.elapsed_seconds:.2f}s"
+        )
+        return report
+    
+    def _run_in_pool(self, configs: List[Dict[str, Any]], workers: int) -> List[BatchTaskResult]:
+        """
+        在进程池中执行生成任务
+        
+        超时后终止整个进程池：仍在运行的工作进程被结束，记为失败的项目不会在报告返回后继续写入输出目录
+        """
+        results = {}
+        deadline = time.monotonic() + self.timeout_seconds
+        pool = multiprocessing.Pool(processes=workers)
+        try:
+            pending = [
+                (i, pool.apply_async(_generate_project, (i, config, self.output_base_dir, self.use_blob_store)))
+                for i, config in enumerate(configs)
+            ]
+            
+            for index, async_result in pending:
+                try:
+                    results[index] = async_result.get(timeout=max(0.0, deadline - time.monotonic()))
+                except multiprocessing.TimeoutError:
+                    break
+            
+            if len(results) < len(pending):
+                logger.warning(f"批量生成超时（{self.timeout_seconds:g}秒），终止工作进程，未完成的项目记为失败")
+                for index, async_result in pending:
+                    if index in results:
+                        continue
+                    if async_result.ready():
+                        results[index] = async_result.get()
+                        continue
+                    results[index] = BatchTaskResult(
+                        index=index,
+                        project_name=str(configs[index].get('project_name') or f"#{index + 1}"),
+                        success=False,
+                        error=f"超时：批次超过 {self.timeout_seconds:g} 秒未完成，工作进程已终止",
+                        elapsed_seconds=self.timeout_seconds
+                    )
+        finally:
+            pool.terminate()
+            pool.join()
+        
+        return list(results.values())
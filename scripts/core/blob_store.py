@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+内容寻址存储模块
+将内容相同的生成文件硬链接到同一个blob，多个项目共享一份磁盘空间和页缓存
+"""
+
+import os
+import time
+import uuid
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any
+
+from ..utils.file_utils import ensure_dir, write_bytes
+
+logger = logging.getLogger(__name__)
+
+# blob存储目录名（位于输出根目录下，以 "." 开头以便列表时跳过）
+BLOB_DIR_NAME = ".blobs"
+
+# 超过该时间的临时文件视为中断写入的残留，可由gc删除
+TEMP_FILE_MAX_AGE_SECONDS = 3600
+
+
+@dataclass
+class GCResult:
+    """垃圾回收结果"""
+    removed: int = 0
+    removed_bytes: int = 0
+    kept: int = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典"""
+        return {"removed": self.removed, "removed_bytes": self.removed_bytes, "kept": self.kept}
+
+
+class BlobStore:
+    """
+    内容寻址blob存储
+    
+    blob按内容SHA-256存放在 <输出根目录>/.blobs/<前两位>/<哈希> 下，
+    生成的文件通过硬链接指向blob。只剩blob自身一个链接时即不再被任何项目引用，
+    可由 gc() 删除。
+    
+    注意：硬链接的文件共享同一份数据，原地修改某个项目中的文件会影响所有引用它的项目；
+    本项目的写入路径总是先删除再写入，不会出现这种情况。
+    """
+    
+    def __init__(self, output_root):
+        """
+        初始化blob存储
+        
+        Args:
+            output_root: 输出根目录
+        """
+        self.root = Path(output_root) / BLOB_DIR_NAME
+    
+    def blob_path(self, content_hash: str) -> Path:
+        """获取blob路径"""
+        return self.root / content_hash[:2] / content_hash
+    
+    def put(self, content_hash: str, data: bytes, fsync: bool = False) -> Path:
+        """
+        存入blob（已存在时直接复用）
+        
+        先写临时文件再原子重命名，多个进程同时存入同一内容是安全的
+        
+        Args:
+            content_hash: 内容SHA-256
+            data: 文件内容
+            fsync: 写入后是否立即同步到磁盘
+        
+        Returns:
+            Path: blob路径
+        """
+        path = self.blob_path(content_hash)
+        if path.is_file():
+            return path
+        
+        ensure_dir(str(path.parent))
+        temp_path = path.with_name(f".{content_hash}.{uuid.uuid4().hex[:8]}.tmp")
+        write_bytes(str(temp_path), data, fsync=fsync)
+        os.replace(temp_path, path)
+        return path
+    
+    def link(self, content_hash: str, data: bytes, target, fsync: bool = False) -> bool:
+        """
+        将目标文件硬链接到blob
+        
+        Args:
+            content_hash: 内容SHA-256
+            data: 文件内容
+            target: 目标文件路径（不能已存在）
+            fsync: 新建blob时是否立即同步到磁盘
+        
+        Returns:
+            bool: 是否成功链接；不支持硬链接（如跨设备）时返回 False，由调用方直接写入
+        """
+        ensure_dir(os.path.dirname(str(target)))
+        for _ in range(2):
+            path = self.put(content_hash, data, fsync)
+            try:
+                os.link(path, target)
+                return True
+            except FileNotFoundError:
+                # blob在存入和链接之间被并发的gc删除，重新存入后再试一次
+                continue
+            except OSError as e:
+                logger.debug(f"无法硬链接到blob，改为直接写入: {e}")
+                return False
+        return False
+    
+    def link_file(self, content_hash: str, source, target) -> bool:
+        """
+        将已写好的文件存为blob（已存在时复用），再把目标文件硬链接到blob
+        
+        与 link() 相同，但内容来自磁盘上的文件，流式写入时无需在内存中持有完整内容
+        
+        Args:
+            content_hash: 内容SHA-256
+            source: 内容所在的文件（调用方负责删除）
+            target: 目标文件路径（不能已存在）
+        
+        Returns:
+            bool: 是否成功链接；不支持硬链接时返回 False，由调用方直接使用 source
+        """
+        path = self.blob_path(content_hash)
+        for _ in range(2):
+            try:
+                if not path.is_file():
+                    ensure_dir(str(path.parent))
+                    temp_path = path.with_name(f".{content_hash}.{uuid.uuid4().hex[:8]}.tmp")
+                    os.link(source, temp_path)
+                    os.replace(temp_path, path)
+                os.link(path, target)
+                return True
+            except FileNotFoundError:
+                # blob在存入和链接之间被并发的gc删除，重新存入后再试一次
+                continue
+            except OSError as e:
+                logger.debug(f"无法硬链接到blob，改为直接写入: {e}")
+                return False
+        return False
+    
+    def gc(self) -> GCResult:
+        """
+        删除未被任何生成文件引用的blob
+        
+        Returns:
+            GCResult: 回收结果
+        """
+        result = GCResult()
+        if not self.root.is_dir():
+            return result
+        
+        temp_deadline = time.time() - TEMP_FILE_MAX_AGE_SECONDS
+        for bucket in self.root.iterdir():
+            if not bucket.is_dir():
+                continue
+            for blob in bucket.iterdir():
+                stat = blob.stat()
+                if blob.name.endswith(".tmp"):
+                    # 临时文件可能正在被其他进程写入，只删除过期的残留
+                    removable = stat.st_mtime < temp_deadline
+                else:
+                    # 只剩blob自身一个链接，说明已没有生成文件引用它
+                    removable = stat.st_nlink <= 1
+                
+                if removable:
+                    blob.unlink()
+                    result.removed += 1
+                    result.removed_bytes += stat.st_size
+                else:
+                    result.kept += 1
+            try:
+                bucket.rmdir()
+            except OSError:
+                pass
+        
+        logger.info(f"blob回收完成: 删除 {result.removed} 个（{result.removed_bytes} 字节），保留 {result.kept} 个")
+        return result
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取存储统计
+        
+        Returns:
+            Dict[str, Any]: blob数量、blob总字节数、链接总数以及去重节省的字节数
+        """
+        blobs = 0
+        total_bytes = 0
+        saved_bytes = 0
+        links = 0
+        if self.root.is_dir():
+            for blob in self.root.glob("*/*"):
+                if blob.name.endswith(".tmp"):
+                    continue
+                stat = blob.stat()
+                blobs += 1
+                total_bytes += stat.st_size
+                references = max(stat.st_nlink - 1, 0)
+                links += references
+                saved_bytes += stat.st_size * max(references - 1, 0)
+        return {"blobs": blobs, "bytes": total_bytes, "links": links, "saved_bytes": saved_bytes}
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+提示词缓存友好布局模块
+大模型服务的提示词缓存按字节前缀命中：只要文件开头就出现生成时间或项目配置，
+不同项目的上下文就没有可复用的前缀。缓存友好布局把与配置无关的通用说明放在文件开头，
+所有依赖配置的内容（包括生成时间）统一放在 PROJECT_CONTENT_MARKER 之后，
+使标记之前的前缀在所有项目之间逐字节一致；check_prefix_stability 在一组配置上验证这一点
+"""
+
+import copy
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Mapping, Sequence, Tuple
+
+from .prompt_fragments import load_fragment_template
+
+logger = logging.getLogger(__name__)
+
+# 项目专属内容的起始标记：标记之前的内容与配置无关
+PROJECT_CONTENT_MARKER = "<!-- 以下为项目专属内容 -->"
+
+# 采用缓存友好布局的产物（README.md 面向人工阅读，config.json 和 token_stats.json 本身就是配置数据）
+CACHE_LAYOUT_ARTIFACTS = (
+    "system_prompt.md",
+    "user_prompt.md",
+    "project_generator.gemini",
+    "project_generator.claude",
+    "execution_plan.md",
+    "project_structure.md",
+    "shared_context.md",
+    "context_bundle.md"
+)
+
+# 配置矩阵中字符串配置项的替换取值（与基础配置取值相同时跳过）
+MATRIX_ALTERNATIVES = {
+    "project_name": ("order-service", "a"),
+    "package_name": ("org.acme.orders",),
+    "version": ("2.3.4-SNAPSHOT",),
+    "description": ("另一个描述",),
+    "jdk_version": ("21", "8"),
+    "build_tool": ("Gradle", "Maven"),
+    "spring_boot_version": ("2.7.18", "3.2.0"),
+    "database": ("无数据库", "PostgreSQL"),
+    "orm_framework": ("无ORM", "JPA/Hibernate"),
+    "cache": ("无缓存", "Caffeine"),
+    "message_queue": ("无消息队列", "Kafka")
+}
+
+# 配置矩阵中多模块项目使用的模块
+MATRIX_MODULES = [
+    {"name": "order-api", "description": "接口定义"},
+    {"name": "order-core", "description": "核心业务"}
+]
+
+
+def placeholder_text(name: str, directory=None) -> str:
+    """
+    片段模板的占位符文本：槽位替换为 {槽位名}，与配置无关
+    
+    Args:
+        name: 模板文件名
+        directory: 模板目录，默认为片段模板目录
+    
+    Returns:
+        str: 占位符文本
+    """
+    template = load_fragment_template(name, directory)
+    parts = [template.fragments[0]]
+    for slot, fragment in zip(template.slots, template.fragments[1:]):
+        parts.append("{" + slot + "}")
+        parts.append(fragment)
+    return "".join(parts)
+
+
+def project_section(values: Sequence[Tuple[str, Any]]) -> str:
+    """
+    构建项目专属内容：起始标记和占位符取值列表
+    
+    Args:
+        values: (槽位名, 取值) 序列
+    
+    Returns:
+        str: 项目专属内容
+    """
+    lines = [PROJECT_CONTENT_MARKER, "", "## 项目专属取值", "", "上文中的 {占位符} 按以下取值替换：", ""]
+    lines.extend(f"- {slot}: {value}" for slot, value in values)
+    return "\n".join(lines) + "\n"
+
+
+def render_cache_layout(name: str, values: Mapping[str, Any] = None, directory=None) -> str:
+    """
+    按缓存友好布局渲染片段模板：占位符文本在前，槽位取值在后
+    
+    没有槽位的模板与配置无关，原样返回
+    
+    Args:
+        name: 模板文件名
+        values: 槽位值
+        directory: 模板目录，默认为片段模板目录
+    
+    Returns:
+        str: 渲染结果
+    
+    Raises:
+        ValueError: 缺少槽位值
+    """
+    template = load_fragment_template(name, directory)
+    if not template.slots:
+        return template.render({})
+    
+    values = values or {}
+    items = []
+    for slot in dict.fromkeys(template.slots):
+        if slot not in values:
+            raise ValueError(f"片段模板 {name} 缺少槽位值: {slot}")
+        items.append((slot, values[slot]))
+    return placeholder_text(name, directory).rstrip("\n") + "\n\n" + project_section(items)
+
+
+def split_prefix(content: str) -> Tuple[str, str]:
+    """
+    把产物内容拆分为与配置无关的前缀和项目专属内容
+    
+    Args:
+        content: 产物内容
+    
+    Returns:
+        Tuple[str, str]: (前缀, 从标记开始的项目专属内容)；没有标记时整个内容都是前缀
+    """
+    position = content.find(PROJECT_CONTENT_MARKER)
+    if position < 0:
+        return content, ""
+    return content[:position], content[position:]
+
+
+def build_config_matrix(base: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """
+    以基础配置为起点构建配置矩阵：每个配置项单独替换一次，再加上多模块项目和全部替换的组合
+    
+    Args:
+        base: 基础配置
+    
+    Returns:
+        List[Dict[str, Any]]: 配置列表，第一个为基础配置
+    """
+    matrix = [copy.deepcopy(dict(base))]
+    combined = copy.deepcopy(dict(base))
+    
+    for key, alternatives in MATRIX_ALTERNATIVES.items():
+        value = next((item for item in alternatives if item != base.get(key)), None)
+        if value is None:
+            continue
+        variant = copy.deepcopy(dict(base))
+        variant[key] = value
+        matrix.append(variant)
+        combined[key] = value
+    
+    for key, value in base.items():
+        if isinstance(value, bool) and key != "is_multi_module":
+            variant = copy.deepcopy(dict(base))
+            variant[key] = not value
+            matrix.append(variant)
+            combined[key] = not value
+    
+    multi_module = copy.deepcopy(dict(base))
+    multi_module.update(is_multi_module=True, modules=copy.deepcopy(MATRIX_MODULES))
+    matrix.append(multi_module)
+    combined.update(is_multi_module=not base.get("is_multi_module", False),
+                    modules=[] if base.get("is_multi_module") else copy.deepcopy(MATRIX_MODULES))
+    matrix.append(combined)
+    return matrix
+
+
+@dataclass
+class PrefixStabilityReport:
+    """
+    前缀稳定性检查结果
+    
+    prefix_sizes / total_sizes 为第一个配置生成的各产物前缀字节数和总字节数，
+    unstable 为前缀不一致的产物及首个不一致的配置序号
+    """
+    config_count: int
+    prefix_sizes: Dict[str, int] = field(default_factory=dict)
+    total_sizes: Dict[str, int] = field(default_factory=dict)
+    unstable: Dict[str, int] = field(default_factory=dict)
+    
+    @property
+    def stable(self) -> bool:
+        """全部产物的前缀在所有配置之间一致"""
+        return not self.unstable
+    
+    def describe(self) -> str:
+        """一行检查摘要"""
+        prefix = sum(self.prefix_sizes.values())
+        total = sum(self.total_sizes.values())
+        summary = f"{self.config_count} 个配置，{len(self.prefix_sizes)} 个产物，稳定前缀 {prefix}/{total} 字节"
+        if self.unstable:
+            summary += f"，前缀不一致: {', '.join(sorted(self.unstable))}"
+        return summary
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典"""
+        return {
+            "config_count": self.config_count,
+            "stable": self.stable,
+            "prefix_sizes": dict(self.prefix_sizes),
+            "total_sizes": dict(self.total_sizes),
+            "unstable": dict(self.unstable)
+        }
+
+
+def check_prefix_stability(configs: Sequence[Mapping[str, Any]], generator=None) -> PrefixStabilityReport:
+    """
+    在一组配置上验证缓存友好布局的前缀稳定性
+    
+    每个配置在内存中生成一次，比较各产物 PROJECT_CONTENT_MARKER 之前的前缀是否逐字节一致
+    
+    Args:
+        configs: 配置列表（通常由 build_config_matrix 构建）
+        generator: 使用的 ContextGenerator，默认创建启用缓存友好布局的静默生成器
+    
+    Returns:
+        PrefixStabilityReport: 检查结果
+    
+    Raises:
+        ValueError: 配置列表为空或生成器未启用缓存友好布局
+    """
+    if not configs:
+        raise ValueError("配置列表不能为空")
+    if generator is None:
+        from .context_generator import ContextGenerator
+        generator = ContextGenerator(verbose=False, create_dirs=False, cache_layout=True)
+    elif not generator.cache_layout:
+        raise ValueError("生成器未启用缓存友好布局")
+    
+    report = PrefixStabilityReport(len(configs))
+    reference: Dict[str, bytes] = {}
+    for index, config in enumerate(configs):
+        tree = generator.generate_in_memory(config)
+        for name in CACHE_LAYOUT_ARTIFACTS:
+            if name not in tree.list_files():
+                continue
+            content = tree.read_text(name)
+            prefix = split_prefix(content)[0].encode("utf-8")
+            if name not in reference:
+                reference[name] = prefix
+                report.prefix_sizes[name] = len(prefix)
+                report.total_sizes[name] = len(content.encode("utf-8"))
+            elif prefix != reference[name] and name not in report.unstable:
+                report.unstable[name] = index
+    
+    if report.unstable:
+        logger.warning(f"缓存前缀不一致: {report.describe()}")
+    return report
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+上下文合并模块
+斜杠命令文件原本要求分别读取 config.json、system_prompt.md、user_prompt.md、execution_plan.md
+和 project_structure.md，智能体开始工作前要多次读取文件。合并模式把这些文件按固定顺序
+合并为一个带锚点的文件，斜杠命令只引用这一个文件
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Mapping
+
+from .cache_layout import PROJECT_CONTENT_MARKER, split_prefix
+from .prompt_compactor import SHARED_CONTEXT_FILE
+
+logger = logging.getLogger(__name__)
+
+# 合并文件名称
+BUNDLE_FILE = "context_bundle.md"
+
+
+@dataclass(frozen=True)
+class BundleSection:
+    """合并文件中的一节：anchor 为章节锚点，source 为来源文件，language 非空时以代码块嵌入"""
+    anchor: str
+    source: str
+    title: str
+    language: str = ""
+
+
+# 合并顺序：配置在前，随后是规则、需求、计划和结构说明；共享说明只在精简模式下存在
+BUNDLE_SECTIONS = (
+    BundleSection("config", "config.json", "项目配置", "json"),
+    BundleSection("shared-context", SHARED_CONTEXT_FILE, "共享上下文规则"),
+    BundleSection("system-prompt", "system_prompt.md", "系统提示词"),
+    BundleSection("user-prompt", "user_prompt.md", "用户需求"),
+    BundleSection("execution-plan", "execution_plan.md", "执行计划"),
+    BundleSection("project-structure", "project_structure.md", "项目结构说明"),
+)
+
+
+def build_bundle(contents: Mapping[str, str], project_name: str, cache_layout: bool = False) -> str:
+    """
+    按 BUNDLE_SECTIONS 的顺序合并来源文件
+    
+    精简模式下各产物对共享说明的引用（shared_context.md#锚点）改为合并文件内的锚点。
+    缓存友好布局下先依次放各来源文件与配置无关的前缀，再放各自的项目专属内容，配置放在最后，
+    合并文件的前缀同样在所有项目之间一致
+    
+    Args:
+        contents: 来源文件名称到内容的映射，缺少的来源跳过
+        project_name: 项目名称
+        cache_layout: 是否按缓存友好布局合并
+    
+    Returns:
+        合并文件内容
+    
+    Raises:
+        ValueError: 没有任何来源文件
+    """
+    sections = [section for section in BUNDLE_SECTIONS if section.source in contents]
+    if not sections:
+        raise ValueError("没有可合并的上下文文件")
+    if cache_layout:
+        sections.sort(key=lambda section: section.language != "")
+    
+    bodies = {}
+    for section in sections:
+        body = contents[section.source].strip("\n")
+        if section.language:
+            body = f"```{section.language}\n{body}\n```"
+        elif section.source != SHARED_CONTEXT_FILE:
+            body = body.replace(f"{SHARED_CONTEXT_FILE}#", "#")
+        bodies[section.source] = body
+    
+    title = "上下文合并文件" if cache_layout else f"{project_name} 上下文合并文件"
+    parts = [
+        f"# {title}\n\n",
+        "本文件按以下顺序包含生成项目所需的全部上下文，读取本文件即可，无需再读取单独的文件：\n\n"
+    ]
+    for index, section in enumerate(sections, 1):
+        parts.append(f"{index}. [{section.title}](#{section.anchor}) - {section.source}\n")
+    
+    if not cache_layout:
+        for index, section in enumerate(sections, 1):
+            parts.append(_section_heading(index, section, section.anchor))
+            parts.append(f"{bodies[section.source]}\n")
+    else:
+        project_parts = []
+        for index, section in enumerate(sections, 1):
+            if section.language:
+                project_parts.append((index, section, bodies[section.source]))
+                continue
+            prefix, project = split_prefix(bodies[section.source])
+            parts.append(_section_heading(index, section, section.anchor))
+            parts.append(prefix.strip("\n") + "\n")
+            if project:
+                project_parts.append((index, section, project[len(PROJECT_CONTENT_MARKER):].strip("\n")))
+        
+        parts.append(f"\n---\n\n{PROJECT_CONTENT_MARKER}\n")
+        for index, section, body in project_parts:
+            anchor = section.anchor if section.language else f"{section.anchor}-project"
+            parts.append(_section_heading(index, section, anchor))
+            parts.append(f"{body}\n")
+    
+    logger.debug(f"合并上下文文件: {', '.join(section.source for section in sections)}")
+    return "".join(parts)
+
+
+def _section_heading(index: int, section: BundleSection, anchor: str) -> str:
+    """章节分隔线、锚点和标题"""
+    return f"\n---\n\n<a id=\"{anchor}\"></a>\n## {index}. {section.title}（{section.source}）\n\n"
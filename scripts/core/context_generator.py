@@ -15,7 +15,17 @@ import os
 import logging
 from pathlib import Path
 from datetime import datetime
-from rich.console import Console
+
+from .output_writer import OutputWriter, STATUS_UNCHANGED, hash_bytes
+from .staging import StagedOutput
+from .blob_store import BlobStore
+from .render_memo import RenderMemo, config_fingerprint, DEFAULT_MEMO_SIZE
+from .prompt_fragments import render_fragments, load_fragment_template
+from .cache_layout import render_cache_layout
+from ..utils.file_utils import write_file, FSYNC_BATCH
+from ..utils.token_counter import estimate_tokens
+from ..utils.tracing import span
+from ..utils.lazy_console import LazyConsole
 
 # 导入模板引擎
 try:
@@ -24,28 +34,118 @@ try:
 except ImportError:
     JINJA2_AVAILABLE = False
 
-console = Console()
+console = LazyConsole()
 logger = logging.getLogger(__name__)
 
 
+class TokenThresholdExceeded(ValueError):
+    """生成产物的token总数超过阈值"""
+
+# 各产物渲染时读取的配置键（None 表示依赖完整配置），用于渲染缓存：
+# 只有依赖的配置发生变化的产物才会重新渲染。修改构建方法时需同步更新
+ARTIFACT_DEPENDENCIES = {
+    "system_prompt.md": None,
+    "user_prompt.md": (),
+    "project_generator.gemini": ("project_name",),
+    "project_generator.claude": ("project_name",),
+    "execution_plan.md": (
+        "project_name", "package_name", "version", "description",
+        "jdk_version", "build_tool", "spring_boot_version",
+        "database", "orm_framework", "cache", "message_queue",
+        "generate_sample_code", "generate_tests", "generate_docker", "generate_readme"
+    ),
+    "project_structure.md": ("project_name", "package_name", "is_multi_module", "modules"),
+    "README.md": (
+        "project_name", "package_name", "version", "description",
+        "jdk_version", "build_tool", "spring_boot_version",
+        "database", "orm_framework", "cache", "message_queue",
+        "include_swagger", "include_security", "include_actuator"
+    )
+}
+
+# 各产物使用的片段模板（斜杠命令在合并模式下使用 .bundle 变体），模板源码哈希是渲染缓存键的一部分
+ARTIFACT_FRAGMENTS = {
+    "user_prompt.md": "user_prompt.md",
+    "project_generator.gemini": "project_generator.gemini",
+    "project_generator.claude": "project_generator.claude",
+    "execution_plan.md": "execution_plan.md",
+    "project_structure.md": "project_structure.md"
+}
+COMMAND_ARTIFACTS = ("project_generator.gemini", "project_generator.claude")
+
+# 上下文工程使用的Jinja2模板（预编译的范围）
+CONTEXT_TEMPLATE_NAMES = ("system_prompt_template.md", "system_prompt_cache_template.md")
+
+# 分块写入产物时每块的字符数
+STREAM_CHUNK_CHARS = 16 * 1024
+
+# token数统计文件（本地估算，写入项目输出目录）
+TOKEN_STATS_FILE = "token_stats.json"
+
+# 不统计token数的文件
+UNCOUNTED_FILES = ("config.json", TOKEN_STATS_FILE)
+
+# 缓存带生成时间的产物时使用的占位符，取出缓存后替换为本次生成时间
+GENERATED_AT_PLACEHOLDER = "\0GENERATED_AT\0"
+
+
+def iter_chunks(content, chunk_chars=STREAM_CHUNK_CHARS):
+    """按固定字符数切分文本，供分块写入"""
+    for start in range(0, len(content), chunk_chars):
+        yield content[start:start + chunk_chars]
+
+
 class ContextGenerator:
     """上下文生成器类"""
     
-    def __init__(self):
-        self.output_base_dir = Path("./output")
+    def __init__(self, output_base_dir=None, verbose=True, fsync_policy=FSYNC_BATCH, use_blob_store=False,
+                 memo_size=DEFAULT_MEMO_SIZE, create_dirs=True, use_precompiled=True, compact=False,
+                 token_budget=None, token_threshold=None, bundle=False, cache_layout=False):
+        self.output_base_dir = Path(output_base_dir) if output_base_dir else Path("./output")
+        self.verbose = verbose
+        self.fsync_policy = fsync_policy
+        # 可选的内容寻址存储：内容相同的产物在多个项目之间共享同一份数据
+        self.blob_store = BlobStore(self.output_base_dir) if use_blob_store else None
+        # 按配置指纹缓存渲染结果，批量或重复生成时复用
+        self.render_memo = RenderMemo(memo_size)
+        self.last_summary = None
+        # 最近一次生成中实际重新渲染（未命中渲染缓存）的产物
+        self.last_rendered = []
+        # 精简模式：重复说明移到共享文件，token_budget 为每个提示词产物的token预算（整数或按产物名称的字典）
+        self.compact = compact or token_budget is not None
+        self.token_budget = token_budget
+        self.last_compact_result = None
+        # 各产物的token数（本地估算）；token_threshold 为全部产物的token总数上限，超出时 generate 失败
+        self.token_threshold = token_threshold
+        self.last_token_stats = None
+        # 合并模式：上下文文件额外合并为一个带锚点的文件，斜杠命令只引用该文件
+        self.bundle = bundle
+        # 缓存友好布局：与配置无关的说明在前、依赖配置的内容在后，各项目的产物共享相同的字节前缀
+        self.cache_layout = cache_layout
         self.templates_dir = Path("./scripts/templates")
         
-        # 确保目录存在
-        self.output_base_dir.mkdir(parents=True, exist_ok=True)
-        self.templates_dir.mkdir(parents=True, exist_ok=True)
+        # 确保目录存在（只做预演时不创建任何目录）
+        if create_dirs:
+            self.output_base_dir.mkdir(parents=True, exist_ok=True)
+            self.templates_dir.mkdir(parents=True, exist_ok=True)
         
-        # 初始化模板环境
+        # 初始化模板环境：按模板目录和选项从进程内注册表获取共享环境，模板缓存在实例之间复用
+        self.precompiled_loader = None
         if JINJA2_AVAILABLE:
-            self.jinja_env = Environment(
-                loader=FileSystemLoader(str(self.templates_dir)),
-                trim_blocks=True,
-                lstrip_blocks=True
-            )
+            from .jinja_registry import get_environment
+            
+            def create_environment():
+                loader = FileSystemLoader(str(self.templates_dir))
+                if use_precompiled:
+                    # 预编译模板：源码哈希一致时直接导入编译结果，跳过解析和编译
+                    from .template_precompile import PrecompiledLoader, DEFAULT_COMPILED_DIR, CONTEXT_TEMPLATES
+                    loader = PrecompiledLoader(loader, DEFAULT_COMPILED_DIR / CONTEXT_TEMPLATES)
+                return Environment(loader=loader, trim_blocks=True, lstrip_blocks=True)
+            
+            key = ("context", str(self.templates_dir.resolve()), use_precompiled)
+            self.jinja_env = get_environment(key, create_environment)
+            if use_precompiled:
+                self.precompiled_loader = self.jinja_env.loader
             logger.info("Jinja2模板引擎已初始化")
         else:
             self.jinja_env = None
@@ -57,126 +157,323 @@ class ContextGenerator:
             # 创建项目特定的输出目录
             project_name = config['project_name']
             output_dir = self.output_base_dir / project_name
-            output_dir.mkdir(parents=True, exist_ok=True)
             
-            console.print(f"[blue]📁 创建输出目录: {output_dir}[/blue]")
+            self._echo(f"[blue]📁 创建输出目录: {output_dir}[/blue]")
+            
+            # 先在暂存目录中生成，全部成功后再一次性替换输出目录
+            with span("context.generate", project=project_name):
+                staged = StagedOutput(output_dir, self.fsync_policy)
+                with staged as staging_dir:
+                    # 增量写入：内容未变化的文件不重写，上次生成但本次不再生成的文件被删除
+                    writer = OutputWriter(staging_dir, config, self.fsync_policy, self.blob_store)
+                    token_stats = self._write_artifacts(config, writer)
+                    staged.written = writer.written_paths()
+            
+            self._echo(f"[blue]📊 {self.last_summary.describe()}[/blue]")
+            self._echo(f"[blue]🔢 token数（估算）: {token_stats['total']}[/blue]")
+            # 产物和统计文件照常写入，便于超出阈值后查看各文件的token数
+            self._check_token_threshold(token_stats)
             
-            # 保存配置文件
-            self._save_config(config, output_dir)
+            self._echo(f"[green]✅ 上下文工程生成完成[/green]")
+            return str(output_dir)
             
+        except Exception as e:
+            console.print(f"[red]❌ 生成上下文工程失败: {str(e)}[/red]")
+            raise
+    
+    def generate_in_memory(self, config):
+        """在内存中生成上下文工程，不写入磁盘；返回以项目名称为根目录的 MemoryOutputTree"""
+        from .output_tree import MemoryOutputTree
+        
+        tree = MemoryOutputTree(config['project_name'])
+        with span("context.generate", project=config['project_name'], in_memory=True):
+            self._write_artifacts(config, tree)
+        return tree
+    
+    def compile_templates(self, target_dir=None):
+        """把系统提示词模板预编译为Python模块（构建步骤），返回编译的模板数量"""
+        from .template_precompile import compile_templates, DEFAULT_COMPILED_DIR, CONTEXT_TEMPLATES
+        
+        if self.jinja_env is None:
+            raise ValueError("Jinja2不可用，无法预编译模板")
+        target_dir = target_dir or (self.precompiled_loader.compiled_dir if self.precompiled_loader
+                                    else DEFAULT_COMPILED_DIR / CONTEXT_TEMPLATES)
+        available = set(self.jinja_env.list_templates())
+        names = [name for name in CONTEXT_TEMPLATE_NAMES if name in available]
+        return compile_templates(self.jinja_env, target_dir, names)
+    
+    def dry_run(self, config):
+        """预演生成：渲染全部产物并返回输出计划（路径、字节数、渲染耗时），不写入任何文件"""
+        from .dry_run import DryRunPlan
+        
+        plan = DryRunPlan(config['project_name'])
+        with span("context.generate", project=config['project_name'], dry_run=True):
+            self._write_artifacts(config, plan)
+        return plan
+    
+    def _write_artifacts(self, config, writer):
+        """
+        生成全部产物文件到写入器（OutputWriter、MemoryOutputTree 或 DryRunPlan）
+        
+        本次写入的产物内容只保存在局部变量中，同一实例的并发调用互不影响
+        
+        Returns:
+            dict: 本次生成的token数统计
+        """
+        output_dir = writer.root
+        self.last_rendered = []
+        # 本次写入的产物：文件名 → 内容
+        written = {}
+        
+        # 保存配置文件
+        self._save_config(config, output_dir, writer, written)
+        
+        if self.compact:
+            # 精简模式：提示词产物统一渲染、去重和裁剪后写入
+            self._generate_compact_prompts(config, output_dir, writer, written)
+        else:
             # 生成系统提示词
-            self._generate_system_prompt(config, output_dir)
+            self._generate_system_prompt(config, output_dir, writer, written)
             
             # 生成用户提示词
-            self._generate_user_prompt(config, output_dir)
+            self._generate_user_prompt(config, output_dir, writer, written)
             
             # 生成Gemini斜杠命令文件
-            self._generate_gemini_commands(config, output_dir)
+            self._generate_gemini_commands(config, output_dir, writer, written)
             
             # 生成Claude Code斜杠命令文件
-            self._generate_claude_commands(config, output_dir)
+            self._generate_claude_commands(config, output_dir, writer, written)
             
             # 生成执行计划文件
-            self._generate_execution_plan(config, output_dir)
-            
-            # 生成项目结构说明
-            self._generate_project_structure(config, output_dir)
-            
-            # 生成README文件
-            self._generate_readme(config, output_dir)
-            
-            console.print(f"[green]✅ 上下文工程生成完成[/green]")
-            return str(output_dir)
-            
-        except Exception as e:
-            console.print(f"[red]❌ 生成上下文工程失败: {str(e)}[/red]")
-            raise
-    
-    def _save_config(self, config, output_dir):
+            self._generate_execution_plan(config, output_dir, writer, written)
+        
+        # 生成项目结构说明
+        self._generate_project_structure(config, output_dir, writer, written)
+        
+        # 合并上下文文件
+        if self.bundle:
+            self._generate_bundle(config, output_dir, writer, written)
+        
+        # 生成README文件
+        self._generate_readme(config, output_dir, writer, written)
+        
+        # 保存token数统计
+        token_stats = self._save_token_stats(config, output_dir, writer, written)
+        
+        self.last_summary = writer.finalize()
+        self.last_token_stats = token_stats
+        return token_stats
+    
+    def _echo(self, message):
+        """输出进度信息（静默模式下不输出）"""
+        if self.verbose:
+            console.print(message)
+    
+    def _write_artifact(self, output_dir, file_name, content, label, writer=None, template_hash="", written=None):
+        """写入单个产物文件；提供writer时按内容哈希增量写入，提供written时记录写入的内容"""
+        if written is not None:
+            written[file_name] = content
+        
+        if writer is None:
+            write_file(str(output_dir / file_name), content)
+            self._echo(f"[green]✅ {label}: {file_name}[/green]")
+            return
+        
+        # 分块写入：逐块编码和哈希，不再生成与全文等大的字节副本
+        status = writer.write_stream(file_name, iter_chunks(content), template_hash)
+        if status == STATUS_UNCHANGED:
+            self._echo(f"[dim]⏭️  {label}（未变化）: {file_name}[/dim]")
+        else:
+            self._echo(f"[green]✅ {label}: {file_name}[/green]")
+    
+    def _save_token_stats(self, config, output_dir, writer=None, written=None):
+        """保存本次写入的各产物token数和总数，返回统计"""
+        files = {
+            file_name: estimate_tokens(content)
+            for file_name, content in (written or {}).items() if file_name not in UNCOUNTED_FILES
+        }
+        token_stats = {
+            "project": config['project_name'],
+            "estimator": "local",
+            "files": files,
+            "total": sum(files.values()),
+            "threshold": self.token_threshold
+        }
+        content = json.dumps(token_stats, ensure_ascii=False, indent=2)
+        self._write_artifact(output_dir, TOKEN_STATS_FILE, content, "token统计已保存", writer)
+        return token_stats
+    
+    def _check_token_threshold(self, token_stats):
+        """token总数超过阈值时抛出 TokenThresholdExceeded"""
+        if self.token_threshold is None:
+            return
+        total = token_stats['total']
+        if total > self.token_threshold:
+            largest = sorted(token_stats['files'].items(), key=lambda item: item[1], reverse=True)[:3]
+            details = "、".join(f"{name} {tokens}" for name, tokens in largest)
+            raise TokenThresholdExceeded(f"token总数 {total} 超过阈值 {self.token_threshold}（最大的文件: {details}）")
+    
+    def _save_config(self, config, output_dir, writer=None, written=None):
         """保存配置文件"""
-        config_file = output_dir / "config.json"
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
-        console.print(f"[green]✅ 配置文件已保存: {config_file.name}[/green]")
+        content = json.dumps(config, ensure_ascii=False, indent=2)
+        self._write_artifact(output_dir, "config.json", content, "配置文件已保存", writer, written=written)
     
-    def _generate_system_prompt(self, config, output_dir):
+    def _generate_system_prompt(self, config, output_dir, writer=None, written=None):
         """生成系统提示词"""
-        system_prompt = self._build_system_prompt(config)
-        
-        system_file = output_dir / "system_prompt.md"
-        with open(system_file, 'w', encoding='utf-8') as f:
-            f.write(system_prompt)
-        
-        console.print(f"[green]✅ 系统提示词已生成: {system_file.name}[/green]")
+        template_hash = self._template_hash(self._system_prompt_template())
+        system_prompt = self._render_artifact("system_prompt.md", config, self._build_system_prompt, template_hash)
+        self._write_artifact(output_dir, "system_prompt.md", system_prompt, "系统提示词已生成", writer, template_hash,
+                             written=written)
     
-    def _generate_user_prompt(self, config, output_dir):
+    def _generate_user_prompt(self, config, output_dir, writer=None, written=None):
         """生成用户提示词"""
-        user_prompt = self._build_user_prompt(config)
-        
-        user_file = output_dir / "user_prompt.md"
-        with open(user_file, 'w', encoding='utf-8') as f:
-            f.write(user_prompt)
-        
-        console.print(f"[green]✅ 用户提示词已生成: {user_file.name}[/green]")
+        user_prompt = self._render_artifact("user_prompt.md", config, self._build_user_prompt)
+        self._write_artifact(output_dir, "user_prompt.md", user_prompt, "用户提示词已生成", writer, written=written)
     
-    def _generate_gemini_commands(self, config, output_dir):
+    def _generate_gemini_commands(self, config, output_dir, writer=None, written=None):
         """生成Gemini斜杠命令文件"""
-        commands = self._build_gemini_commands(config)
-        
-        # 生成.gemini文件
-        gemini_file = output_dir / "project_generator.gemini"
-        with open(gemini_file, 'w', encoding='utf-8') as f:
-            f.write(commands)
-        
-        console.print(f"[green]✅ Gemini命令文件已生成: {gemini_file.name}[/green]")
+        commands = self._render_artifact("project_generator.gemini", config, self._build_gemini_commands,
+                                         self._commands_variant())
+        self._write_artifact(output_dir, "project_generator.gemini", commands, "Gemini命令文件已生成", writer, written=written)
     
-    def _generate_claude_commands(self, config, output_dir):
+    def _generate_claude_commands(self, config, output_dir, writer=None, written=None):
         """生成Claude Code斜杠命令文件"""
-        commands = self._build_claude_commands(config)
-        
-        # 生成.claude文件
-        claude_file = output_dir / "project_generator.claude"
-        with open(claude_file, 'w', encoding='utf-8') as f:
-            f.write(commands)
-        
-        console.print(f"[green]✅ Claude Code命令文件已生成: {claude_file.name}[/green]")
+        commands = self._render_artifact("project_generator.claude", config, self._build_claude_commands,
+                                         self._commands_variant())
+        self._write_artifact(output_dir, "project_generator.claude", commands, "Claude Code命令文件已生成", writer,
+                             written=written)
     
-    def _generate_execution_plan(self, config, output_dir):
+    def _generate_execution_plan(self, config, output_dir, writer=None, written=None):
         """生成执行计划文件"""
-        execution_plan = self._build_execution_plan(config)
-        
-        plan_file = output_dir / "execution_plan.md"
-        with open(plan_file, 'w', encoding='utf-8') as f:
-            f.write(execution_plan)
-        
-        console.print(f"[green]✅ 执行计划已生成: {plan_file.name}[/green]")
+        execution_plan = self._render_artifact("execution_plan.md", config, self._build_execution_plan)
+        self._write_artifact(output_dir, "execution_plan.md", execution_plan, "执行计划已生成", writer, written=written)
     
-    def _generate_project_structure(self, config, output_dir):
+    def _generate_project_structure(self, config, output_dir, writer=None, written=None):
         """生成项目结构说明"""
-        structure = self._build_project_structure(config)
+        structure = self._render_artifact("project_structure.md", config, self._build_project_structure)
+        self._write_artifact(output_dir, "project_structure.md", structure, "项目结构说明已生成", writer, written=written)
+    
+    def _generate_readme(self, config, output_dir, writer=None, written=None):
+        """生成README文件"""
+        readme_content = self._render_artifact("README.md", config, self._build_readme)
+        self._write_artifact(output_dir, "README.md", readme_content, "README文件已生成", writer, written=written)
+    
+    def _generate_compact_prompts(self, config, output_dir, writer=None, written=None):
+        """精简模式：共享说明写入单独文件，各提示词产物只保留引用，并按token预算裁剪"""
+        from .prompt_compactor import PromptCompactor, COMPACT_ARTIFACTS, SHARED_CONTEXT_FILE
+        
+        template_hash = self._template_hash(self._system_prompt_template())
+        builders = {
+            "system_prompt.md": self._build_system_prompt,
+            "user_prompt.md": self._build_user_prompt,
+            "project_generator.gemini": self._build_gemini_commands,
+            "project_generator.claude": self._build_claude_commands,
+            "execution_plan.md": self._build_execution_plan
+        }
+        hashes = {
+            "system_prompt.md": template_hash,
+            "project_generator.gemini": self._commands_variant(),
+            "project_generator.claude": self._commands_variant()
+        }
+        contents = {
+            name: self._render_artifact(name, config, builders[name], hashes.get(name, ""))
+            for name in COMPACT_ARTIFACTS
+        }
         
-        structure_file = output_dir / "project_structure.md"
-        with open(structure_file, 'w', encoding='utf-8') as f:
-            f.write(structure)
+        result = PromptCompactor(self.token_budget, self.cache_layout).compact(contents, config['project_name'])
+        self._write_artifact(output_dir, SHARED_CONTEXT_FILE, result.shared_content, "共享说明已生成", writer, written=written)
+        for name in COMPACT_ARTIFACTS:
+            self._write_artifact(output_dir, name, result.contents[name], "精简提示词已生成", writer,
+                                 hashes.get(name, ""), written=written)
         
-        console.print(f"[green]✅ 项目结构说明已生成: {structure_file.name}[/green]")
+        self.last_compact_result = result
+        self._echo(f"[blue]✂️  {result.describe()}[/blue]")
     
-    def _generate_readme(self, config, output_dir):
-        """生成README文件"""
-        readme_content = self._build_readme(config)
+    def _generate_bundle(self, config, output_dir, writer=None, written=None):
+        """把本次已写入的上下文文件按顺序合并为一个带锚点的文件"""
+        from .context_bundle import build_bundle, BUNDLE_FILE
+        
+        bundle = build_bundle(written or {}, config['project_name'], self.cache_layout)
+        self._write_artifact(output_dir, BUNDLE_FILE, bundle, "合并上下文已生成", writer, written=written)
+    
+    def _commands_variant(self):
+        """斜杠命令的片段模板变体（同时作为渲染缓存的额外输入）"""
+        return "bundle" if self.bundle else ""
+    
+    def _command_fragment(self, name):
+        """斜杠命令片段模板名称：合并模式下使用引用合并文件的变体"""
+        if self.bundle:
+            stem, suffix = name.rsplit(".", 1)
+            return f"{stem}.bundle.{suffix}"
+        return name
+    
+    def _system_prompt_template(self):
+        """系统提示词模板名称：缓存友好布局使用配置内容集中在文末的模板"""
+        return "system_prompt_cache_template.md" if self.cache_layout else "system_prompt_template.md"
+    
+    def _fragment_hash(self, artifact_name):
+        """产物所用片段模板的源码哈希（加载时检查模板文件是否修改）；不使用片段模板的产物返回空字符串"""
+        name = ARTIFACT_FRAGMENTS.get(artifact_name)
+        if name is None:
+            return ""
+        if artifact_name in COMMAND_ARTIFACTS:
+            name = self._command_fragment(name)
+        return load_fragment_template(name).source_hash
+    
+    def _render_fragments(self, name, values=None):
+        """渲染片段模板；缓存友好布局下槽位取值集中放在文末"""
+        if self.cache_layout:
+            return render_cache_layout(name, values)
+        return render_fragments(name, values)
+    
+    def _render_artifact(self, artifact_name, config, builder, extra_key=""):
+        """
+        通过渲染缓存构建产物
+        
+        缓存键为 (产物名称, 依赖配置的指纹, 额外输入, 布局, 片段模板源码哈希)，带生成时间的产物以占位符缓存，
+        取出后再替换为本次生成时间
+        """
+        keys = ARTIFACT_DEPENDENCIES.get(artifact_name)
+        cache_key = (artifact_name, config_fingerprint(config, keys), extra_key, self.cache_layout,
+                     self._fragment_hash(artifact_name))
         
-        readme_file = output_dir / "README.md"
-        with open(readme_file, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        timestamped = builder in (self._build_execution_plan, self._build_readme)
         
-        console.print(f"[green]✅ README文件已生成: {readme_file.name}[/green]")
+        def render():
+            # 只有缓存未命中时才会调用，记录本次实际重新渲染的产物
+            self.last_rendered.append(artifact_name)
+            if timestamped:
+                return builder(config, generated_at=GENERATED_AT_PLACEHOLDER)
+            return builder(config)
+        
+        with span("context.render", artifact=artifact_name):
+            content = self.render_memo.get_or_render(cache_key, render)
+        
+        if timestamped:
+            return content.replace(GENERATED_AT_PLACEHOLDER, self._format_generated_at())
+        return content
+    
+    def get_render_stats(self):
+        """获取渲染缓存统计（命中数、未命中数、命中率等）"""
+        return self.render_memo.get_stats()
+    
+    def _format_generated_at(self):
+        """格式化当前生成时间"""
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def _template_hash(self, template_name):
+        """获取模板源码哈希（模板不存在时返回空字符串）"""
+        template_file = self.templates_dir / template_name
+        if not template_file.is_file():
+            return ""
+        return hash_bytes(template_file.read_bytes())
     
     def _build_system_prompt(self, config):
         """构建系统提示词"""
         if self.jinja_env:
             try:
                 # 使用Jinja2模板
-                template = self.jinja_env.get_template('system_prompt_template.md')
+                template = self.jinja_env.get_template(self._system_prompt_template())
                 return template.render(**config)
             except Exception as e:
                 logger.warning(f"模板渲染失败，使用默认方式: {e}")
@@ -296,390 +593,23 @@ class ContextGenerator:
         return "\n".join(integrations) if integrations else ""
     
     def _build_user_prompt(self, config):
-        """构建用户提示词"""
-        return f"""# Java项目生成用户需求
-
-请根据config.json配置文件生成一个完整的Java Spring Boot项目。
-
-## 🚨 重要说明
-
-### 项目创建位置
-**必须在新的文件夹中创建项目，文件夹名称使用config.json中的project_name字段值。**
-
-**禁止在当前目录直接生成项目文件，必须创建新的项目目录。**
-
-### 配置文件引用
-**所有项目配置信息请从config.json文件中动态读取**，包括但不限于：
-
-#### 项目基本信息
-- 项目名称 (project_name)
-- 基础包名 (package_name)
-- 项目版本 (version)
-- 项目描述 (description)
-
-#### 技术版本配置
-- JDK版本 (jdk_version)
-- 构建工具 (build_tool)
-- Spring Boot版本 (spring_boot_version)
-
-#### 项目架构
-- 项目类型 (is_multi_module)
-- 模块配置 (modules)
-
-#### 技术栈配置
-- 数据库 (database)
-- ORM框架 (orm_framework)
-- 缓存 (cache)
-- 消息队列 (message_queue)
-
-#### 附加组件
-- API文档 (include_swagger)
-- 安全框架 (include_security)
-- 监控组件 (include_actuator)
-
-#### 生成选项
-- 示例代码 (generate_sample_code)
-- 测试代码 (generate_tests)
-- Docker配置 (generate_docker)
-- README文档 (generate_readme)
-
-## 📁 项目结构要求
-
-### ⚠️ 重要：项目创建位置
-**必须首先创建一个新的项目文件夹，文件夹名称为config.json中的project_name值，然后在该文件夹内创建所有项目文件。**
-
-**绝对不允许在当前工作目录直接创建src、pom.xml等项目文件！**
-
-### 基础项目结构
-请按以下步骤创建标准的Spring Boot项目结构：
-
-1. **第一步：创建项目根目录**
-   ```
-   mkdir {{project_name}}
-   cd {{project_name}}
-   ```
-
-2. **第二步：在项目根目录内创建完整结构**
-   ```
-   {{project_name}}/                    ← 这是新创建的项目根目录
-   ├── src/                          ← 在项目根目录内创建src
-   │   ├── main/
-   │   │   ├── java/
-   │   │   │   └── {{package_name_path}}/
-   │   │   │       ├── {{MainClassName}}Application.java
-   │   │   │       ├── controller/
-   │   │   │       ├── service/
-   │   │   │       │   └── impl/
-   │   │   │       ├── repository/
-   │   │   │       ├── entity/
-   │   │   │       ├── dto/
-   │   │   │       ├── config/
-   │   │   │       └── exception/
-   │   │   └── resources/
-   │   │       ├── application.yml
-   │   │       ├── application-dev.yml
-   │   │       ├── application-test.yml
-   │   │       └── application-prod.yml
-   │   └── test/
-   │       └── java/
-   │           └── {{package_name_path}}/
-   ├── {{build_file}}                  ← 在项目根目录内创建构建文件
-   ├── Dockerfile (如果generate_docker=true)
-   ├── docker-compose.yml (如果generate_docker=true)
-   └── README.md (如果generate_readme=true)
-   ```
-
-**再次强调：所有文件都必须在新创建的{{project_name}}文件夹内，不得在当前目录直接创建项目文件！**
-
-## 💻 示例代码生成要求
-
-**当config.json中generate_sample_code=true时，请生成以下示例代码：**
-
-### 1. 示例实体类 (Entity)
-```java
-// 示例：用户实体
-@Entity
-@Table(name = "users")
-public class User {{
-    @Id
-    @GeneratedValue(strategy = GenerationType.IDENTITY)
-    private Long id;
-    
-    @Column(nullable = false, unique = true)
-    private String username;
-    
-    @Column(nullable = false)
-    private String email;
-    
-    @CreationTimestamp
-    private LocalDateTime createdAt;
-    
-    @UpdateTimestamp
-    private LocalDateTime updatedAt;
-    
-    // 构造函数、getter、setter
-}}
-```
-
-### 2. 示例Repository接口
-```java
-@Repository
-public interface UserRepository extends JpaRepository<User, Long> {{
-    Optional<User> findByUsername(String username);
-    Optional<User> findByEmail(String email);
-    boolean existsByUsername(String username);
-    boolean existsByEmail(String email);
-}}
-```
-
-### 3. 示例Service层
-```java
-@Service
-@Transactional
-public class UserService {{
-    
-    private final UserRepository userRepository;
-    
-    public UserService(UserRepository userRepository) {{
-        this.userRepository = userRepository;
-    }}
-    
-    public List<User> findAll() {{
-        return userRepository.findAll();
-    }}
-    
-    public Optional<User> findById(Long id) {{
-        return userRepository.findById(id);
-    }}
-    
-    public User save(User user) {{
-        return userRepository.save(user);
-    }}
-    
-    public void deleteById(Long id) {{
-        userRepository.deleteById(id);
-    }}
-}}
-```
-
-### 4. 示例Controller层
-```java
-@RestController
-@RequestMapping("/api/users")
-@Validated
-public class UserController {{
-    
-    private final UserService userService;
-    
-    public UserController(UserService userService) {{
-        this.userService = userService;
-    }}
-    
-    @GetMapping
-    public ResponseEntity<List<User>> getAllUsers() {{
-        List<User> users = userService.findAll();
-        return ResponseEntity.ok(users);
-    }}
-    
-    @GetMapping("/{{id}}")
-    public ResponseEntity<User> getUserById(@PathVariable Long id) {{
-        return userService.findById(id)
-                .map(user -> ResponseEntity.ok(user))
-                .orElse(ResponseEntity.notFound().build());
-    }}
-    
-    @PostMapping
-    public ResponseEntity<User> createUser(@Valid @RequestBody User user) {{
-        User savedUser = userService.save(user);
-        return ResponseEntity.status(HttpStatus.CREATED).body(savedUser);
-    }}
-    
-    @PutMapping("/{{id}}")
-    public ResponseEntity<User> updateUser(@PathVariable Long id, @Valid @RequestBody User user) {{
-        return userService.findById(id)
-                .map(existingUser -> {{
-                    user.setId(id);
-                    User updatedUser = userService.save(user);
-                    return ResponseEntity.ok(updatedUser);
-                }})
-                .orElse(ResponseEntity.notFound().build());
-    }}
-    
-    @DeleteMapping("/{{id}}")
-    public ResponseEntity<Void> deleteUser(@PathVariable Long id) {{
-        if (userService.findById(id).isPresent()) {{
-            userService.deleteById(id);
-            return ResponseEntity.noContent().build();
-        }}
-        return ResponseEntity.notFound().build();
-    }}
-}}
-```
-
-### 5. 示例DTO类
-```java
-public class UserDTO {{
-    @NotBlank(message = "用户名不能为空")
-    private String username;
-    
-    @Email(message = "邮箱格式不正确")
-    @NotBlank(message = "邮箱不能为空")
-    private String email;
-    
-    // 构造函数、getter、setter
-}}
-```
-
-### 6. 全局异常处理
-```java
-@RestControllerAdvice
-public class GlobalExceptionHandler {{
-    
-    @ExceptionHandler(ValidationException.class)
-    public ResponseEntity<ErrorResponse> handleValidationException(ValidationException ex) {{
-        ErrorResponse error = new ErrorResponse("VALIDATION_ERROR", ex.getMessage());
-        return ResponseEntity.badRequest().body(error);
-    }}
-    
-    @ExceptionHandler(EntityNotFoundException.class)
-    public ResponseEntity<ErrorResponse> handleEntityNotFoundException(EntityNotFoundException ex) {{
-        ErrorResponse error = new ErrorResponse("NOT_FOUND", ex.getMessage());
-        return ResponseEntity.notFound().build();
-    }}
-    
-    @ExceptionHandler(Exception.class)
-    public ResponseEntity<ErrorResponse> handleGenericException(Exception ex) {{
-        ErrorResponse error = new ErrorResponse("INTERNAL_ERROR", "服务器内部错误");
-        return ResponseEntity.status(HttpStatus.INTERNAL_SERVER_ERROR).body(error);
-    }}
-}}
-```
-
-## 🔧 生成要求
-
-请根据config.json中的配置动态生成项目内容，确保：
-
-1. **项目目录**: 创建以project_name命名的新文件夹
-2. **项目结构**: 使用清晰的分层架构和标准的Maven/Gradle项目结构
-3. **代码质量**: 遵循Java最佳实践和Spring Boot规范
-4. **配置管理**: 提供多环境配置支持（dev、test、prod）
-5. **技术栈集成**: 根据配置集成相应的数据库、缓存、消息队列等组件
-6. **示例代码**: 当generate_sample_code=true时，生成上述示例代码
-7. **错误处理**: 实现全局异常处理和适当的错误响应
-8. **日志记录**: 配置合理的日志级别和输出格式
-9. **API设计**: 遵循RESTful API设计规范
-10. **数据验证**: 实现输入数据验证和业务规则检查
-11. **安全考虑**: 实现基本的安全配置和最佳实践
-
-## 🚀 项目启动要求
-
-生成的项目应该能够：
-- 直接编译和运行
-- 通过Maven/Gradle命令启动
-- 访问基本的健康检查端点
-- 连接配置的数据库（如有）
-- 正常处理API请求
-- 示例API能够正常工作（如果生成了示例代码）
-
-请确保生成的项目是一个完整、可运行的Spring Boot应用程序，严格按照config.json中的配置要求进行生成。
-"""
+        """构建用户提示词（全部为静态文本）"""
+        return self._render_fragments("user_prompt.md")
     
+
     def _build_gemini_commands(self, config):
         """构建Gemini斜杠命令"""
-        return f"""# Gemini CLI 项目生成命令
-
-# 使用方法:
-# 1. 将此文件保存为 project_generator.gemini
-# 2. 在Gemini CLI中执行: gemini run project_generator.gemini
-
-/system
-你是一个专业的Java项目架构师和开发专家，擅长创建高质量的Spring Boot项目。
-
-请严格按照当前目录下的执行计划文件(execution_plan.md)中定义的三个步骤执行项目生成。
-
-同时请遵循system_prompt.md中定义的项目生成规范和代码质量要求。
-
-/user
-请根据当前目录下的配置文件生成Java Spring Boot项目：
-
-**🚨 重要项目创建位置要求：**
-1. **必须首先创建一个新的项目文件夹，文件夹名称为config.json中的project_name值**
-2. **然后在该文件夹内创建所有项目文件（src、pom.xml等）**
-3. **绝对不允许在当前工作目录直接创建src、pom.xml等项目文件**
-4. **项目结构应为：{config['project_name']}/src/main/java/... 而不是 src/main/java/...**
-
-**配置文件引用：**
-- 系统提示词：system_prompt.md
-- 用户需求：user_prompt.md  
-- 项目配置：config.json
-- 执行计划：execution_plan.md
-
-**配置信息读取：**
-所有项目配置信息请从config.json文件中动态读取，包括但不限于：
-- 项目名称、包名、版本号
-- JDK版本、Spring Boot版本、构建工具
-- 数据库、ORM框架、缓存、消息队列配置
-- 各种生成选项和附加组件配置
-- 示例代码生成选项 (generate_sample_code)
-
-请按照execution_plan.md中的三步执行计划开始生成项目。
-
-/generate_project
-# 启动Java项目生成器
-echo "🚀 启动Java Spring Boot项目生成器"
-echo "📁 读取配置文件: config.json"
-echo "📝 应用系统提示词: system_prompt.md"
-echo "👤 应用用户需求: user_prompt.md"
-echo "⚡ 执行计划: execution_plan.md"
-echo "🔧 开始三步执行流程..."
-"""
+        return self._render_fragments(self._command_fragment("project_generator.gemini"),
+                                {"project_name": config['project_name']})
     
+
     def _build_project_structure(self, config):
         """构建项目结构说明"""
-        base_structure = f"""
-# {config['project_name']} 项目结构说明
-
-## 标准项目结构
-
-```
-{config['project_name']}/
-├── src/
-│   ├── main/
-│   │   ├── java/
-│   │   │   └── {config['package_name'].replace('.', '/')}/
-│   │   │       ├── {config['project_name'].replace('-', '').title()}Application.java
-│   │   │       ├── controller/
-│   │   │       │   └── *.java
-│   │   │       ├── service/
-│   │   │       │   ├── impl/
-│   │   │       │   └── *.java
-│   │   │       ├── repository/
-│   │   │       │   └── *.java
-│   │   │       ├── entity/
-│   │   │       │   └── *.java
-│   │   │       ├── dto/
-│   │   │       │   └── *.java
-│   │   │       ├── config/
-│   │   │       │   └── *.java
-│   │   │       └── exception/
-│   │   │           └── *.java
-│   │   └── resources/
-│   │       ├── application.yml
-│   │       ├── application-dev.yml
-│   │       ├── application-test.yml
-│   │       ├── application-prod.yml
-│   │       └── static/
-│   └── test/
-│       └── java/
-│           └── {config['package_name'].replace('.', '/')}/
-│               └── *Test.java
-├── target/ (Maven) 或 build/ (Gradle)
-├── pom.xml (Maven) 或 build.gradle (Gradle)
-├── Dockerfile
-├── docker-compose.yml
-└── README.md
-```
-"""
+        base_structure = self._render_fragments("project_structure.md", {
+            "project_name": config['project_name'],
+            "package_path": config['package_name'].replace('.', '/'),
+            "application_class": f"{config['project_name'].replace('-', '').title()}Application"
+        })
         
         if config['is_multi_module'] and config['modules']:
             base_structure += "\n## 多模块结构\n\n"
@@ -691,325 +621,35 @@ echo "🔧 开始三步执行流程..."
         
         return base_structure
     
-    def _build_execution_plan(self, config):
+    def _build_execution_plan(self, config, generated_at=None):
         """构建执行计划"""
-        return f"""# Java项目生成执行计划
-
-> 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-本文档定义了Java Spring Boot项目生成的详细执行步骤，确保生成的项目符合配置要求且能正常运行。
-
-## 执行概览
-
-本执行计划包含三个核心步骤：
-1. **配置校验与版本兼容性检查** - 确保技术栈版本兼容
-2. **项目模板生成** - 基于规范和需求生成项目代码
-3. **配置应用与验证** - 应用配置并验证项目可用性
-
----
-
-## 第一步：配置校验与版本兼容性检查
-
-### 1.1 配置文件解析
-
-**目标**: 读取并验证config.json配置文件的完整性
-
-**执行步骤**:
-1. 读取当前目录下的`config.json`文件
-2. 验证必要字段是否存在：
-   - project_name, package_name, version, description
-   - jdk_version, build_tool, spring_boot_version
-   - database, orm_framework, cache, message_queue
-   - 各种布尔配置项
-3. 检查字段值的有效性（非空、格式正确等）
-
-### 1.2 版本兼容性检查
-
-**目标**: 确保所选技术栈版本之间兼容，避免运行时冲突
-
-**关键兼容性规则**:
-- Spring Boot 3.x 要求 JDK 17+
-- Spring Boot 2.7.x 支持 JDK 8/11/17
-- Spring Boot 2.6.x 及以下支持 JDK 8/11
-- Maven: 3.6.3+ (推荐 3.8.x)
-- Gradle: 7.x+ (推荐 8.x)
-
-**检查项目**:
-1. JDK与Spring Boot版本兼容性
-2. 数据库与ORM框架兼容性
-3. 构建工具版本要求
-4. 中间件版本兼容性
-
-### 1.3 版本冲突解决
-
-**执行逻辑**:
-1. 如发现版本冲突，输出详细的冲突说明
-2. 自动选择兼容的版本组合
-3. 记录版本调整的原因和影响
-4. 更新配置并继续执行
-
----
-
-## 第二步：项目模板生成
-
-### 2.1 应用系统提示词规范
-
-**目标**: 根据system_prompt.md中定义的规范生成项目结构
-
-**执行步骤**:
-1. 读取`system_prompt.md`文件内容
-2. 应用项目生成规范（详见system_prompt.md）
-
-### 2.2 应用用户需求描述
-
-**目标**: 根据user_prompt.md中的具体需求定制项目
-
-**执行步骤**:
-1. 读取`user_prompt.md`文件内容
-2. 解析用户的具体需求（详见user_prompt.md）
-
-### 2.3 生成项目基础结构
-
-**目标**: 创建符合规范的项目目录结构和基础文件
-
-**生成内容**:
-- 构建文件：pom.xml (Maven) 或 build.gradle (Gradle)
-- 标准Java包结构（基于config.json中的package_name）
-- Spring Boot主类（基于config.json中的project_name）
-- 多环境配置文件
-- 测试代码结构
-
-### 2.4 集成技术栈组件
-
-**根据config.json配置动态集成**:
-- 数据库集成（如果database != '无数据库'）
-- ORM框架集成（如果orm_framework != '无ORM'）
-- 缓存集成（如果cache != '无缓存'）
-- 消息队列集成（如果message_queue != '无消息队列'）
-- 附加组件（Swagger、Security、Actuator等）
-
----
-
-## 第三步：配置应用与验证
-
-### 3.1 配置参数应用
-
-**目标**: 将config.json中的所有配置应用到生成的项目中
-
-**应用范围**:
-- 项目基本信息（名称、包名、版本、描述）
-- 技术版本配置（JDK、Spring Boot、构建工具）
-- 技术栈配置（数据库、ORM、缓存、消息队列）
-- 生成选项（示例代码、测试代码、Docker、README等）
-
-### 3.2 项目结构验证
-
-**验证项目**:
-1. 目录结构是否正确
-2. 包名是否与配置一致
-3. 主类名是否正确
-4. 配置文件是否完整
-5. 依赖是否正确添加
-
-### 3.3 编译和运行验证
-
-**验证步骤**:
-1. 检查构建文件语法正确性
-2. 验证依赖版本兼容性
-3. 确保配置文件格式正确
-4. 验证主类能够正常启动
-5. 检查测试代码能够正常运行
-
-### 3.4 最终输出
-
-**成功标准**:
-- ✅ 项目结构完整且符合规范
-- ✅ 所有配置正确应用
-- ✅ 项目能够正常编译
-- ✅ 应用能够正常启动
-- ✅ 测试代码能够正常执行
-
----
-
-## 执行注意事项
-
-### 错误处理
-- 如遇到版本冲突，自动调整并说明原因
-- 如配置文件格式错误，提供详细错误信息
-- 如依赖下载失败，提供替代方案
-
-### 质量保证
-- 生成的代码必须符合Java编码规范
-- 所有配置文件必须格式正确
-- 项目必须能够直接编译和运行
-- 测试覆盖率达到基本要求
-
-### 性能优化
-- 使用合理的依赖版本
-- 配置适当的连接池大小
-- 启用必要的缓存机制
-- 优化启动时间
-
----
-
-## 执行完成标志
-
-当以下所有条件满足时，认为执行计划完成：
-
-1. ✅ 配置校验通过，无版本冲突
-2. ✅ 项目结构生成完整
-3. ✅ 所有配置正确应用
-4. ✅ 项目编译成功
-5. ✅ 应用启动正常
-6. ✅ 测试执行通过
-
-**最终输出**: 一个完整、可运行的Java Spring Boot项目，符合config.json中的配置要求。
-```
-src/test/java/{config['package_name'].replace('.', '/')}/
-├── {config['project_name'].replace('-', '').title()}ApplicationTests.java
-├── controller/
-├── service/
-└── repository/
-```
-
-### 2.4 集成技术栈组件
-
-**数据库集成** (如果 database != '无数据库'):
-- 数据库连接配置
-- 数据源配置
-- 连接池配置
-
-**ORM框架集成** (如果 orm_framework != '无ORM'):
-- MyBatis: 配置文件、Mapper接口、XML映射文件
-- JPA: Entity注解、Repository接口、配置
-
-**缓存集成** (如果 cache != '无缓存'):
-- Redis: 连接配置、序列化配置
-- Caffeine: 本地缓存配置
-
-**消息队列集成** (如果 message_queue != '无消息队列'):
-- RabbitMQ: 连接配置、队列定义
-- Kafka: 生产者和消费者配置
-
-**附加组件**:
-- Swagger: API文档配置 (如果 include_swagger = true)
-- Security: 安全配置 (如果 include_security = true)
-- Actuator: 监控配置 (如果 include_actuator = true)
-
----
-
-## 第三步：配置应用与验证
-
-### 3.1 配置参数应用
-
-**目标**: 将config.json中的所有配置应用到生成的项目中
-
-**应用项目**:
-
-#### 项目基本信息
-- 项目名称: `{config['project_name']}`
-- 基础包名: `{config['package_name']}`
-- 项目版本: `{config['version']}`
-- 项目描述: `{config['description']}`
-
-#### 技术版本配置
-- JDK版本: Java {config['jdk_version']}
-- 构建工具: {config['build_tool']}
-- Spring Boot版本: {config['spring_boot_version']}
-
-#### 技术栈配置
-- 数据库: {config['database']}
-- ORM框架: {config['orm_framework']}
-- 缓存: {config['cache']}
-- 消息队列: {config['message_queue']}
-
-#### 生成选项
-- 示例代码: {'是' if config['generate_sample_code'] else '否'}
-- 测试代码: {'是' if config['generate_tests'] else '否'}
-- Docker配置: {'是' if config['generate_docker'] else '否'}
-- README文档: {'是' if config['generate_readme'] else '否'}
-
-### 3.2 项目结构验证
-
-**目标**: 确保生成的项目结构符合配置要求
-
-**验证项目**:
-1. 目录结构是否正确
-2. 包名是否与配置一致
-3. 主类名是否正确
-4. 配置文件是否完整
-5. 依赖是否正确添加
-
-### 3.3 编译和运行验证
-
-**目标**: 验证生成的项目能够正常编译和启动
-
-**验证步骤**:
-1. 检查构建文件语法正确性
-2. 验证依赖版本兼容性
-3. 确保配置文件格式正确
-4. 验证主类能够正常启动
-5. 检查测试代码能够正常运行
-
-### 3.4 最终输出
-
-**成功标准**:
-- ✅ 项目结构完整且符合规范
-- ✅ 所有配置正确应用
-- ✅ 项目能够正常编译
-- ✅ 应用能够正常启动
-- ✅ 测试代码能够正常执行
-
-**输出内容**:
-1. 完整的项目源代码
-2. 构建和配置文件
-3. 测试代码
-4. Docker配置 (如果启用)
-5. README文档 (如果启用)
-6. 项目运行说明
-
----
-
-## 执行注意事项
-
-### 错误处理
-- 如遇到版本冲突，自动调整并说明原因
-- 如配置文件格式错误，提供详细错误信息
-- 如依赖下载失败，提供替代方案
-
-### 质量保证
-- 生成的代码必须符合Java编码规范
-- 所有配置文件必须格式正确
-- 项目必须能够直接编译和运行
-- 测试覆盖率达到基本要求
-
-### 性能优化
-- 使用合理的依赖版本
-- 配置适当的连接池大小
-- 启用必要的缓存机制
-- 优化启动时间
-
----
-
-## 执行完成标志
-
-当以下所有条件满足时，认为执行计划完成：
-
-1. ✅ 配置校验通过，无版本冲突
-2. ✅ 项目结构生成完整
-3. ✅ 所有配置正确应用
-4. ✅ 项目编译成功
-5. ✅ 应用启动正常
-6. ✅ 测试执行通过
-
-**最终输出**: 一个完整、可运行的Java Spring Boot项目，符合用户配置要求。
-"""
-    
-    def _build_readme(self, config):
+        return self._render_fragments("execution_plan.md", {
+            "generated_at": generated_at or self._format_generated_at(),
+            "project_name": config['project_name'],
+            "package_name": config['package_name'],
+            "package_path": config['package_name'].replace('.', '/'),
+            "application_class": f"{config['project_name'].replace('-', '').title()}Application",
+            "version": config['version'],
+            "description": config['description'],
+            "jdk_version": config['jdk_version'],
+            "build_tool": config['build_tool'],
+            "spring_boot_version": config['spring_boot_version'],
+            "database": config['database'],
+            "orm_framework": config['orm_framework'],
+            "cache": config['cache'],
+            "message_queue": config['message_queue'],
+            "generate_sample_code": '是' if config['generate_sample_code'] else '否',
+            "generate_tests": '是' if config['generate_tests'] else '否',
+            "generate_docker": '是' if config['generate_docker'] else '否',
+            "generate_readme": '是' if config['generate_readme'] else '否'
+        })
+    
+
+    def _build_readme(self, config, generated_at=None):
         """构建README文件内容"""
         return f"""# {config['project_name']} 上下文工程
 
-> 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+> 生成时间: {generated_at or self._format_generated_at()}
 
 这是一个用于生成 **{config['project_name']}** Java Spring Boot项目的上下文工程。
 
@@ -1100,95 +740,5 @@ src/test/java/{config['package_name'].replace('.', '/')}/
     
     def _build_claude_commands(self, config):
         """构建Claude Code斜杠命令"""
-        return f"""# Claude Code 项目生成器斜杠命令
-
-## 系统提示词设置
-/system
-请查看 system_prompt.md 文件获取完整的系统提示词。你是一个专业的Java项目架构师和开发专家，擅长创建高质量的Spring Boot项目。请根据config.json配置文件中的要求，生成一个完整的Java项目。
-
-## 用户需求设置
-/user
-请查看 user_prompt.md 文件获取完整的用户提示词。请根据config.json配置文件生成一个完整的Java Spring Boot项目。
-
-🚨 重要项目创建位置要求：
-1. **必须首先创建一个新的项目文件夹，文件夹名称为config.json中的project_name值**
-2. **然后在该文件夹内创建所有项目文件（src、pom.xml等）**
-3. **绝对不允许在当前工作目录直接创建src、pom.xml等项目文件**
-4. **项目结构应为：{project_name}/src/main/java/... 而不是 src/main/java/...**
-5. 所有项目配置信息请从config.json文件中动态读取
-6. 当generate_sample_code=true时，请生成完整的示例代码
-
-## 执行计划查看
-/plan
-请查看 execution_plan.md 文件获取详细的项目生成执行计划，包含配置校验、项目模板生成、配置应用与验证三个核心步骤。
-
-## 项目结构说明
-/structure
-请查看 project_structure.md 文件了解标准的Java Spring Boot项目结构和最佳实践。
-
-## 配置文件查看
-/config
-请查看 config.json 文件了解项目的具体配置要求，包括技术栈版本、组件选择、生成选项等。
-
-## 项目生成命令
-/generate
-根据 config.json 文件中的配置生成完整的Java Spring Boot项目。
-
-执行步骤：
-1. 读取并解析 config.json 配置文件
-2. 根据配置创建标准的项目结构
-3. 生成所有必要的源代码文件
-4. 配置构建文件和依赖管理
-5. 创建配置文件和环境设置
-6. 生成测试代码和文档
-7. 提供Docker配置和部署说明
-
-## 快速开始
-/start
-一键生成项目的快速命令：
-1. 首先执行 /config 查看配置
-2. 然后执行 /generate 生成项目
-3. 最后检查生成的项目结构和文件
-
-## 帮助信息
-/help
-显示所有可用的斜杠命令和使用说明：
-
-- `/system` - 设置系统提示词
-- `/user` - 设置用户需求
-- `/plan` - 查看执行计划
-- `/structure` - 查看项目结构说明
-- `/config` - 查看配置文件
-- `/generate` - 生成完整项目
-- `/start` - 快速开始生成
-- `/help` - 显示帮助信息
-
-## 使用说明
-
-### 在Claude Code中使用
-1. 打开Claude Code编辑器
-2. 加载此 .claude 文件
-3. 确保同目录下有以下文件：
-   - config.json (项目配置)
-   - system_prompt.md (系统提示词)
-   - user_prompt.md (用户提示词)
-   - execution_plan.md (执行计划)
-   - project_structure.md (项目结构说明)
-4. 使用上述斜杠命令进行项目生成
-
-### 推荐工作流
-1. `/config` - 确认项目配置
-2. `/system` - 加载系统提示词
-3. `/user` - 加载用户需求
-4. `/generate` - 生成完整项目
-
-### 注意事项
-- 所有配置信息都从 config.json 文件中动态读取
-- 生成的项目将严格按照配置要求创建
-- 确保配置文件格式正确且完整
-- 生成的项目可直接编译和运行
-
----
-
-*Claude Code 斜杠命令文件 - 支持在Claude Code中直接使用命令生成Java Spring Boot项目*
-"""
\ No newline at end of file
+        return self._render_fragments(self._command_fragment("project_generator.claude"),
+                                {"project_name": config['project_name']})
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+预演（dry-run）模块
+提供与 OutputWriter 相同写入接口的输出计划：只记录每个文件的路径、字节数和渲染耗时，
+不保存内容，也不创建任何目录或文件，可用于在大批量生成前估算磁盘占用和耗时
+"""
+
+import time
+import threading
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Dict, Any, List, Iterable, Union
+
+from .output_writer import WriteSummary, STATUS_ADDED
+
+
+@dataclass
+class PlannedFile:
+    """输出计划中的单个文件"""
+    path: str
+    size: int
+    render_seconds: float
+    template_hash: str = ""
+
+
+class DryRunPlan:
+    """
+    预演输出计划
+    
+    每个文件的渲染耗时为同一线程上一次写入（或开始、创建目录）到本次写入之间的时间。
+    生成器总是先渲染再写入，因此该时间就是该文件的渲染耗时；需要准确的单文件耗时时应顺序渲染。
+    """
+    
+    def __init__(self, root_name: str = ""):
+        """
+        初始化输出计划
+        
+        Args:
+            root_name: 项目目录名称
+        """
+        self.root_name = root_name
+        self.root = Path(root_name)
+        self.summary = WriteSummary()
+        self.files: List[PlannedFile] = []
+        self.started_at = time.perf_counter()
+        self.elapsed_seconds = 0.0
+        
+        self._directories = set()
+        self._marks = threading.local()
+        self._lock = threading.Lock()
+    
+    def write_text(self, relative_path: str, content: str, template_hash: str = "") -> str:
+        """
+        记录文本文件
+        
+        Args:
+            relative_path: 相对于根目录的路径
+            content: 文件内容（只统计字节数）
+            template_hash: 生成该文件的模板哈希
+        
+        Returns:
+            str: 写入状态（预演中总是 added）
+        """
+        return self.write_bytes(relative_path, content.encode('utf-8'), template_hash)
+    
+    def write_bytes(self, relative_path: str, data: bytes, template_hash: str = "") -> str:
+        """
+        记录二进制文件
+        
+        Args:
+            relative_path: 相对于根目录的路径
+            data: 文件内容（只统计字节数）
+            template_hash: 生成该文件的模板哈希
+        
+        Returns:
+            str: 写入状态（预演中总是 added）
+        """
+        return self._record(relative_path, len(data), template_hash)
+    
+    def write_stream(self, relative_path: str, chunks: Iterable[Union[str, bytes]], template_hash: str = "") -> str:
+        """
+        记录分块写入的文件（逐块统计字节数，不保存内容）
+        
+        Args:
+            relative_path: 相对于根目录的路径
+            chunks: 文件内容分块（str 按UTF-8编码）
+            template_hash: 生成该文件的模板哈希
+        
+        Returns:
+            str: 写入状态（预演中总是 added）
+        """
+        size = sum(len(chunk.encode('utf-8') if isinstance(chunk, str) else chunk) for chunk in chunks)
+        return self._record(relative_path, size, template_hash)
+    
+    def make_dirs(self, relative_paths) -> None:
+        """
+        记录需要创建的目录（不创建）
+        
+        Args:
+            relative_paths: 相对于根目录的目录路径列表
+        """
+        with self._lock:
+            for relative_path in relative_paths:
+                key = PurePosixPath(Path(relative_path).as_posix()).as_posix()
+                if key != ".":
+                    self._directories.add(key)
+        self._marks.last = time.perf_counter()
+    
+    def finalize(self) -> WriteSummary:
+        """
+        完成预演（与 OutputWriter 接口一致）
+        
+        Returns:
+            WriteSummary: 写入汇总（全部为新增）
+        """
+        self.elapsed_seconds = time.perf_counter() - self.started_at
+        return self.summary
+    
+    def _record(self, relative_path: str, size: int, template_hash: str) -> str:
+        """记录文件，耗时为本线程上一次写入到现在的时间"""
+        now = time.perf_counter()
+        render_seconds = now - getattr(self._marks, "last", self.started_at)
+        key = PurePosixPath(Path(relative_path).as_posix()).as_posix()
+        
+        with self._lock:
+            self.files.append(PlannedFile(key, size, render_seconds, template_hash))
+            self.summary.added.append(key)
+        self._marks.last = time.perf_counter()
+        return STATUS_ADDED
+    
+    @property
+    def total_bytes(self) -> int:
+        """全部文件的字节数"""
+        return sum(item.size for item in self.files)
+    
+    @property
+    def render_seconds(self) -> float:
+        """全部文件的渲染耗时之和"""
+        return sum(item.render_seconds for item in self.files)
+    
+    def list_directories(self) -> List[str]:
+        """列出需要创建的目录，包括文件的上级目录（按路径排序）"""
+        directories = set()
+        for path in list(self._directories) + [item.path for item in self.files]:
+            parts = PurePosixPath(path).parts
+            limit = len(parts) if path in self._directories else len(parts) - 1
+            for i in range(1, limit + 1):
+                directories.add("/".join(parts[:i]))
+        return sorted(directories)
+    
+    def describe(self) -> str:
+        """生成一行中文汇总"""
+        return (f"{len(self.files)} 个文件，{len(self.list_directories())} 个目录，"
+                f"共 {self.total_bytes} 字节，渲染耗时 {self.render_seconds * 1000:.1f}ms")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化为JSON的字典"""
+        return {
+            "project": self.root_name,
+            "files": [
+                {"path": item.path, "size": item.size, "render_ms": round(item.render_seconds * 1000, 3)}
+                for item in sorted(self.files, key=lambda item: item.path)
+            ],
+            "directories": self.list_directories(),
+            "total_bytes": self.total_bytes,
+            "render_ms": round(self.render_seconds * 1000, 3),
+            "elapsed_ms": round(self.elapsed_seconds * 1000, 3)
+        }
+
+
+def summarize_plans(plans: Iterable[DryRunPlan]) -> Dict[str, Any]:
+    """
+    汇总多个项目的输出计划
+    
+    Args:
+        plans: 输出计划
+    
+    Returns:
+        Dict[str, Any]: 项目数、文件数、目录数、总字节数和耗时
+    """
+    plans = list(plans)
+    return {
+        "projects": len(plans),
+        "files": sum(len(plan.files) for plan in plans),
+        "directories": sum(len(plan.list_directories()) for plan in plans),
+        "total_bytes": sum(plan.total_bytes for plan in plans),
+        "render_ms": round(sum(plan.render_seconds for plan in plans) * 1000, 3),
+        "elapsed_ms": round(sum(plan.elapsed_seconds for plan in plans) * 1000, 3)
+    }
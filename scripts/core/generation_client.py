@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+生成服务客户端模块
+向常驻生成服务发送生成请求；只依赖标准库，客户端进程启动开销很小
+"""
+
+import json
+import socket
+import http.client
+from typing import Dict, Any, Optional
+from urllib.parse import urlencode, urlparse
+
+DEFAULT_SERVER_URL = "http://127.0.0.1:8765"
+DEFAULT_TIMEOUT_SECONDS = 300
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """通过Unix套接字发送HTTP请求的连接"""
+    
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+    
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class GenerationClient:
+    """生成服务客户端"""
+    
+    def __init__(self, server_url: str = DEFAULT_SERVER_URL, socket_path: Optional[str] = None,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        """
+        初始化客户端
+        
+        Args:
+            server_url: 服务地址（回环HTTP）
+            socket_path: Unix套接字路径；提供时忽略 server_url
+            timeout: 请求超时秒数
+        """
+        self.server_url = server_url
+        self.socket_path = socket_path
+        self.timeout = timeout
+    
+    def health(self) -> Dict[str, Any]:
+        """
+        获取服务状态
+        
+        Returns:
+            Dict[str, Any]: 服务状态
+        """
+        return json.loads(self._request("GET", "/health"))
+    
+    def generate(self, config: Dict[str, Any], kind: str = "context", output_base_dir: Optional[str] = None) -> str:
+        """
+        请求生成到服务端磁盘
+        
+        Args:
+            config: 项目配置
+            kind: 生成类型（context / project）
+            output_base_dir: 输出根目录（服务端路径），默认使用服务的输出根目录
+        
+        Returns:
+            str: 生成的项目路径
+        """
+        query = {"out": output_base_dir} if output_base_dir else {}
+        body = self._request("POST", f"/{kind}", config, query)
+        return json.loads(body)["output_path"]
+    
+    def archive(self, config: Dict[str, Any], kind: str = "context", fmt: str = "tar.gz") -> bytes:
+        """
+        请求在服务端内存中生成并返回归档
+        
+        Args:
+            config: 项目配置
+            kind: 生成类型（context / project）
+            fmt: 归档格式（tar.gz / zip）
+        
+        Returns:
+            bytes: 归档内容
+        """
+        return self._request("POST", f"/{kind}", config, {"archive": fmt})
+    
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None,
+                 query: Optional[Dict[str, str]] = None) -> bytes:
+        """
+        发送请求并返回响应体
+        
+        Raises:
+            ValueError: 服务端拒绝请求（配置无效等）
+            IOError: 无法连接服务或服务端内部错误
+        """
+        if query:
+            path = f"{path}?{urlencode(query)}"
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        
+        connection = self._connect()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except OSError as e:
+            raise IOError(f"无法连接生成服务: {e}")
+        finally:
+            connection.close()
+        
+        if response.status == 200:
+            return data
+        
+        try:
+            message = json.loads(data).get("error", "")
+        except ValueError:
+            message = data.decode("utf-8", errors="replace")
+        if 400 <= response.status < 500:
+            raise ValueError(message)
+        raise IOError(f"生成服务错误 ({response.status}): {message}")
+    
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.socket_path:
+            return _UnixHTTPConnection(self.socket_path, self.timeout)
+        url = urlparse(self.server_url)
+        return http.client.HTTPConnection(url.hostname or "127.0.0.1", url.port or 80, timeout=self.timeout)
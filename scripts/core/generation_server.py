@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+"""
+生成服务模块
+常驻进程中保持 ContextGenerator 和 ProjectGenerator 的模板环境常热，
+通过本机HTTP（回环地址或Unix套接字）接收生成请求，省去每次启动进程和编译模板的开销
+"""
+
+import io
+import os
+import json
+import stat
+import time
+import socket
+import logging
+import ipaddress
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from .context_generator import ContextGenerator
+from .project_generator import ProjectGenerator
+from .output_tree import ARCHIVE_TAR_GZ, ARCHIVE_ZIP
+from .jinja_registry import get_registry
+from ..constants.project_constants import ProjectConstants
+from ..validators.config_validator import ConfigValidator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 请求体大小上限（配置JSON不会超过该大小）
+MAX_REQUEST_BYTES = 10 * 1024 * 1024
+
+ARCHIVE_CONTENT_TYPES = {
+    ARCHIVE_TAR_GZ: "application/gzip",
+    ARCHIVE_ZIP: "application/zip"
+}
+
+# 请求类型：上下文工程 / Spring Boot项目
+KIND_CONTEXT = "context"
+KIND_PROJECT = "project"
+
+
+class GenerationService:
+    """
+    常驻生成服务
+    
+    按输出根目录缓存 ContextGenerator 实例（渲染缓存随实例常驻），ProjectGenerator 在启动时
+    预编译全部模板。生成器会记录 last_summary 等单次调用的状态，因此同一生成器上的请求串行执行，
+    不同输出根目录之间可以并发。请求指定的输出目录必须位于服务的输出根目录之内。
+    """
+    
+    def __init__(self, output_base_dir: str = "./output", template_manager=None):
+        """
+        初始化生成服务
+        
+        Args:
+            output_base_dir: 默认输出根目录
+            template_manager: ProjectGenerator 使用的模板管理器（可选）
+        """
+        self.output_base_dir = str(output_base_dir)
+        self.started_at = time.time()
+        self.requests = 0
+        self.failures = 0
+        
+        self._context_generators: Dict[str, Tuple[ContextGenerator, threading.Lock]] = {}
+        self._project_generator = ProjectGenerator(template_manager=template_manager)
+        self._project_lock = threading.Lock()
+        self._lock = threading.Lock()
+    
+    def warm_up(self) -> int:
+        """
+        预先创建默认的 ContextGenerator 并编译全部模板
+        
+        Returns:
+            int: 已编译的模板数量
+        """
+        compiled = 0
+        context_generator, _ = self._get_context_generator(self.output_base_dir)
+        if context_generator.jinja_env is not None:
+            for template_name in context_generator.jinja_env.list_templates():
+                if template_name.endswith(".md"):
+                    context_generator.jinja_env.get_template(template_name)
+                    compiled += 1
+        
+        jinja_env = self._project_generator.jinja_env
+        for template_name in jinja_env.list_templates():
+            jinja_env.get_template(template_name)
+            compiled += 1
+        
+        logger.info(f"生成服务预热完成，已编译 {compiled} 个模板")
+        return compiled
+    
+    def generate(self, kind: str, config: Dict[str, Any], output_base_dir: Optional[str] = None) -> str:
+        """
+        生成到磁盘
+        
+        Args:
+            kind: 请求类型（context / project）
+            config: 项目配置
+            output_base_dir: 输出根目录，默认使用服务的输出根目录；必须位于服务的输出根目录之内
+        
+        Returns:
+            str: 生成的项目路径
+        
+        Raises:
+            ValueError: 请求类型未知、配置验证失败或输出目录超出服务的输出根目录
+        """
+        self._count_request()
+        output_base_dir = self._check_output_path(output_base_dir or self.output_base_dir)
+        
+        if kind == KIND_CONTEXT:
+            self._validate_context_config(config)
+            self._check_output_path(os.path.join(output_base_dir, config['project_name']))
+            generator, generator_lock = self._get_context_generator(output_base_dir)
+            with generator_lock:
+                return generator.generate(config)
+        
+        if kind == KIND_PROJECT:
+            config = dict(config)
+            output_dir = config.get(ProjectConstants.CONFIG_OUTPUT_DIR) or output_base_dir
+            output_dir = self._check_output_path(output_dir)
+            self._check_output_path(os.path.join(output_dir, str(config.get(ProjectConstants.CONFIG_NAME))))
+            config[ProjectConstants.CONFIG_OUTPUT_DIR] = output_dir
+            with self._project_lock:
+                return self._project_generator.generate_from_config(config)
+        
+        raise ValueError(f"未知的生成类型：{kind}")
+    
+    def archive(self, kind: str, config: Dict[str, Any], fmt: str = ARCHIVE_TAR_GZ) -> bytes:
+        """
+        在内存中生成并导出归档
+        
+        Args:
+            kind: 请求类型（context / project）
+            config: 项目配置
+            fmt: 归档格式（tar.gz / zip）
+        
+        Returns:
+            bytes: 归档内容
+        
+        Raises:
+            ValueError: 请求类型或归档格式未知、配置验证失败
+        """
+        if fmt not in ARCHIVE_CONTENT_TYPES:
+            raise ValueError(f"不支持的归档格式：{fmt}")
+        self._count_request()
+        
+        if kind == KIND_CONTEXT:
+            self._validate_context_config(config)
+            generator, generator_lock = self._get_context_generator(self.output_base_dir)
+            with generator_lock:
+                tree = generator.generate_in_memory(config)
+        elif kind == KIND_PROJECT:
+            with self._project_lock:
+                tree = self._project_generator.generate_in_memory(config)
+        else:
+            raise ValueError(f"未知的生成类型：{kind}")
+        
+        buffer = io.BytesIO()
+        tree.export(buffer, fmt)
+        return buffer.getvalue()
+    
+    def record_failure(self) -> None:
+        """记录一次失败的请求"""
+        with self._lock:
+            self.failures += 1
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取服务状态
+        
+        Returns:
+            Dict[str, Any]: 运行时长、请求数、失败数和渲染缓存统计
+        """
+        with self._lock:
+            generators = [generator for generator, _ in self._context_generators.values()]
+            status = {
+                "status": "ok",
+                "pid": os.getpid(),
+                "uptime_seconds": round(time.time() - self.started_at, 3),
+                "requests": self.requests,
+                "failures": self.failures
+            }
+        status["render_stats"] = [generator.get_render_stats() for generator in generators]
+        status["bytecode_cache"] = self._project_generator.get_cache_stats()
+        status["environments"] = get_registry().get_stats()
+        return status
+    
+    def _get_context_generator(self, output_base_dir: str) -> Tuple[ContextGenerator, threading.Lock]:
+        """获取（必要时创建）指定输出根目录的 ContextGenerator 及其锁"""
+        key = str(Path(output_base_dir).resolve())
+        with self._lock:
+            entry = self._context_generators.get(key)
+            if entry is None:
+                entry = (ContextGenerator(output_base_dir=output_base_dir, verbose=False), threading.Lock())
+                self._context_generators[key] = entry
+            return entry
+    
+    def _check_output_path(self, path: str) -> str:
+        """
+        检查输出路径位于服务的输出根目录之内
+        
+        Args:
+            path: 输出路径
+        
+        Returns:
+            str: 解析后的绝对路径
+        
+        Raises:
+            ValueError: 路径超出服务的输出根目录
+        """
+        base = Path(self.output_base_dir).resolve()
+        resolved = Path(path).resolve()
+        if resolved != base and base not in resolved.parents:
+            raise ValueError(f"输出目录必须位于服务的输出根目录 {base} 之内：{path}")
+        return str(resolved)
+    
+    def _count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+    
+    @staticmethod
+    def _validate_context_config(config: Dict[str, Any]) -> None:
+        """验证上下文工程配置，失败时抛出 ValueError"""
+        errors = ConfigValidator().validate_config(config)
+        if errors:
+            raise ValueError(f"配置验证失败：{'; '.join(errors)}")
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    """
+    生成服务HTTP请求处理器
+    
+    GET  /health                       服务状态
+    POST /context、/project            请求体为配置JSON，生成到磁盘，返回 {"output_path": ...}
+         ?out=<目录>                    指定输出根目录（须位于服务的输出根目录之内）
+         ?archive=tar.gz|zip           在内存中生成，直接返回归档内容
+    """
+    
+    server_version = "ContextGeneratorServer/1.0"
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        if urlparse(self.path).path == "/health":
+            self._send_json(200, self.server.service.get_status())
+        else:
+            self._send_json(404, {"error": f"未知路径：{self.path}"})
+    
+    def do_POST(self):
+        url = urlparse(self.path)
+        kind = url.path.strip("/")
+        if kind not in (KIND_CONTEXT, KIND_PROJECT):
+            self._send_json(404, {"error": f"未知路径：{url.path}"})
+            return
+        
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        service = self.server.service
+        try:
+            config = self._read_config()
+            if "archive" in query:
+                data = service.archive(kind, config, query["archive"])
+                self._send(200, ARCHIVE_CONTENT_TYPES[query["archive"]], data)
+            else:
+                output_path = service.generate(kind, config, query.get("out"))
+                self._send_json(200, {"output_path": output_path})
+        except ValueError as e:
+            service.record_failure()
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            service.record_failure()
+            logger.error(f"生成请求处理失败: {e}", exc_info=True)
+            self._send_json(500, {"error": str(e)})
+    
+    def _read_config(self) -> Dict[str, Any]:
+        """读取并解析请求体中的配置JSON"""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            raise ValueError("请求体为空，需要提供配置JSON")
+        if length > MAX_REQUEST_BYTES:
+            raise ValueError(f"请求体过大：{length} 字节")
+        
+        try:
+            config = json.loads(self.rfile.read(length).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"配置JSON格式错误：{e}")
+        if not isinstance(config, dict):
+            raise ValueError("配置JSON必须是对象")
+        return config
+    
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, "application/json; charset=utf-8", data)
+    
+    def _send(self, status: int, content_type: str, data: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def address_string(self) -> str:
+        # Unix套接字的客户端地址为空字符串
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+    
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+
+class GenerationHTTPServer(ThreadingHTTPServer):
+    """回环地址上的多线程生成服务"""
+    
+    daemon_threads = True
+    
+    def __init__(self, address: Tuple[str, int], service: GenerationService):
+        super().__init__(address, GenerationRequestHandler)
+        self.service = service
+
+
+if hasattr(socket, "AF_UNIX"):
+    class UnixGenerationHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Unix套接字上的多线程生成服务"""
+        
+        daemon_threads = True
+        
+        def __init__(self, socket_path: str, service: GenerationService):
+            remove_stale_socket(socket_path)
+            super().__init__(socket_path, GenerationRequestHandler)
+            self.service = service
+        
+        def server_close(self):
+            super().server_close()
+            if os.path.exists(self.server_address):
+                os.unlink(self.server_address)
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """
+    删除上次异常退出残留的Unix套接字文件
+    
+    只删除无法连接的套接字文件；路径不存在时不做任何处理
+    
+    Args:
+        socket_path: Unix套接字路径
+    
+    Raises:
+        ValueError: 路径已存在但不是套接字文件，或已有服务在该套接字上监听
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"路径已存在且不是Unix套接字，拒绝覆盖：{socket_path}")
+    
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+        logger.info(f"已删除残留的Unix套接字文件: {socket_path}")
+        return
+    finally:
+        probe.close()
+    raise ValueError(f"Unix套接字已有服务在监听：{socket_path}")
+
+
+def is_loopback_host(host: str) -> bool:
+    """
+    判断监听地址是否只解析到回环地址
+    
+    Args:
+        host: 主机名或IP地址
+    
+    Returns:
+        bool: 全部解析结果都是回环地址时为 True；空地址（监听全部网卡）或无法解析时为 False
+    """
+    if not host:
+        return False
+    try:
+        infos = socket.getaddrinfo(host, None)
+    except socket.gaierror:
+        return False
+    # IPv6地址可能带有 %网卡 后缀
+    addresses = {info[4][0].split("%")[0] for info in infos}
+    return bool(addresses) and all(ipaddress.ip_address(address).is_loopback for address in addresses)
+
+
+def create_server(service: GenerationService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  socket_path: Optional[str] = None, allow_remote: bool = False):
+    """
+    创建生成服务
+    
+    服务没有任何认证，请求可以在服务的输出根目录下写入文件，因此默认只允许监听回环地址
+    
+    Args:
+        service: 生成服务
+        host: 监听地址（仅用于HTTP）
+        port: 监听端口（仅用于HTTP，0 表示自动分配）
+        socket_path: Unix套接字路径；提供时改为监听Unix套接字
+        allow_remote: 是否允许监听非回环地址（仅记录警告）
+    
+    Returns:
+        服务器实例，调用 serve_forever() 开始处理请求
+    
+    Raises:
+        ValueError: 当前平台不支持Unix套接字，套接字路径被其他文件或正在运行的服务占用，
+            或监听地址不是回环地址且未允许远程访问
+    """
+    if socket_path:
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("当前平台不支持Unix套接字，请改用 --host/--port")
+        return UnixGenerationHTTPServer(socket_path, service)
+    if not is_loopback_host(host):
+        if not allow_remote:
+            raise ValueError(f"监听地址 {host!r} 不是回环地址：生成服务没有认证，只能监听本机；"
+                             f"确需对外监听请使用 --allow-remote")
+        logger.warning(f"生成服务监听非回环地址 {host}，任何能访问该地址的客户端都可以写入 {service.output_base_dir}")
+    return GenerationHTTPServer((host, port), service)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Jinja2环境注册表模块
+进程内按 (加载器来源, 环境选项) 共享 Environment：生成器实例不再各自创建环境，
+已编译的模板缓存在实例之间复用；自定义过滤器在创建环境时统一注册
+"""
+
+import re
+import logging
+from typing import Any, Callable, Dict, Hashable
+
+from .render_memo import RenderMemo
+
+logger = logging.getLogger(__name__)
+
+# 默认最多保留的环境数量（超出后淘汰最久未使用的环境）
+DEFAULT_MAX_ENVIRONMENTS = 16
+
+
+def to_camel_case(text: str) -> str:
+    """转换为驼峰命名法"""
+    components = text.replace('-', '_').split('_')
+    return components[0] + ''.join(word.capitalize() for word in components[1:])
+
+
+def to_pascal_case(text: str) -> str:
+    """转换为帕斯卡命名法"""
+    components = text.replace('-', '_').split('_')
+    return ''.join(word.capitalize() for word in components)
+
+
+def to_snake_case(text: str) -> str:
+    """转换为蛇形命名法"""
+    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', text)
+    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+
+
+def package_to_path(package: str) -> str:
+    """将包名转换为路径"""
+    return package.replace('.', '/')
+
+
+# 全部环境共用的自定义过滤器
+TEMPLATE_FILTERS = {
+    'camel_case': to_camel_case,
+    'pascal_case': to_pascal_case,
+    'snake_case': to_snake_case,
+    'package_to_path': package_to_path
+}
+
+
+def register_filters(environment) -> None:
+    """
+    注册自定义过滤器
+    
+    Args:
+        environment: Jinja2环境
+    """
+    environment.filters.update(TEMPLATE_FILTERS)
+
+
+class EnvironmentRegistry:
+    """
+    进程内共享的Jinja2环境注册表（线程安全，LRU淘汰）
+    
+    键由调用方决定，须包含加载器来源（模板目录或模板内容指纹）和所有影响编译或渲染的选项，
+    键相同的生成器共享同一个环境及其模板缓存。
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENVIRONMENTS):
+        """
+        初始化注册表
+        
+        Args:
+            max_entries: 最多保留的环境数量，0 表示不共享（每次都创建新环境）
+        """
+        self._environments = RenderMemo(max_entries)
+    
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]):
+        """
+        获取键对应的环境，不存在时调用 factory 创建并注册过滤器
+        
+        Args:
+            key: 环境键
+            factory: 创建环境的函数
+        
+        Returns:
+            Environment: 共享的Jinja2环境
+        """
+        def create():
+            environment = factory()
+            register_filters(environment)
+            logger.debug(f"已创建共享Jinja2环境: {key[0] if isinstance(key, tuple) else key}")
+            return environment
+        
+        return self._environments.get_or_render(key, create)
+    
+    def clear(self) -> None:
+        """清空注册表"""
+        self._environments.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取注册表统计
+        
+        Returns:
+            Dict[str, Any]: 命中数、未命中数、淘汰数、当前环境数和容量
+        """
+        return self._environments.get_stats()
+
+
+_registry = EnvironmentRegistry()
+
+
+def get_registry() -> EnvironmentRegistry:
+    """获取进程内共享的环境注册表"""
+    return _registry
+
+
+def get_environment(key: Hashable, factory: Callable[[], Any]):
+    """
+    从进程内注册表获取共享环境
+    
+    Args:
+        key: 环境键（加载器来源和环境选项）
+        factory: 创建环境的函数
+    
+    Returns:
+        Environment: 共享的Jinja2环境
+    """
+    return _registry.get_or_create(key, factory)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+目录布局规划模块
+预先计算项目需要创建的全部目录（去重、上级目录在前），以便一次性创建
+"""
+
+from pathlib import Path
+from typing import Iterable, List
+
+# 标准Maven目录结构（单模块项目根目录以及每个子模块内部都使用这一结构）
+STANDARD_DIRECTORIES = (
+    "src/main/java",
+    "src/main/resources",
+    "src/main/resources/static",
+    "src/main/resources/templates",
+    "src/test/java",
+    "src/test/resources"
+)
+
+
+def expand_directories(paths: Iterable) -> List[str]:
+    """
+    展开目录列表
+    
+    结果包含所有上级目录，去重且上级目录总在下级目录之前，按顺序逐个创建即可，
+    无需递归创建；耗时与路径分量总数成线性关系。
+    
+    Args:
+        paths: 相对目录路径（字符串或Path）
+    
+    Returns:
+        List[str]: POSIX风格的相对目录路径列表
+    """
+    seen = {}
+    for path in paths:
+        parts = [part for part in Path(path).as_posix().split("/") if part not in ("", ".")]
+        if not parts or "/".join(parts) in seen:
+            continue
+        
+        prefix = ""
+        for part in parts:
+            prefix = f"{prefix}/{part}" if prefix else part
+            if prefix not in seen:
+                seen[prefix] = None
+    return list(seen)
+
+
+def plan_project_layout(module_names: Iterable[str] = ()) -> List[str]:
+    """
+    规划项目目录布局
+    
+    Args:
+        module_names: 子模块名称（单模块项目为空）
+    
+    Returns:
+        List[str]: 去重、上级目录在前的相对目录路径列表
+    """
+    paths = list(STANDARD_DIRECTORIES)
+    for module_name in module_names:
+        paths.extend(f"{module_name}/{base_dir}" for base_dir in STANDARD_DIRECTORIES)
+    return expand_directories(paths)
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+内存输出树模块
+提供与 OutputWriter 相同写入接口的内存文件树，可直接流式导出为 tar.gz 或 zip
+"""
+
+import io
+import time
+import tarfile
+import zipfile
+import logging
+import threading
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Iterable, Union
+
+from .output_writer import WriteSummary, STATUS_ADDED, STATUS_CHANGED, STATUS_UNCHANGED
+
+logger = logging.getLogger(__name__)
+
+# 支持的归档格式
+ARCHIVE_TAR_GZ = "tar.gz"
+ARCHIVE_ZIP = "zip"
+ARCHIVE_FORMATS = (ARCHIVE_TAR_GZ, ARCHIVE_ZIP)
+
+
+class MemoryOutputTree:
+    """
+    内存输出树
+    
+    生成器写入的文件和目录只保存在内存中，不产生任何磁盘IO；
+    写入方法是线程安全的，可直接用于并发渲染阶段。
+    """
+    
+    def __init__(self, root_name: str = ""):
+        """
+        初始化内存输出树
+        
+        Args:
+            root_name: 根目录名称，导出归档时作为所有条目的顶层目录
+        """
+        self.root_name = root_name
+        self.root = Path(root_name)
+        self.summary = WriteSummary()
+        self.mtime = time.time()
+        
+        self._files: Dict[str, bytes] = {}
+        self._directories = set()
+        self._lock = threading.Lock()
+    
+    def write_text(self, relative_path: str, content: str, template_hash: str = "") -> str:
+        """
+        写入文本文件
+        
+        Args:
+            relative_path: 相对于根目录的路径
+            content: 文件内容
+            template_hash: 生成该文件的模板哈希（内存树中不使用）
+        
+        Returns:
+            str: 写入状态（added / changed / unchanged）
+        """
+        return self.write_bytes(relative_path, content.encode('utf-8'), template_hash)
+    
+    def write_bytes(self, relative_path: str, data: bytes, template_hash: str = "") -> str:
+        """
+        写入二进制文件
+        
+        Args:
+            relative_path: 相对于根目录的路径
+            data: 文件内容
+            template_hash: 生成该文件的模板哈希（内存树中不使用）
+        
+        Returns:
+            str: 写入状态（added / changed / unchanged）
+        """
+        key = self._normalize(relative_path)
+        
+        with self._lock:
+            previous = self._files.get(key)
+            if previous is None:
+                status = STATUS_ADDED
+            elif previous == data:
+                status = STATUS_UNCHANGED
+            else:
+                status = STATUS_CHANGED
+            self._files[key] = data
+            getattr(self.summary, status).append(key)
+        return status
+    
+    def write_stream(self, relative_path: str, chunks: Iterable[Union[str, bytes]], template_hash: str = "") -> str:
+        """
+        分块写入文件（与 OutputWriter 接口一致；内存树最终仍保存完整内容）
+        
+        Args:
+            relative_path: 相对于根目录的路径
+            chunks: 文件内容分块（str 按UTF-8编码）
+            template_hash: 生成该文件的模板哈希（内存树中不使用）
+        
+        Returns:
+            str: 写入状态（added / changed / unchanged）
+        """
+        buffer = io.BytesIO()
+        for chunk in chunks:
+            buffer.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        return self.write_bytes(relative_path, buffer.getvalue(), template_hash)
+    
+    def make_dirs(self, relative_paths) -> None:
+        """
+        创建目录（连同所有上级目录）
+        
+        Args:
+            relative_paths: 相对于根目录的目录路径列表
+        """
+        with self._lock:
+            for relative_path in relative_paths:
+                key = self._normalize(relative_path)
+                if key:
+                    self._directories.add(key)
+    
+    def finalize(self) -> WriteSummary:
+        """
+        完成写入（与 OutputWriter 接口一致）
+        
+        Returns:
+            WriteSummary: 写入汇总
+        """
+        return self.summary
+    
+    def read_text(self, relative_path: str) -> str:
+        """
+        读取文件内容
+        
+        Args:
+            relative_path: 相对于根目录的路径
+        
+        Returns:
+            str: 文件内容
+        
+        Raises:
+            FileNotFoundError: 文件不存在
+        """
+        key = self._normalize(relative_path)
+        with self._lock:
+            if key not in self._files:
+                raise FileNotFoundError(f"文件不存在：{relative_path}")
+            return self._files[key].decode('utf-8')
+    
+    def list_files(self) -> List[str]:
+        """列出所有文件（按路径排序）"""
+        with self._lock:
+            return sorted(self._files)
+    
+    def list_directories(self) -> List[str]:
+        """列出所有目录，包括文件的上级目录（按路径排序，上级目录在前）"""
+        with self._lock:
+            directories = set()
+            for path in list(self._directories) + list(self._files):
+                parts = PurePosixPath(path).parts
+                limit = len(parts) if path in self._directories else len(parts) - 1
+                for i in range(1, limit + 1):
+                    directories.add("/".join(parts[:i]))
+            return sorted(directories)
+    
+    def __contains__(self, relative_path: str) -> bool:
+        return self._normalize(relative_path) in self._files
+    
+    def __len__(self) -> int:
+        return len(self._files)
+    
+    def export(self, fileobj, archive_format: str = ARCHIVE_TAR_GZ) -> None:
+        """
+        导出为归档并写入文件对象
+        
+        文件对象可以是不可寻址的流（如 sys.stdout.buffer），不使用临时目录
+        
+        Args:
+            fileobj: 以二进制方式写入的文件对象
+            archive_format: 归档格式（tar.gz / zip）
+        
+        Raises:
+            ValueError: 不支持的归档格式
+        """
+        if archive_format == ARCHIVE_TAR_GZ:
+            self.write_tar(fileobj)
+        elif archive_format == ARCHIVE_ZIP:
+            self.write_zip(fileobj)
+        else:
+            raise ValueError(f"不支持的归档格式：{archive_format}，支持的格式：{', '.join(ARCHIVE_FORMATS)}")
+    
+    def write_tar(self, fileobj) -> None:
+        """
+        以流模式写入 tar.gz 归档
+        
+        Args:
+            fileobj: 以二进制方式写入的文件对象
+        """
+        with tarfile.open(fileobj=fileobj, mode="w|gz") as archive:
+            for directory in self.list_directories():
+                info = tarfile.TarInfo(self._archive_name(directory))
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                info.mtime = self.mtime
+                archive.addfile(info)
+            
+            for path in self.list_files():
+                data = self._files[path]
+                info = tarfile.TarInfo(self._archive_name(path))
+                info.size = len(data)
+                info.mode = 0o644
+                info.mtime = self.mtime
+                archive.addfile(info, io.BytesIO(data))
+        
+        logger.info(f"已导出tar.gz归档，文件数: {len(self)}")
+    
+    def write_zip(self, fileobj) -> None:
+        """
+        写入 zip 归档
+        
+        Args:
+            fileobj: 以二进制方式写入的文件对象
+        """
+        date_time = time.localtime(self.mtime)[:6]
+        with zipfile.ZipFile(fileobj, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for directory in self.list_directories():
+                info = zipfile.ZipInfo(self._archive_name(directory) + "/", date_time=date_time)
+                info.external_attr = (0o40755 << 16) | 0x10
+                archive.writestr(info, b"")
+            
+            for path in self.list_files():
+                info = zipfile.ZipInfo(self._archive_name(path), date_time=date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, self._files[path])
+        
+        logger.info(f"已导出zip归档，文件数: {len(self)}")
+    
+    def _archive_name(self, path: str) -> str:
+        """归档条目名称（带根目录前缀）"""
+        return f"{self.root_name}/{path}" if self.root_name else path
+    
+    @staticmethod
+    def _normalize(relative_path) -> str:
+        """规范化为不含 "." 和 ".." 的POSIX相对路径"""
+        parts = []
+        for part in PurePosixPath(Path(relative_path).as_posix()).parts:
+            if part in ("", "."):
+                continue
+            if part == ".." or part == "/":
+                raise ValueError(f"路径必须位于输出树之内：{relative_path}")
+            parts.append(part)
+        return "/".join(parts)
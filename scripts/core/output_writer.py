@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+输出写入模块
+在输出目录中维护内容哈希清单，重新生成时跳过内容未变化的文件，并清理不再生成的文件
+"""
+
+import os
+import json
+import hashlib
+import logging
+import uuid
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Union
+
+from .layout_planner import expand_directories
+from ..utils.file_utils import ensure_dir, write_bytes, remove_file, FSYNC_NONE, FSYNC_ALWAYS
+from ..utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 清单文件名（保存在每个输出目录中）
+MANIFEST_FILE_NAME = ".generation-manifest.json"
+MANIFEST_VERSION = 1
+
+# 流式写入时的文件缓冲区大小和读取旧文件比较的块大小
+STREAM_BUFFER_SIZE = 64 * 1024
+
+# 写入状态
+STATUS_ADDED = "added"
+STATUS_CHANGED = "changed"
+STATUS_UNCHANGED = "unchanged"
+
+
+def hash_bytes(data: bytes) -> str:
+    """计算字节内容的SHA-256"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """计算文本（UTF-8编码）的SHA-256"""
+    return hash_bytes(text.encode('utf-8'))
+
+
+def hash_config(config: Dict[str, Any]) -> str:
+    """
+    计算配置哈希
+    
+    键排序后序列化，保证同一配置在不同运行中得到相同的哈希
+    
+    Args:
+        config: 配置字典
+    
+    Returns:
+        str: 配置的SHA-256
+    """
+    canonical = json.dumps(config, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hash_text(canonical)
+
+
+@dataclass
+class WriteSummary:
+    """一次生成的写入汇总"""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    
+    def counts(self) -> Dict[str, int]:
+        """各状态的文件数量"""
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "unchanged": len(self.unchanged),
+            "removed": len(self.removed)
+        }
+    
+    def describe(self) -> str:
+        """生成一行中文汇总"""
+        counts = self.counts()
+        return (f"新增 {counts['added']}，变更 {counts['changed']}，"
+                f"未变化 {counts['unchanged']}，删除 {counts['removed']}")
+
+
+class OutputWriter:
+    """
+    增量输出写入器
+    
+    写入前将渲染结果与上次清单中的内容哈希比较，未变化的文件不重写（保持mtime不变）；
+    finalize() 时删除上次生成但本次未生成的文件，并写入新的清单。
+    写入方法是线程安全的，可在并发渲染阶段直接调用。
+    变化的文件总是先删除再写入，不会修改与暂存目录共享的硬链接。
+    """
+    
+    def __init__(self, root, config: Optional[Dict[str, Any]] = None, fsync_policy: str = FSYNC_NONE,
+                 blob_store=None):
+        """
+        初始化输出写入器
+        
+        Args:
+            root: 输出目录
+            config: 本次生成使用的配置（用于记录配置哈希）
+            fsync_policy: 持久化策略，always 时每个文件写入后立即fsync
+            blob_store: 内容寻址存储（BlobStore），提供时生成的文件硬链接到共享blob
+        """
+        self.root = Path(root)
+        self.blob_store = blob_store
+        self.config_hash = hash_config(config) if config is not None else ""
+        self.fsync = fsync_policy == FSYNC_ALWAYS
+        self.summary = WriteSummary()
+        
+        self._previous = self._load_manifest()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._created_dirs = set()
+        self._lock = threading.Lock()
+    
+    @property
+    def manifest_path(self) -> Path:
+        """清单文件路径"""
+        return self.root / MANIFEST_FILE_NAME
+    
+    def write_text(self, relative_path: str, content: str, template_hash: str = "") -> str:
+        """
+        写入文本文件（内容未变化时跳过）
+        
+        Args:
+            relative_path: 相对于输出目录的路径
+            content: 文件内容
+            template_hash: 生成该文件的模板哈希
+        
+        Returns:
+            str: 写入状态（added / changed / unchanged）
+        """
+        return self.write_bytes(relative_path, content.encode('utf-8'), template_hash)
+    
+    def write_bytes(self, relative_path: str, data: bytes, template_hash: str = "") -> str:
+        """
+        写入二进制文件（内容未变化时跳过）
+        
+        Args:
+            relative_path: 相对于输出目录的路径
+            data: 文件内容
+            template_hash: 生成该文件的模板哈希
+        
+        Returns:
+            str: 写入状态（added / changed / unchanged）
+        """
+        key = Path(relative_path).as_posix()
+        target = self.root / key
+        content_hash = hash_bytes(data)
+        
+        with span("write", path=key):
+            if self._is_unchanged(key, target, content_hash, data):
+                status = STATUS_UNCHANGED
+            else:
+                status = STATUS_CHANGED if (key in self._previous or target.exists()) else STATUS_ADDED
+                self._replace_file(target, data, content_hash)
+        
+        self._record(key, target, content_hash, template_hash, status)
+        return status
+    
+    def write_stream(self, relative_path: str, chunks: Iterable[Union[str, bytes]], template_hash: str = "") -> str:
+        """
+        流式写入文件（内容未变化时跳过），内存占用与文件大小无关
+        
+        渲染结果边生成边与旧文件逐块比较：完全一致时不写入任何数据；出现差异后改为写入
+        同目录下的临时文件（先复制已比较一致的前缀），最后原子替换目标文件
+        
+        Args:
+            relative_path: 相对于输出目录的路径
+            chunks: 文件内容分块（str 按UTF-8编码）
+            template_hash: 生成该文件的模板哈希
+        
+        Returns:
+            str: 写入状态（added / changed / unchanged）
+        """
+        key = Path(relative_path).as_posix()
+        target = self.root / key
+        
+        with span("write", path=key, stream=True):
+            content_hash, temp_path = self._stream_to_temp(target, chunks)
+            if temp_path is None:
+                status = STATUS_UNCHANGED
+            else:
+                status = STATUS_CHANGED if (key in self._previous or target.exists()) else STATUS_ADDED
+                self._replace_with_temp(target, temp_path, content_hash)
+        
+        self._record(key, target, content_hash, template_hash, status)
+        return status
+    
+    def make_dirs(self, relative_paths) -> None:
+        """
+        创建目录（连同所有上级目录）
+        
+        目录按上级在前的顺序逐个创建，同一写入器中已创建的目录不会重复创建
+        
+        Args:
+            relative_paths: 相对于输出目录的目录路径列表
+        """
+        for relative_path in expand_directories(relative_paths):
+            with self._lock:
+                if relative_path in self._created_dirs:
+                    continue
+                self._created_dirs.add(relative_path)
+            try:
+                os.mkdir(self.root / relative_path)
+            except FileExistsError:
+                pass
+    
+    def finalize(self, remove_stale: bool = True) -> WriteSummary:
+        """
+        完成写入：清理过期文件并保存清单
+        
+        Args:
+            remove_stale: 是否删除上次生成但本次未生成的文件
+        
+        Returns:
+            WriteSummary: 写入汇总
+        """
+        with self._lock:
+            if remove_stale:
+                for key in sorted(set(self._previous) - set(self._entries)):
+                    target = self.root / key
+                    if target.is_file():
+                        remove_file(str(target))
+                    self.summary.removed.append(key)
+            
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "config_hash": self.config_hash,
+                "files": {key: self._entries[key] for key in sorted(self._entries)}
+            }
+        
+        content = json.dumps(manifest, ensure_ascii=False, indent=2)
+        self._replace_file(self.manifest_path, content.encode('utf-8'))
+        logger.info(f"输出写入完成 {self.root}: {self.summary.describe()}")
+        return self.summary
+    
+    def written_paths(self) -> List[str]:
+        """
+        本次实际写入的文件（相对路径），包括清单文件；未变化和已删除的文件不在其中
+        
+        Returns:
+            List[str]: 相对于输出目录的路径列表
+        """
+        with self._lock:
+            return self.summary.added + self.summary.changed + [MANIFEST_FILE_NAME]
+    
+    def _record(self, key: str, target: Path, content_hash: str, template_hash: str, status: str) -> None:
+        """记录清单条目和写入状态"""
+        stat = target.stat()
+        entry = {
+            "content_hash": content_hash,
+            "template_hash": template_hash,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns
+        }
+        
+        with self._lock:
+            self._entries[key] = entry
+            getattr(self.summary, status).append(key)
+    
+    def _stream_to_temp(self, target: Path, chunks: Iterable[Union[str, bytes]]):
+        """
+        边哈希边与旧文件比较，出现差异后写入临时文件
+        
+        Returns:
+            tuple: (内容哈希, 临时文件路径)；内容与旧文件一致时临时文件路径为 None
+        """
+        digest = hashlib.sha256()
+        size = 0
+        temp_file = None
+        temp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+        
+        try:
+            existing = open(target, 'rb')
+        except OSError:
+            existing = None
+        
+        try:
+            if existing is None:
+                ensure_dir(str(temp_path.parent))
+                temp_file = open(temp_path, 'wb', buffering=STREAM_BUFFER_SIZE)
+            
+            for chunk in chunks:
+                data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+                if not data:
+                    continue
+                digest.update(data)
+                if temp_file is None:
+                    if existing.read(len(data)) == data:
+                        size += len(data)
+                        continue
+                    temp_file = self._open_temp_with_prefix(temp_path, existing, size)
+                temp_file.write(data)
+                size += len(data)
+            
+            if temp_file is None:
+                if not existing.read(1):
+                    return digest.hexdigest(), None
+                # 旧文件更长：新内容是旧文件的前缀
+                temp_file = self._open_temp_with_prefix(temp_path, existing, size)
+            
+            if self.fsync:
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+        except BaseException:
+            if temp_file is not None:
+                temp_file.close()
+            remove_file(str(temp_path))
+            raise
+        finally:
+            if existing is not None:
+                existing.close()
+        
+        temp_file.close()
+        return digest.hexdigest(), temp_path
+    
+    @staticmethod
+    def _open_temp_with_prefix(temp_path: Path, existing, prefix_size: int):
+        """创建临时文件并写入旧文件中已比较一致的前缀"""
+        temp_file = open(temp_path, 'wb', buffering=STREAM_BUFFER_SIZE)
+        existing.seek(0)
+        remaining = prefix_size
+        while remaining:
+            block = existing.read(min(STREAM_BUFFER_SIZE, remaining))
+            temp_file.write(block)
+            remaining -= len(block)
+        return temp_file
+    
+    def _replace_with_temp(self, target: Path, temp_path: Path, content_hash: str) -> None:
+        """用临时文件替换目标文件；启用blob存储时改为硬链接到blob"""
+        remove_file(str(target))
+        if self.blob_store and self.blob_store.link_file(content_hash, temp_path, target):
+            remove_file(str(temp_path))
+            return
+        os.replace(temp_path, target)
+    
+    def _replace_file(self, target: Path, data: bytes, content_hash: str = None) -> None:
+        """删除旧文件后写入新内容（断开可能存在的硬链接）；提供内容哈希且启用blob存储时改为硬链接"""
+        remove_file(str(target))
+        if content_hash and self.blob_store and self.blob_store.link(content_hash, data, target, self.fsync):
+            return
+        write_bytes(str(target), data, fsync=self.fsync)
+    
+    def _is_unchanged(self, key: str, target: Path, content_hash: str, data: bytes) -> bool:
+        """判断目标文件内容是否与待写入内容一致"""
+        try:
+            stat = target.stat()
+        except OSError:
+            return False
+        if stat.st_size != len(data):
+            return False
+        
+        # 清单记录的哈希、大小和mtime都匹配时直接判定未变化，无需读取文件
+        previous = self._previous.get(key)
+        if (previous and previous.get("content_hash") == content_hash
+                and previous.get("mtime_ns") == stat.st_mtime_ns):
+            return True
+        
+        # 文件可能在清单之外被修改过，按实际内容比较
+        with open(target, 'rb') as f:
+            return hash_bytes(f.read()) == content_hash
+    
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """读取上次生成的清单"""
+        if not self.manifest_path.is_file():
+            return {}
+        
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取生成清单失败，按全量生成处理: {e}")
+            return {}
+        
+        if manifest.get("version") != MANIFEST_VERSION or not isinstance(manifest.get("files"), dict):
+            return {}
+        
+        # 只保留输出目录内的相对路径，避免清单被篡改时删除目录外的文件
+        files = {}
+        for key, entry in manifest["files"].items():
+            path = Path(key)
+            if path.is_absolute() or ".." in path.parts or not isinstance(entry, dict):
+                continue
+            files[key] = entry
+        return files
@@ -6,23 +6,57 @@
 
 import os
 import shutil
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from jinja2 import Environment, DictLoader, select_autoescape
 import yaml
 import re
 
 from .config_manager import ConfigManager
 from .template_manager import TemplateManager
-from ..utils.file_utils import ensure_dir, write_file
+from .template_cache import HashedBytecodeCache, DEFAULT_BYTECODE_CACHE_DIR
+from .jinja_registry import get_environment, register_filters
+from .template_precompile import PrecompiledLoader, compile_templates, DEFAULT_COMPILED_DIR, PROJECT_TEMPLATES
+from .output_writer import OutputWriter, hash_text, hash_config
+from .staging import StagedOutput
+from .output_tree import MemoryOutputTree
+from .dry_run import DryRunPlan
+from .layout_planner import plan_project_layout
+from .sequence_index import SequenceIndex
+from .blob_store import BlobStore
+from ..utils.file_utils import ensure_dir, FSYNC_BATCH
+from ..utils.tracing import span
 from ..constants.project_constants import ProjectConstants
 from ..validators.project_validator import ProjectValidator
 
+logger = logging.getLogger(__name__)
+
+# 渲染和写入阶段的默认并发数
+DEFAULT_RENDER_WORKERS = 4
+
+# 流式渲染时每次合并写入的模板输出片段数
+RENDER_STREAM_BUFFER = 64
+
+
+@dataclass
+class RenderTask:
+    """渲染计划中的单个任务"""
+    template_name: str
+    context: Dict[str, Any]
+    output_path: Path
+
 
 class ProjectGenerator:
     """项目生成器"""
     
-    def __init__(self, config=None, config_manager: ConfigManager = None, template_manager: TemplateManager = None):
+    def __init__(self, config=None, config_manager: ConfigManager = None, template_manager: TemplateManager = None,
+                 use_bytecode_cache: bool = True, bytecode_cache_dir: str = None,
+                 max_workers: int = DEFAULT_RENDER_WORKERS, fsync_policy: str = FSYNC_BATCH,
+                 use_blob_store: bool = False, use_precompiled: bool = True, precompiled_dir: str = None,
+                 shared_environment: bool = True):
         """
         初始化项目生成器
         
@@ -30,8 +64,22 @@ class ProjectGenerator:
             config: 项目配置对象或字典（可选）
             config_manager: 配置管理器实例
             template_manager: 模板管理器实例
+            use_bytecode_cache: 是否启用模板字节码磁盘缓存
+            bytecode_cache_dir: 字节码缓存目录，默认为项目根目录下的 .cache/jinja2
+            max_workers: 渲染和写入阶段的最大并发数
+            fsync_policy: 输出持久化策略（none / always / batch），默认提交前统一同步一次
+            use_blob_store: 是否将生成的文件硬链接到输出目录下的内容寻址存储（.blobs）
+            use_precompiled: 是否优先使用 compile-templates 生成的预编译模板模块
+            precompiled_dir: 预编译模板目录，默认为 scripts/compiled_templates/project
+            shared_environment: 是否使用进程内共享的Jinja2环境（模板内容和选项相同的实例共用模板缓存，
+                创建实例时不再重新创建环境）；需要修改 templates、加载器映射或环境本身的调用方应关闭共享，
+                否则修改不会生效或会影响其他实例
         """
         self.config = config
+        self.max_workers = max(1, max_workers or DEFAULT_RENDER_WORKERS)
+        self.last_summary = None
+        self.fsync_policy = fsync_policy
+        self.use_blob_store = use_blob_store
         self.config_manager = config_manager or ConfigManager()
         self.template_manager = template_manager or TemplateManager()
         
@@ -41,16 +89,36 @@ class ProjectGenerator:
         # 从模板管理器加载模板内容
         self.templates = self._load_templates_from_manager()
         
-        # 初始化Jinja2环境
-        self.jinja_env = Environment(
-            loader=DictLoader(self.templates),
-            autoescape=select_autoescape(['html', 'xml']),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+        self.precompiled_dir = Path(precompiled_dir or DEFAULT_COMPILED_DIR / PROJECT_TEMPLATES)
+        bytecode_cache_dir = (bytecode_cache_dir or DEFAULT_BYTECODE_CACHE_DIR) if use_bytecode_cache else None
+        
+        def create_environment():
+            # 模板字节码缓存（按模板内容哈希寻址，热启动时跳过编译）
+            bytecode_cache = HashedBytecodeCache(bytecode_cache_dir) if bytecode_cache_dir else None
+            # 预编译模板：源码哈希一致时直接导入编译结果，跳过解析和编译
+            loader = DictLoader(self.templates)
+            if use_precompiled:
+                loader = PrecompiledLoader(loader, self.precompiled_dir)
+            return Environment(
+                loader=loader,
+                autoescape=select_autoescape(['html', 'xml']),
+                trim_blocks=True,
+                lstrip_blocks=True,
+                bytecode_cache=bytecode_cache
+            )
+        
+        # 初始化Jinja2环境：共享时按模板内容和选项从进程内注册表获取，模板缓存在实例之间复用
+        if shared_environment:
+            key = ("project", hash_config(self.templates), str(bytecode_cache_dir), use_precompiled,
+                   str(self.precompiled_dir))
+            self.jinja_env = get_environment(key, create_environment)
+        else:
+            self.jinja_env = create_environment()
+            # 添加自定义过滤器
+            self._setup_filters()
         
-        # 添加自定义过滤器
-        self._setup_filters()
+        self.bytecode_cache = self.jinja_env.bytecode_cache
+        self.precompiled_loader = self.jinja_env.loader if use_precompiled else None
     
     def generate_from_config_file(self, config_name: str, output_dir: str = None) -> str:
         """
@@ -116,43 +184,129 @@ class ProjectGenerator:
         Raises:
             ValueError: 配置验证失败
         """
-        # 验证配置
-        is_valid, errors = ProjectValidator.validate_project_config(config)
-        if not is_valid:
-            raise ValueError(f"配置验证失败：{'; '.join(errors)}")
-        
-        # 确定项目输出路径
-        output_dir = config.get(ProjectConstants.CONFIG_OUTPUT_DIR, "./output")
-        project_name = config.get(ProjectConstants.CONFIG_NAME)
-        
-        if use_sequential_naming:
-            project_path = self._get_sequential_project_path(output_dir, project_name)
-        else:
-            project_path = Path(output_dir) / project_name
+        with span("project.generate", project=config.get(ProjectConstants.CONFIG_NAME)):
+            self._validate_config(config)
+            
+            # 确定项目输出路径
+            output_dir = config.get(ProjectConstants.CONFIG_OUTPUT_DIR, "./output")
+            project_name = config.get(ProjectConstants.CONFIG_NAME)
+            
+            if use_sequential_naming:
+                project_path = self._get_sequential_project_path(output_dir, project_name)
+            else:
+                project_path = Path(output_dir) / project_name
+            
+            blob_store = BlobStore(output_dir) if self.use_blob_store else None
+            
+            # 在暂存目录中生成，全部成功后再一次性替换项目目录
+            staged = StagedOutput(project_path, self.fsync_policy)
+            with staged as staging_path:
+                # 增量写入：内容未变化的文件不重写
+                writer = OutputWriter(staging_path, config, self.fsync_policy, blob_store)
+                self._write_project(config, writer)
+                staged.written = writer.written_paths()
         
-        # 创建项目目录
-        ensure_dir(str(project_path))
+        return str(project_path)
+    
+    def generate_in_memory(self, config: Dict[str, Any]) -> MemoryOutputTree:
+        """
+        在内存中生成项目，不写入磁盘
         
-        # 生成项目结构
-        self._generate_project_structure(config, project_path)
+        Args:
+            config: 项目配置字典
+            
+        Returns:
+            MemoryOutputTree: 以项目名称为根目录的内存输出树，可直接导出为归档
+            
+        Raises:
+            ValueError: 配置验证失败
+        """
+        with span("project.generate", project=config.get(ProjectConstants.CONFIG_NAME), in_memory=True):
+            self._validate_config(config)
+            
+            tree = MemoryOutputTree(config.get(ProjectConstants.CONFIG_NAME))
+            self._write_project(config, tree)
+        return tree
+    
+    def dry_run(self, config: Dict[str, Any]) -> DryRunPlan:
+        """
+        预演生成：渲染全部模板并返回输出计划，不创建任何目录或文件
         
-        # 生成Maven配置文件
-        self._generate_maven_files(config, project_path)
+        预演时顺序渲染，每个文件的耗时即其模板的渲染耗时
         
-        # 生成Java源代码
-        self._generate_java_sources(config, project_path)
+        Args:
+            config: 项目配置字典
+            
+        Returns:
+            DryRunPlan: 输出计划（路径、字节数、渲染耗时）
+            
+        Raises:
+            ValueError: 配置验证失败
+        """
+        with span("project.generate", project=config.get(ProjectConstants.CONFIG_NAME), dry_run=True):
+            self._validate_config(config)
+            
+            plan = DryRunPlan(config.get(ProjectConstants.CONFIG_NAME))
+            self._write_project(config, plan, max_workers=1)
+        return plan
+    
+    def _validate_config(self, config: Dict[str, Any]) -> None:
+        """验证配置，失败时抛出 ValueError"""
+        with span("project.validate"):
+            is_valid, errors = ProjectValidator.validate_project_config(config)
+        if not is_valid:
+            raise ValueError(f"配置验证失败：{'; '.join(errors)}")
+    
+    def _write_project(self, config: Dict[str, Any], writer, max_workers: int = None) -> None:
+        """
+        生成项目结构和全部文件到写入器
         
-        # 生成配置文件
-        self._generate_config_files(config, project_path)
+        Args:
+            config: 项目配置
+            writer: OutputWriter、MemoryOutputTree 或 DryRunPlan
+            max_workers: 渲染并发数，默认使用实例的 max_workers
+        """
+        # 生成项目结构
+        with span("project.layout"):
+            self._generate_project_structure(config, writer)
+        
+        # 构建渲染计划，然后并发渲染和写入
+        with span("project.plan"):
+            plan = self.build_render_plan(config, writer.root)
+        with span("project.render", tasks=len(plan)):
+            self.execute_render_plan(plan, max_workers, writer=writer)
+        with span("project.finalize"):
+            self.last_summary = writer.finalize()
+        
+        if self.bytecode_cache:
+            stats = self.bytecode_cache.get_stats()
+            logger.info(f"模板字节码缓存: 命中 {stats['hits']}，未命中 {stats['misses']}")
+    
+    def compile_templates(self, target_dir: str = None) -> int:
+        """
+        把全部模板预编译为Python模块（构建步骤）
         
-        # 生成文档文件
-        self._generate_documentation(config, project_path)
+        Args:
+            target_dir: 输出目录，默认为实例的预编译目录
+            
+        Returns:
+            int: 编译的模板数量
+        """
+        return compile_templates(self.jinja_env, target_dir or self.precompiled_dir, sorted(self.templates))
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        获取模板字节码缓存统计
         
-        # 生成Docker配置（如果启用）
-        if config.get(ProjectConstants.CONFIG_GENERATE_DOCKER, False):
-            self._generate_docker_files(config, project_path)
+        Returns:
+            Dict[str, Any]: 命中数、未命中数和缓存目录；未启用缓存时返回 {"enabled": False}
+        """
+        if not self.bytecode_cache:
+            return {"enabled": False}
         
-        return str(project_path)
+        stats = self.bytecode_cache.get_stats()
+        stats["enabled"] = True
+        return stats
     
     def _get_sequential_project_path(self, output_dir: str, project_name: str) -> Path:
         """
@@ -165,37 +319,11 @@ class ProjectGenerator:
         Returns:
             Path: 带序号的项目路径
         """
-        output_path = Path(output_dir)
-        
-        # 确保输出目录存在
-        ensure_dir(str(output_path))
-        
-        # 查找已存在的项目文件夹，获取最大序号
-        max_sequence = 0
-        pattern_prefix = f"{project_name}"
-        
-        if output_path.exists():
-            for item in output_path.iterdir():
-                if item.is_dir():
-                    folder_name = item.name
-                    # 检查是否匹配 "序号-项目名称" 或 "项目名称" 格式
-                    if folder_name == project_name:
-                        max_sequence = max(max_sequence, 1)
-                    elif folder_name.endswith(f"-{project_name}"):
-                        try:
-                            # 提取序号部分
-                            sequence_part = folder_name[:-len(f"-{project_name}")]
-                            if sequence_part.isdigit():
-                                sequence = int(sequence_part)
-                                max_sequence = max(max_sequence, sequence)
-                        except (ValueError, IndexError):
-                            continue
-        
-        # 生成新的序号
-        new_sequence = max_sequence + 1
+        # 通过计数文件分配序号（文件锁保护，并发生成不会得到相同序号）
+        new_sequence = SequenceIndex(output_dir).allocate(project_name)
         new_folder_name = f"{new_sequence}-{project_name}"
         
-        return output_path / new_folder_name
+        return Path(output_dir) / new_folder_name
     
     def _config_to_dict(self, config_obj) -> Dict[str, Any]:
         """
@@ -263,49 +391,129 @@ class ProjectGenerator:
         
         return config_dict
     
-    def _generate_project_structure(self, config: Dict[str, Any], project_path: Path) -> None:
+    def _generate_project_structure(self, config: Dict[str, Any], writer) -> None:
         """
         生成项目目录结构
         
         Args:
             config: 项目配置
-            project_path: 项目路径
+            writer: OutputWriter 或 MemoryOutputTree
         """
-        # 基本目录结构
-        dirs_to_create = [
-            "src/main/java",
-            "src/main/resources",
-            "src/main/resources/static",
-            "src/main/resources/templates",
-            "src/test/java",
-            "src/test/resources"
-        ]
+        module_names = []
         
-        # 如果是多模块项目，创建模块目录
+        # 如果是多模块项目，每个模块内部使用同样的目录结构
         if config.get(ProjectConstants.CONFIG_PROJECT_TYPE) == ProjectConstants.PROJECT_TYPE_MULTI:
             modules = config.get(ProjectConstants.CONFIG_MODULES, [])
-            for module in modules:
-                module_name = module.get("name")
-                if module_name:
-                    for base_dir in dirs_to_create:
-                        dirs_to_create.append(f"{module_name}/{base_dir}")
+            module_names = [module.get("name") for module in modules if module.get("name")]
         
-        # 创建目录
-        for dir_path in dirs_to_create:
-            ensure_dir(str(project_path / dir_path))
+        # 预先计算去重后的全部目录，上级目录在前，一次性创建
+        writer.make_dirs(plan_project_layout(module_names))
     
-    def _generate_maven_files(self, config: Dict[str, Any], project_path: Path) -> None:
+    def build_render_plan(self, config: Dict[str, Any], project_path: Path) -> List[RenderTask]:
         """
-        生成Maven配置文件
+        构建渲染计划（第一阶段）
+        
+        只收集需要渲染的 (模板, 上下文, 输出路径) 任务，不做任何渲染和写入
         
         Args:
             config: 项目配置
             project_path: 项目路径
+            
+        Returns:
+            List[RenderTask]: 渲染任务列表
         """
-        # 生成主pom.xml
-        pom_template = self.jinja_env.get_template("pom.xml.j2")
-        pom_content = pom_template.render(config=config)
-        write_file(str(project_path / "pom.xml"), pom_content)
+        plan: List[RenderTask] = []
+        
+        # Maven配置文件
+        plan.extend(self._plan_maven_files(config, project_path))
+        
+        # Java源代码
+        plan.extend(self._plan_java_sources(config, project_path))
+        
+        # 配置文件
+        plan.extend(self._plan_config_files(config, project_path))
+        
+        # 文档文件
+        plan.extend(self._plan_documentation(config, project_path))
+        
+        # Docker配置（如果启用）
+        if config.get(ProjectConstants.CONFIG_GENERATE_DOCKER, False):
+            plan.extend(self._plan_docker_files(config, project_path))
+        
+        return plan
+    
+    def execute_render_plan(self, plan: List[RenderTask], max_workers: int = None,
+                            writer: OutputWriter = None) -> None:
+        """
+        执行渲染计划（第二阶段）
+        
+        先在当前线程预加载模板并一次性创建所有输出目录，再在线程池中并发渲染和写入
+        
+        Args:
+            plan: 渲染任务列表
+            max_workers: 最大并发数，默认使用实例的 max_workers
+            writer: OutputWriter 或 MemoryOutputTree；提供时输出路径必须位于 writer.root 之下
+            
+        Raises:
+            jinja2.TemplateNotFound: 模板不存在
+        """
+        if not plan:
+            return
+        
+        # 预加载模板：模板编译只发生一次，缺失模板在写入任何文件前报错
+        template_hashes = {}
+        with span("template.compile"):
+            for template_name in dict.fromkeys(task.template_name for task in plan):
+                self.jinja_env.get_template(template_name)
+                source = self.jinja_env.loader.get_source(self.jinja_env, template_name)[0]
+                template_hashes[template_name] = hash_text(source)
+        
+        parents = sorted({task.output_path.parent for task in plan})
+        if writer is None:
+            for parent in parents:
+                ensure_dir(str(parent))
+        else:
+            writer.make_dirs([parent.relative_to(writer.root) for parent in parents])
+        
+        def run(task: RenderTask) -> None:
+            self._render_task(task, writer, template_hashes[task.template_name])
+        
+        workers = max(1, min(max_workers or self.max_workers, len(plan)))
+        if workers == 1:
+            for task in plan:
+                run(task)
+            return
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run, task) for task in plan]
+            for future in as_completed(futures):
+                future.result()
+    
+    def _render_task(self, task: RenderTask, writer: OutputWriter = None, template_hash: str = "") -> None:
+        """渲染单个任务并写入文件"""
+        # 流式渲染：边渲染边写入，内存占用与输出大小无关（写入耗时计入渲染span）
+        with span("template.render", template=task.template_name):
+            template = self.jinja_env.get_template(task.template_name)
+            stream = template.stream(**task.context)
+            stream.enable_buffering(RENDER_STREAM_BUFFER)
+            if writer is None:
+                stream.dump(str(task.output_path), encoding='utf-8')
+            else:
+                writer.write_stream(str(task.output_path.relative_to(writer.root)), stream, template_hash)
+    
+    def _plan_maven_files(self, config: Dict[str, Any], project_path: Path) -> List[RenderTask]:
+        """
+        规划Maven配置文件
+        
+        Args:
+            config: 项目配置
+            project_path: 项目路径
+            
+        Returns:
+            List[RenderTask]: 渲染任务列表
+        """
+        # 主pom.xml
+        tasks = [RenderTask("pom.xml.j2", {"config": config}, project_path / "pom.xml")]
         
         # 如果是多模块项目，生成子模块的pom.xml
         if config.get(ProjectConstants.CONFIG_PROJECT_TYPE) == ProjectConstants.PROJECT_TYPE_MULTI:
@@ -313,227 +521,193 @@ class ProjectGenerator:
             for module in modules:
                 module_name = module.get("name")
                 if module_name:
-                    module_pom_template = self.jinja_env.get_template("module-pom.xml.j2")
-                    module_pom_content = module_pom_template.render(config=config, module=module)
-                    write_file(str(project_path / module_name / "pom.xml"), module_pom_content)
+                    tasks.append(RenderTask(
+                        "module-pom.xml.j2",
+                        {"config": config, "module": module},
+                        project_path / module_name / "pom.xml"
+                    ))
+        
+        return tasks
     
-    def _generate_java_sources(self, config: Dict[str, Any], project_path: Path) -> None:
+    def _plan_java_sources(self, config: Dict[str, Any], project_path: Path) -> List[RenderTask]:
         """
-        生成Java源代码
+        规划Java源代码
         
         Args:
             config: 项目配置
             project_path: 项目路径
+            
+        Returns:
+            List[RenderTask]: 渲染任务列表
         """
         package_path = config.get(ProjectConstants.CONFIG_PACKAGE, "").replace(".", "/")
+        tasks = []
         
-        # 生成主应用类
+        # 主应用类
         if config.get(ProjectConstants.CONFIG_PROJECT_TYPE) == ProjectConstants.PROJECT_TYPE_SINGLE:
-            self._generate_main_application(config, project_path, package_path)
+            tasks.extend(self._plan_main_application(config, project_path, package_path))
         
-        # 生成示例代码（如果启用）
+        # 示例代码（如果启用）
         if config.get(ProjectConstants.CONFIG_GENERATE_SAMPLE_CODE, False):
-            self._generate_sample_code(config, project_path, package_path)
+            tasks.extend(self._plan_sample_code(config, project_path, package_path))
         
-        # 生成测试代码（如果启用）
+        # 测试代码（如果启用）
         if config.get(ProjectConstants.CONFIG_GENERATE_TESTS, False):
-            self._generate_test_code(config, project_path, package_path)
+            tasks.extend(self._plan_test_code(config, project_path, package_path))
+        
+        return tasks
     
-    def _generate_main_application(self, config: Dict[str, Any], project_path: Path, package_path: str) -> None:
+    def _plan_main_application(self, config: Dict[str, Any], project_path: Path, package_path: str) -> List[RenderTask]:
         """
-        生成主应用类
+        规划主应用类
         
         Args:
             config: 项目配置
             project_path: 项目路径
             package_path: 包路径
+            
+        Returns:
+            List[RenderTask]: 渲染任务列表
         """
-        app_template = self.jinja_env.get_template("Application.java.j2")
-        app_content = app_template.render(config=config)
-        
         app_file_path = project_path / "src/main/java" / package_path / "Application.java"
-        ensure_dir(str(app_file_path.parent))
-        write_file(str(app_file_path), app_content)
+        return [RenderTask("Application.java.j2", {"config": config}, app_file_path)]
     
-    def _generate_sample_code(self, config: Dict[str, Any], project_path: Path, package_path: str) -> None:
+    def _plan_sample_code(self, config: Dict[str, Any], project_path: Path, package_path: str) -> List[RenderTask]:
         """
-        生成示例代码
+        规划示例代码
         
         Args:
             config: 项目配置
             project_path: 项目路径
             package_path: 包路径
+            
+        Returns:
+            List[RenderTask]: 渲染任务列表
         """
-        # 生成示例控制器
-        controller_template = self.jinja_env.get_template("controller/HelloController.java.j2")
-        controller_content = controller_template.render(config=config)
-        
+        # 示例控制器
         controller_path = project_path / "src/main/java" / package_path / "controller"
-        ensure_dir(str(controller_path))
-        write_file(str(controller_path / "HelloController.java"), controller_content)
+        tasks = [RenderTask("controller/HelloController.java.j2", {"config": config},
+                            controller_path / "HelloController.java")]
         
         # 根据技术栈生成相应的示例代码
         tech_stack = config.get(ProjectConstants.CONFIG_TECH_STACK, {})
         
         # 如果使用数据库，生成实体和服务示例
         if tech_stack.get(ProjectConstants.TECH_DATABASE) != "none":
-            self._generate_database_examples(config, project_path, package_path)
+            tasks.extend(self._plan_database_examples(config, project_path, package_path))
+        
+        return tasks
     
-    def _generate_database_examples(self, config: Dict[str, Any], project_path: Path, package_path: str) -> None:
+    def _plan_database_examples(self, config: Dict[str, Any], project_path: Path, package_path: str) -> List[RenderTask]:
         """
-        生成数据库相关示例代码
+        规划数据库相关示例代码
         
         Args:
             config: 项目配置
             project_path: 项目路径
             package_path: 包路径
+            
+        Returns:
+            List[RenderTask]: 渲染任务列表
         """
         tech_stack = config.get(ProjectConstants.CONFIG_TECH_STACK, {})
         orm = tech_stack.get(ProjectConstants.TECH_ORM)
+        java_path = project_path / "src/main/java" / package_path
+        tasks = []
         
         if orm == "jpa":
-            # 生成JPA实体示例
-            entity_template = self.jinja_env.get_template("entity/User.java.j2")
-            entity_content = entity_template.render(config=config, orm="jpa")
-            
-            entity_path = project_path / "src/main/java" / package_path / "entity"
-            ensure_dir(str(entity_path))
-            write_file(str(entity_path / "User.java"), entity_content)
+            # JPA实体示例
+            tasks.append(RenderTask("entity/User.java.j2", {"config": config, "orm": "jpa"},
+                                    java_path / "entity" / "User.java"))
             
-            # 生成Repository示例
-            repo_template = self.jinja_env.get_template("repository/UserRepository.java.j2")
-            repo_content = repo_template.render(config=config, orm="jpa")
-            
-            repo_path = project_path / "src/main/java" / package_path / "repository"
-            ensure_dir(str(repo_path))
-            write_file(str(repo_path / "UserRepository.java"), repo_content)
+            # Repository示例
+            tasks.append(RenderTask("repository/UserRepository.java.j2", {"config": config, "orm": "jpa"},
+                                    java_path / "repository" / "UserRepository.java"))
         
         elif orm == "mybatis":
-            # 生成MyBatis相关示例
-            # 实体类
-            entity_template = self.jinja_env.get_template("entity/User.java.j2")
-            entity_content = entity_template.render(config=config, orm="mybatis")
-            
-            entity_path = project_path / "src/main/java" / package_path / "entity"
-            ensure_dir(str(entity_path))
-            write_file(str(entity_path / "User.java"), entity_content)
+            # MyBatis实体类
+            tasks.append(RenderTask("entity/User.java.j2", {"config": config, "orm": "mybatis"},
+                                    java_path / "entity" / "User.java"))
             
             # Mapper接口
-            mapper_template = self.jinja_env.get_template("mapper/UserMapper.java.j2")
-            mapper_content = mapper_template.render(config=config)
-            
-            mapper_path = project_path / "src/main/java" / package_path / "mapper"
-            ensure_dir(str(mapper_path))
-            write_file(str(mapper_path / "UserMapper.java"), mapper_content)
+            tasks.append(RenderTask("mapper/UserMapper.java.j2", {"config": config},
+                                    java_path / "mapper" / "UserMapper.java"))
             
             # Mapper XML
-            mapper_xml_template = self.jinja_env.get_template("mapper/UserMapper.xml.j2")
-            mapper_xml_content = mapper_xml_template.render(config=config)
-            
-            mapper_xml_path = project_path / "src/main/resources/mapper"
-            ensure_dir(str(mapper_xml_path))
-            write_file(str(mapper_xml_path / "UserMapper.xml"), mapper_xml_content)
+            tasks.append(RenderTask("mapper/UserMapper.xml.j2", {"config": config},
+                                    project_path / "src/main/resources/mapper" / "UserMapper.xml"))
+        
+        return tasks
     
-    def _generate_test_code(self, config: Dict[str, Any], project_path: Path, package_path: str) -> None:
+    def _plan_test_code(self, config: Dict[str, Any], project_path: Path, package_path: str) -> List[RenderTask]:
         """
-        生成测试代码
+        规划测试代码
         
         Args:
             config: 项目配置
             project_path: 项目路径
             package_path: 包路径
+            
+        Returns:
+            List[RenderTask]: 渲染任务列表
         """
-        # 生成应用测试类
-        test_template = self.jinja_env.get_template("test/ApplicationTest.java.j2")
-        test_content = test_template.render(config=config)
-        
         test_path = project_path / "src/test/java" / package_path
-        ensure_dir(str(test_path))
-        write_file(str(test_path / "ApplicationTest.java"), test_content)
+        return [RenderTask("test/ApplicationTest.java.j2", {"config": config}, test_path / "ApplicationTest.java")]
     
-    def _generate_config_files(self, config: Dict[str, Any], project_path: Path) -> None:
+    def _plan_config_files(self, config: Dict[str, Any], project_path: Path) -> List[RenderTask]:
         """
-        生成配置文件
+        规划配置文件
         
         Args:
             config: 项目配置
             project_path: 项目路径
+            
+        Returns:
+            List[RenderTask]: 渲染任务列表
         """
-        # 生成application.yml
-        app_config_template = self.jinja_env.get_template("application.yml.j2")
-        app_config_content = app_config_template.render(config=config)
-        write_file(str(project_path / "src/main/resources/application.yml"), app_config_content)
-        
-        # 生成logback-spring.xml
-        logback_template = self.jinja_env.get_template("logback-spring.xml.j2")
-        logback_content = logback_template.render(config=config)
-        write_file(str(project_path / "src/main/resources/logback-spring.xml"), logback_content)
+        resources_path = project_path / "src/main/resources"
+        return [
+            RenderTask("application.yml.j2", {"config": config}, resources_path / "application.yml"),
+            RenderTask("logback-spring.xml.j2", {"config": config}, resources_path / "logback-spring.xml")
+        ]
     
-    def _generate_documentation(self, config: Dict[str, Any], project_path: Path) -> None:
+    def _plan_documentation(self, config: Dict[str, Any], project_path: Path) -> List[RenderTask]:
         """
-        生成文档文件
+        规划文档文件
         
         Args:
             config: 项目配置
             project_path: 项目路径
+            
+        Returns:
+            List[RenderTask]: 渲染任务列表
         """
-        # 生成README.md
-        readme_template = self.jinja_env.get_template("README.md.j2")
-        readme_content = readme_template.render(config=config)
-        write_file(str(project_path / "README.md"), readme_content)
-        
-        # 生成.gitignore
-        gitignore_template = self.jinja_env.get_template(".gitignore.j2")
-        gitignore_content = gitignore_template.render(config=config)
-        write_file(str(project_path / ".gitignore"), gitignore_content)
+        return [
+            RenderTask("README.md.j2", {"config": config}, project_path / "README.md"),
+            RenderTask(".gitignore.j2", {"config": config}, project_path / ".gitignore")
+        ]
     
-    def _generate_docker_files(self, config: Dict[str, Any], project_path: Path) -> None:
+    def _plan_docker_files(self, config: Dict[str, Any], project_path: Path) -> List[RenderTask]:
         """
-        生成Docker配置文件
+        规划Docker配置文件
         
         Args:
             config: 项目配置
             project_path: 项目路径
+            
+        Returns:
+            List[RenderTask]: 渲染任务列表
         """
-        # 生成Dockerfile
-        dockerfile_template = self.jinja_env.get_template("Dockerfile.j2")
-        dockerfile_content = dockerfile_template.render(config=config)
-        write_file(str(project_path / "Dockerfile"), dockerfile_content)
-        
-        # 生成docker-compose.yml
-        compose_template = self.jinja_env.get_template("docker-compose.yml.j2")
-        compose_content = compose_template.render(config=config)
-        write_file(str(project_path / "docker-compose.yml"), compose_content)
+        return [
+            RenderTask("Dockerfile.j2", {"config": config}, project_path / "Dockerfile"),
+            RenderTask("docker-compose.yml.j2", {"config": config}, project_path / "docker-compose.yml")
+        ]
     
     def _setup_filters(self) -> None:
         """
         设置Jinja2自定义过滤器
         """
-        def to_camel_case(text: str) -> str:
-            """转换为驼峰命名法"""
-            components = text.replace('-', '_').split('_')
-            return components[0] + ''.join(word.capitalize() for word in components[1:])
-        
-        def to_pascal_case(text: str) -> str:
-            """转换为帕斯卡命名法"""
-            components = text.replace('-', '_').split('_')
-            return ''.join(word.capitalize() for word in components)
-        
-        def to_snake_case(text: str) -> str:
-            """转换为蛇形命名法"""
-            import re
-            s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', text)
-            return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
-        
-        def package_to_path(package: str) -> str:
-            """将包名转换为路径"""
-            return package.replace('.', '/')
-        
-        # 注册过滤器
-        self.jinja_env.filters['camel_case'] = to_camel_case
-        self.jinja_env.filters['pascal_case'] = to_pascal_case
-        self.jinja_env.filters['snake_case'] = to_snake_case
-        self.jinja_env.filters['package_to_path'] = package_to_path
+        register_filters(self.jinja_env)
     
     def _load_templates_from_manager(self) -> Dict[str, str]:
         """
@@ -547,8 +721,8 @@ class ProjectGenerator:
         # 尝试加载spring-boot-templates模板
         try:
             if self.template_manager.template_exists("spring-boot-templates"):
-                content = self.template_manager.load_template("spring-boot-templates")
-                templates = self.template_manager.extract_templates_from_markdown(content)
+                # 按索引读取模板块，模板文件未变化时无需全文正则扫描
+                templates = self.template_manager.extract_templates("spring-boot-templates")
             else:
                 # 如果模板文件不存在，使用默认模板
                 print("警告: spring-boot-templates.md 模板文件不存在，使用默认模板")
@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+"""
+提示词精简模块
+system_prompt.md、user_prompt.md、execution_plan.md 和斜杠命令文件反复给出相同的说明
+（项目创建位置、config.json读取规则、上下文文件清单）。精简模式把这些说明移到一个共享文件，
+各产物中只保留一行引用；同一产物内完全重复的章节只保留一次；
+再按token预算从低优先级章节开始裁剪，并报告精简前后的token数。
+缓存友好布局的项目专属内容（PROJECT_CONTENT_MARKER 之后）承载全部配置取值，不参与去重、共享说明提取和裁剪
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Union, Mapping
+
+from .prompt_fragments import render_fragments
+from .cache_layout import split_prefix, render_cache_layout
+from ..utils.token_counter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 共享说明文件（由片段模板 shared_context.md 渲染）
+SHARED_CONTEXT_FILE = "shared_context.md"
+
+# 参与精简的产物（按写入顺序）
+COMPACT_ARTIFACTS = (
+    "system_prompt.md",
+    "user_prompt.md",
+    "project_generator.gemini",
+    "project_generator.claude",
+    "execution_plan.md"
+)
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*$")
+_FENCE = re.compile(r"^\s*```")
+_SLASH_COMMAND = re.compile(r"^/\w+")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*]|\d+\.)\s")
+_CONTEXT_FILES = r"`?(?:config\.json|system_prompt\.md|user_prompt\.md|execution_plan\.md|project_structure\.md)`?"
+
+
+@dataclass(frozen=True)
+class SharedSection:
+    """共享说明：anchor 为共享文件中的锚点，patterns 匹配各产物中表达同一说明的行"""
+    anchor: str
+    title: str
+    patterns: Tuple[str, ...]
+    
+    def matches(self, line: str) -> bool:
+        """判断一行是否属于该共享说明"""
+        return any(re.search(pattern, line) for pattern in self.patterns)
+
+
+# 共享说明的识别规则（顺序即引用中的顺序）
+SHARED_SECTIONS = (
+    SharedSection("project-location", "项目创建位置", (
+        r"创建位置",
+        r"创建.{0,10}新的项目(文件夹|目录)",
+        r"在新的文件夹中创建项目",
+        r"当前(工作)?目录直接(创建|生成)",
+        r"在该文件夹内创建所有项目文件",
+        r"项目结构应为.+而不是",
+        r"所有文件都必须在新创建的",
+    )),
+    SharedSection("config-source", "配置读取规则", (
+        r"config\.json.{0,8}动态读取",
+        r"^\s*- [^:：\n]+ \([a-z_]+\)\s*$",
+    )),
+    SharedSection("context-files", "上下文文件", (
+        r"配置文件引用",
+        r"同目录下有以下文件",
+        rf"^\s*- [^:：\n]{{1,10}}[:：]\s*{_CONTEXT_FILES}\s*$",
+        rf"^\s*- {_CONTEXT_FILES} [(（]",
+    )),
+)
+
+# 章节裁剪优先级：数值越小越先裁剪，未匹配的章节为 DEFAULT_SECTION_PRIORITY
+SECTION_PRIORITIES = (
+    (r"示例", 1),
+    (r"注意事项|推荐工作流|使用说明|使用方法|帮助|技术支持|性能优化|质量保证|错误处理", 2),
+    (r"执行完成标志|最终输出|输出内容|成功标准|启动要求", 3),
+)
+DEFAULT_SECTION_PRIORITY = 5
+
+
+@dataclass
+class ArtifactTokenReport:
+    """单个产物的精简结果"""
+    name: str
+    tokens_before: int
+    tokens_after: int
+    budget: Optional[int] = None
+    shared: List[str] = field(default_factory=list)     # 替换为引用的共享说明锚点
+    duplicates: List[str] = field(default_factory=list) # 删除的重复章节标题
+    trimmed: List[str] = field(default_factory=list)    # 因预算裁剪的章节标题
+    
+    @property
+    def over_budget(self) -> bool:
+        """裁剪全部可裁剪章节后仍超出预算"""
+        return self.budget is not None and self.tokens_after > self.budget
+
+
+@dataclass
+class CompactResult:
+    """精简结果：产物内容、共享文件内容和token报告"""
+    contents: Dict[str, str]
+    shared_content: str
+    artifacts: List[ArtifactTokenReport]
+    
+    @property
+    def shared_tokens(self) -> int:
+        """共享文件的token数"""
+        return estimate_tokens(self.shared_content)
+    
+    @property
+    def tokens_before(self) -> int:
+        """精简前全部产物的token数"""
+        return sum(item.tokens_before for item in self.artifacts)
+    
+    @property
+    def tokens_after(self) -> int:
+        """精简后全部产物（含共享文件）的token数"""
+        return sum(item.tokens_after for item in self.artifacts) + self.shared_tokens
+    
+    def describe(self) -> str:
+        """生成一行中文汇总"""
+        text = f"精简后 {self.tokens_before} → {self.tokens_after} tokens（含共享文件 {self.shared_tokens}）"
+        over = [item.name for item in self.artifacts if item.over_budget]
+        if over:
+            text += f"，超出预算: {', '.join(over)}"
+        return text
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化为JSON的字典"""
+        return {
+            "artifacts": [
+                {
+                    "name": item.name,
+                    "tokens_before": item.tokens_before,
+                    "tokens_after": item.tokens_after,
+                    "budget": item.budget,
+                    "over_budget": item.over_budget,
+                    "shared": item.shared,
+                    "duplicates": item.duplicates,
+                    "trimmed": item.trimmed
+                }
+                for item in self.artifacts
+            ],
+            "shared_file": SHARED_CONTEXT_FILE,
+            "shared_tokens": self.shared_tokens,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after
+        }
+
+
+def split_blocks(text: str) -> List[List[str]]:
+    """按空行把文本切分为块（代码块内的空行不切分），每块为行列表"""
+    blocks = []
+    current = []
+    in_fence = False
+    for line in text.split("\n"):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        if not in_fence and not line.strip():
+            if current:
+                blocks.append(current)
+                current = []
+            continue
+        current.append(line)
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def heading_of(block: List[str]) -> Optional[Tuple[int, str]]:
+    """块以Markdown标题开头时返回 (级别, 标题)"""
+    match = _HEADING.match(block[0])
+    if match is None:
+        return None
+    return len(match.group(1)), match.group(2)
+
+
+def section_priority(title: str) -> int:
+    """章节的裁剪优先级"""
+    for pattern, priority in SECTION_PRIORITIES:
+        if re.search(pattern, title):
+            return priority
+    return DEFAULT_SECTION_PRIORITY
+
+
+def reference_line(anchors: List[str]) -> str:
+    """生成指向共享文件的引用行"""
+    titles = {section.anchor: section.title for section in SHARED_SECTIONS}
+    targets = "、".join(f"{titles[anchor]}（{SHARED_CONTEXT_FILE}#{anchor}）" for anchor in anchors)
+    return f"> 📎 见 {targets}"
+
+
+def extract_shared(text: str) -> Tuple[str, List[str]]:
+    """
+    把共享说明替换为引用
+    
+    逐行匹配共享说明（代码块和斜杠命令块不处理），以冒号结尾的匹配行连同其后的列表项一起移除。
+    块的正文全部移除时整块删除（包括标题），连续删除的块合并为一行引用；
+    部分移除时在块末尾追加引用。
+    
+    Args:
+        text: 产物内容
+    
+    Returns:
+        Tuple[str, List[str]]: (替换后的内容, 引用的锚点)
+    """
+    output = []
+    pending = []
+    referenced = []
+    
+    def flush():
+        if pending:
+            output.append([reference_line(pending)])
+            pending.clear()
+    
+    for block in split_blocks(text):
+        if any(_FENCE.match(line) or _SLASH_COMMAND.match(line) for line in block):
+            flush()
+            output.append(block)
+            continue
+        
+        kept = []
+        anchors = []
+        following_list = False
+        for line in block:
+            section = next((item for item in SHARED_SECTIONS if item.matches(line)), None)
+            if section is None and following_list and _LIST_ITEM.match(line):
+                continue
+            following_list = False
+            if section is None:
+                kept.append(line)
+                continue
+            if section.anchor not in anchors:
+                anchors.append(section.anchor)
+            following_list = line.rstrip().rstrip("*").endswith((":", "："))
+        
+        for anchor in anchors:
+            if anchor not in referenced:
+                referenced.append(anchor)
+        
+        if not anchors:
+            flush()
+            output.append(block)
+        elif all(_HEADING.match(line) for line in kept):
+            # 正文全部为共享说明：整块删除，与相邻的删除块合并为一行引用
+            pending.extend(anchor for anchor in anchors if anchor not in pending)
+        else:
+            flush()
+            output.append(kept + [reference_line(anchors)])
+    flush()
+    
+    return join_blocks(output), referenced
+
+
+def section_spans(blocks: List[List[str]]) -> List[Tuple[int, int, int, str]]:
+    """
+    划分章节：章节从标题块开始，到下一个同级或更高级标题为止（包含子章节）
+    
+    Returns:
+        List[Tuple[int, int, int, str]]: (起始块下标, 结束块下标, 级别, 标题)
+    """
+    headings = [(index, *heading_of(block)) for index, block in enumerate(blocks) if heading_of(block)]
+    spans = []
+    for position, (start, level, title) in enumerate(headings):
+        end = next((next_start for next_start, next_level, _ in headings[position + 1:] if next_level <= level),
+                   len(blocks))
+        spans.append((start, end, level, title))
+    return spans
+
+
+def drop_duplicate_sections(text: str) -> Tuple[str, List[str]]:
+    """
+    删除重复章节：标题和全部内容（含子章节）与前文某个章节完全相同的章节只保留第一次出现
+    
+    Args:
+        text: 产物内容
+    
+    Returns:
+        Tuple[str, List[str]]: (去重后的内容, 删除的章节标题)
+    """
+    blocks = split_blocks(text)
+    seen = set()
+    removed = set()
+    duplicates = []
+    
+    for start, end, _, title in section_spans(blocks):
+        if start in removed:
+            continue
+        key = "\n\n".join("\n".join(block) for block in blocks[start:end])
+        if key in seen:
+            removed.update(range(start, end))
+            duplicates.append(title)
+        else:
+            seen.add(key)
+    
+    if not duplicates:
+        return text, []
+    return join_blocks([block for index, block in enumerate(blocks) if index not in removed]), duplicates
+
+
+def trim_to_budget(text: str, budget: int) -> Tuple[str, List[str]]:
+    """
+    按优先级裁剪章节直到不超过预算
+    
+    删除章节时连同其子章节一起删除；同一优先级内先删除靠后的章节，第一个章节（文件标题）从不裁剪。
+    末尾追加一行说明被省略的章节，该行也计入预算。
+    缓存友好布局的项目专属内容从不裁剪：只按预算裁剪标记之前的前缀（前缀的裁剪结果因此与配置无关），
+    项目专属内容原样保留在末尾，合计仍可能超出预算
+    
+    Args:
+        text: 产物内容
+        budget: token预算
+    
+    Returns:
+        Tuple[str, List[str]]: (裁剪后的内容, 删除的章节标题)
+    """
+    prefix, project = split_prefix(text)
+    if project:
+        trimmed_prefix, trimmed = trim_to_budget(prefix, budget)
+        return join_project_section(trimmed_prefix, project), trimmed
+    
+    if estimate_tokens(text) <= budget:
+        return text, []
+    
+    blocks = split_blocks(text)
+    spans = section_spans(blocks)
+    candidates = sorted(
+        (section_priority(title), -position, position)
+        for position, (_, _, _, title) in enumerate(spans) if position > 0
+    )
+    removed = set()
+    trimmed = []
+    
+    def assemble():
+        kept = [block for index, block in enumerate(blocks) if index not in removed]
+        if trimmed:
+            kept.append([f"> ✂️ 已按token预算（{budget}）省略章节：{'、'.join(trimmed)}"])
+        return join_blocks(kept)
+    
+    result = text
+    for _, _, position in candidates:
+        start, end, _, title = spans[position]
+        if start in removed:
+            continue
+        removed.update(range(start, end))
+        trimmed.append(title)
+        result = assemble()
+        if estimate_tokens(result) <= budget:
+            break
+    return result, trimmed
+
+
+def join_blocks(blocks: List[List[str]]) -> str:
+    """以空行连接块"""
+    return "\n\n".join("\n".join(block) for block in blocks) + "\n"
+
+
+def join_project_section(prefix: str, project: str) -> str:
+    """把处理后的前缀与原样保留的项目专属内容重新拼接（以空行分隔，与 render_cache_layout 一致）"""
+    if not prefix.strip("\n"):
+        return project
+    return prefix.rstrip("\n") + "\n\n" + project
+
+
+class PromptCompactor:
+    """提示词精简器"""
+    
+    def __init__(self, token_budget: Union[int, Mapping[str, int], None] = None, cache_layout: bool = False):
+        """
+        初始化精简器
+        
+        Args:
+            token_budget: 每个产物的token预算；整数对全部产物生效，字典按产物名称指定，None 表示不裁剪
+            cache_layout: 是否按缓存友好布局渲染共享文件（项目名称放在项目专属内容中）
+        """
+        self.token_budget = token_budget
+        self.cache_layout = cache_layout
+    
+    def budget_for(self, name: str) -> Optional[int]:
+        """获取产物的token预算"""
+        if isinstance(self.token_budget, Mapping):
+            return self.token_budget.get(name)
+        return self.token_budget
+    
+    def compact(self, contents: Mapping[str, str], project_name: str) -> CompactResult:
+        """
+        精简产物
+        
+        Args:
+            contents: 产物名称 → 内容
+            project_name: 项目名称（填入共享文件）
+        
+        Returns:
+            CompactResult: 精简结果
+        """
+        values = {"project_name": project_name}
+        if self.cache_layout:
+            shared_content = render_cache_layout(SHARED_CONTEXT_FILE, values)
+        else:
+            shared_content = render_fragments(SHARED_CONTEXT_FILE, values)
+        result = CompactResult({}, shared_content, [])
+        
+        for name, content in contents.items():
+            # 项目专属内容不参与精简，只处理标记之前的前缀
+            prefix, project = split_prefix(content)
+            compacted, duplicates = drop_duplicate_sections(prefix)
+            compacted, shared = extract_shared(compacted)
+            budget = self.budget_for(name)
+            trimmed = []
+            if budget is not None:
+                compacted, trimmed = trim_to_budget(compacted, budget)
+            if project:
+                compacted = join_project_section(compacted, project)
+            
+            report = ArtifactTokenReport(
+                name=name,
+                tokens_before=estimate_tokens(content),
+                tokens_after=estimate_tokens(compacted),
+                budget=budget,
+                shared=shared,
+                duplicates=duplicates,
+                trimmed=trimmed
+            )
+            if report.over_budget:
+                logger.warning(f"{name} 裁剪后仍超出token预算: {report.tokens_after} > {budget}")
+            result.contents[name] = compacted
+            result.artifacts.append(report)
+        
+        return result
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+提示词片段模板模块
+上下文产物中大段不依赖配置的文本存放在 templates/fragments 下的片段模板中，
+每个模板在进程内只读取和切分一次（静态片段 + 配置槽位），
+每次生成只填充槽位并拼接，不再逐次格式化整段文本；模板文件修改后按 (mtime_ns, size) 自动重新读取
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from string import Template
+from typing import Dict, Any, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 片段模板目录（随程序发布，不受生成器 templates_dir 设置影响）
+FRAGMENTS_DIR = Path(__file__).parent.parent / "templates" / "fragments"
+
+
+class FragmentTemplate:
+    """
+    预切分的片段模板
+    
+    槽位语法与 string.Template 一致（${name} 或 $name，$$ 表示字面量 $）。
+    模板在构造时切分为交替排列的静态片段和槽位名，渲染时只需在槽位位置填入值后一次拼接。
+    """
+    
+    def __init__(self, source: str, name: str = ""):
+        """
+        切分模板
+        
+        Args:
+            source: 模板源码
+            name: 模板名称（用于错误信息）
+        
+        Raises:
+            ValueError: 模板包含无效的 $ 占位符
+        """
+        self.name = name
+        fragments = []
+        slots = []
+        text = []
+        position = 0
+        
+        for match in Template.pattern.finditer(source):
+            text.append(source[position:match.start()])
+            position = match.end()
+            if match.group("escaped") is not None:
+                text.append("$")
+                continue
+            slot = match.group("named") or match.group("braced")
+            if slot is None:
+                line = source.count("\n", 0, match.start()) + 1
+                raise ValueError(f"片段模板 {name} 第 {line} 行包含无效占位符")
+            fragments.append("".join(text))
+            slots.append(slot)
+            text = []
+        text.append(source[position:])
+        fragments.append("".join(text))
+        
+        self.fragments: Tuple[str, ...] = tuple(fragments)
+        self.slots: Tuple[str, ...] = tuple(slots)
+        # 模板源码哈希：作为渲染缓存键的一部分，模板修改后缓存的渲染结果失效
+        self.source_hash = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        # 加载时的文件路径和 (mtime_ns, size)，用于发现模板文件的修改
+        self.path = None
+        self.signature = None
+        # 静态片段与槽位交替排列的拼接列表，槽位位置（奇数下标）在渲染时填入
+        self._parts = [None] * (2 * len(fragments) - 1)
+        self._parts[::2] = fragments
+    
+    def render(self, values: Mapping[str, Any]) -> str:
+        """
+        填充槽位并拼接
+        
+        Args:
+            values: 槽位名 → 值（按 str() 转换）
+        
+        Returns:
+            str: 渲染结果
+        
+        Raises:
+            ValueError: 缺少槽位值
+        """
+        parts = list(self._parts)
+        try:
+            parts[1::2] = [str(values[slot]) for slot in self.slots]
+        except KeyError as e:
+            raise ValueError(f"片段模板 {self.name} 缺少槽位值: {e.args[0]}")
+        return "".join(parts)
+    
+    @property
+    def static_size(self) -> int:
+        """静态片段的总字符数"""
+        return sum(len(fragment) for fragment in self.fragments)
+
+
+# 模板文件名（默认目录）或 (模板目录, 模板文件名) → 片段模板；模板数量固定且很少，不做淘汰
+_templates: Dict[Any, FragmentTemplate] = {}
+_lock = threading.Lock()
+_stats = {"loads": 0}
+
+
+def load_fragment_template(name: str, directory=None) -> FragmentTemplate:
+    """
+    获取片段模板（模板文件未修改时进程内只读取和切分一次）
+    
+    Args:
+        name: 模板文件名
+        directory: 模板目录，默认为 FRAGMENTS_DIR
+    
+    Returns:
+        FragmentTemplate: 预切分的片段模板
+    
+    Raises:
+        FileNotFoundError: 模板文件不存在
+        ValueError: 模板包含无效占位符
+    """
+    key = name if directory is None else (str(directory), name)
+    # 命中时只做一次字典查找和一次 stat（不加锁），文件修改后重新读取
+    template = _templates.get(key)
+    if template is not None and _file_signature(template.path) == template.signature:
+        return template
+    
+    path = Path(directory or FRAGMENTS_DIR) / name
+    signature = _file_signature(path)
+    if signature is None:
+        raise FileNotFoundError(f"片段模板不存在: {path}")
+    loaded = FragmentTemplate(path.read_text(encoding="utf-8"), name)
+    loaded.path = path
+    loaded.signature = signature
+    
+    with _lock:
+        _stats["loads"] += 1
+        current = _templates.get(key)
+        if current is None or current.signature != signature:
+            _templates[key] = loaded
+            current = loaded
+    if template is not None:
+        logger.info(f"片段模板已修改，重新读取: {name}")
+    logger.debug(f"已加载片段模板 {name}: {len(current.slots)} 个槽位")
+    return current
+
+
+def _file_signature(path):
+    """文件的 (mtime_ns, size)；文件不存在时返回 None"""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def render_fragments(name: str, values: Mapping[str, Any] = None, directory=None) -> str:
+    """
+    渲染片段模板
+    
+    Args:
+        name: 模板文件名
+        values: 槽位值
+        directory: 模板目录，默认为 FRAGMENTS_DIR
+    
+    Returns:
+        str: 渲染结果
+    """
+    return load_fragment_template(name, directory).render(values or {})
+
+
+def clear_fragment_cache() -> None:
+    """清空片段模板缓存和统计（模板文件修改后重新读取）"""
+    with _lock:
+        _templates.clear()
+        _stats["loads"] = 0
+
+
+def get_fragment_stats() -> Dict[str, Any]:
+    """
+    获取片段模板缓存统计
+    
+    Returns:
+        Dict[str, Any]: 读取模板文件的次数和已缓存的模板数
+    """
+    with _lock:
+        return {"loads": _stats["loads"], "size": len(_templates)}
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+渲染缓存模块
+按配置指纹缓存渲染结果，重复或相近的配置只重新渲染依赖发生变化的产物
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from .output_writer import hash_config
+
+# 默认最多缓存的渲染结果数
+DEFAULT_MEMO_SIZE = 256
+
+
+def config_fingerprint(config: Dict[str, Any], keys: Optional[Iterable[str]] = None) -> str:
+    """
+    计算配置指纹
+    
+    与键顺序无关（序列化时排序），列表顺序保持不变
+    
+    Args:
+        config: 配置字典
+        keys: 只对这些键计算指纹；None 表示完整配置
+    
+    Returns:
+        str: 指纹（SHA-256）
+    """
+    if keys is None:
+        return hash_config(config)
+    return hash_config({key: config.get(key) for key in keys})
+
+
+class RenderMemo:
+    """
+    渲染结果LRU缓存（线程安全）
+    
+    缓存键由调用方决定，通常为 (产物名称, 依赖配置的指纹, 其他输入)。
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_MEMO_SIZE):
+        """
+        初始化渲染缓存
+        
+        Args:
+            max_entries: 最多缓存的条目数，0 表示禁用缓存
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_render(self, key: Hashable, render: Callable[[], Any]) -> Any:
+        """
+        命中时返回缓存结果，否则调用 render 渲染并缓存
+        
+        Args:
+            key: 缓存键
+            render: 渲染函数
+        
+        Returns:
+            Any: 渲染结果
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        
+        value = render()
+        
+        if self.max_entries:
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+    
+    def clear(self) -> None:
+        """清空缓存和统计"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+        
+        Returns:
+            Dict[str, Any]: 命中数、未命中数、淘汰数、当前条目数、容量和命中率
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+序号索引模块
+为 "序号-项目名称" 形式的输出目录分配序号，使用计数文件和文件锁保证并发安全
+"""
+
+import os
+import uuid
+import shutil
+import logging
+from pathlib import Path
+from typing import Dict
+from urllib.parse import quote
+
+from ..utils.file_utils import ensure_dir, file_lock
+
+logger = logging.getLogger(__name__)
+
+# 计数目录（每个项目名称一个计数文件）和锁文件（保存在输出目录中）
+INDEX_DIR_NAME = ".sequence-index"
+LOCK_FILE_NAME = ".sequence-index.lock"
+COUNTER_SUFFIX = ".counter"
+
+
+class SequenceIndex:
+    """
+    输出目录序号索引
+    
+    每个输出目录维护一个计数目录，其中每个项目名称对应一个计数文件（已分配的最大序号），
+    分配时在文件锁保护下只读取、递增并写回该项目的计数文件，耗时与输出目录中的项目数量无关。
+    仅在计数目录不存在时扫描一次输出目录以恢复已有序号。
+    """
+    
+    def __init__(self, output_dir):
+        """
+        初始化序号索引
+        
+        Args:
+            output_dir: 输出目录
+        """
+        self.output_dir = Path(output_dir)
+        self.index_dir = self.output_dir / INDEX_DIR_NAME
+        self.lock_path = self.output_dir / LOCK_FILE_NAME
+    
+    def counter_path(self, project_name: str) -> Path:
+        """
+        项目名称对应的计数文件路径
+        
+        Args:
+            project_name: 项目名称
+        
+        Returns:
+            Path: 计数文件路径（项目名称经URL编码，任意名称都是合法的文件名）
+        """
+        return self.index_dir / f"{quote(project_name, safe='')}{COUNTER_SUFFIX}"
+    
+    def allocate(self, project_name: str) -> int:
+        """
+        分配下一个序号
+        
+        Args:
+            project_name: 项目名称
+        
+        Returns:
+            int: 新序号（对应目录 "序号-项目名称" 尚不存在）
+        """
+        ensure_dir(str(self.output_dir))
+        
+        with file_lock(str(self.lock_path)):
+            if not self.index_dir.is_dir():
+                self._rebuild()
+            
+            sequence = self._read_counter(project_name) + 1
+            # 计数文件之外手动创建的目录不会被覆盖
+            while (self.output_dir / f"{sequence}-{project_name}").exists():
+                sequence += 1
+            
+            self._write_counter(self.counter_path(project_name), sequence)
+        
+        return sequence
+    
+    def _read_counter(self, project_name: str) -> int:
+        """读取项目的计数文件，不存在或无效时返回 0"""
+        path = self.counter_path(project_name)
+        try:
+            return int(path.read_text(encoding='utf-8').strip())
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取序号计数文件失败，从0开始分配: {path}: {e}")
+            return 0
+    
+    @staticmethod
+    def _write_counter(path: Path, sequence: int) -> None:
+        """原子写入计数文件"""
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(str(sequence), encoding='utf-8')
+        os.replace(temp_path, path)
+    
+    def _rebuild(self) -> None:
+        """
+        重建计数目录
+        
+        先在临时目录中写入全部计数文件，再重命名为计数目录，中断时不会留下不完整的计数目录
+        """
+        counters = self._scan()
+        logger.info(f"序号计数目录不存在，已扫描输出目录重建: {self.output_dir}")
+        
+        temp_dir = self.output_dir / f"{INDEX_DIR_NAME}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp"
+        temp_dir.mkdir()
+        try:
+            for project_name, sequence in counters.items():
+                (temp_dir / self.counter_path(project_name).name).write_text(str(sequence), encoding='utf-8')
+            os.rename(temp_dir, self.index_dir)
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+    
+    def _scan(self) -> Dict[str, int]:
+        """扫描输出目录，恢复每个项目名称的最大序号"""
+        counters: Dict[str, int] = {}
+        
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                
+                # 匹配 "序号-项目名称" 格式；无序号的 "项目名称" 视为序号1
+                sequence_part, separator, name = entry.name.partition("-")
+                if separator and sequence_part.isdigit() and name:
+                    counters[name] = max(counters.get(name, 0), int(sequence_part))
+                else:
+                    counters[entry.name] = max(counters.get(entry.name, 0), 1)
+        
+        return counters
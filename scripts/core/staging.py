@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+暂存输出模块
+先在目标目录旁边的暂存目录中生成，完成后通过重命名提交，避免中断时留下半成品目录
+"""
+
+import os
+import re
+import shutil
+import uuid
+import logging
+from pathlib import Path
+
+from ..utils.file_utils import (
+    ensure_dir, remove_directory, fsync_tree, fsync_directory,
+    FSYNC_NONE, FSYNC_BATCH
+)
+from ..utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# 暂存目录和待删除旧目录的名称标记，均以 "." 开头以便列表时跳过
+STAGING_MARKER = ".staging-"
+BACKUP_MARKER = ".old-"
+
+
+def is_staging_name(name: str) -> bool:
+    """判断目录名是否为暂存目录或提交过程中的旧目录"""
+    return name.startswith(".") and (STAGING_MARKER in name or BACKUP_MARKER in name)
+
+
+def _pid_alive(pid: int) -> bool:
+    """判断进程是否仍在运行（无法判断的平台上视为运行中）"""
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def remove_stale_staging_dirs(parent, name: str) -> int:
+    """
+    清理已退出进程遗留的暂存目录
+    
+    Args:
+        parent: 输出目录所在的父目录
+        name: 输出目录名称
+    
+    Returns:
+        int: 清理的目录数量
+    """
+    parent = Path(parent)
+    if not parent.is_dir():
+        return 0
+    
+    pattern = re.compile(
+        rf"^\.{re.escape(name)}(?:{re.escape(STAGING_MARKER)}|{re.escape(BACKUP_MARKER)})(\d+)-[0-9a-f]+$"
+    )
+    removed = 0
+    for item in parent.iterdir():
+        match = pattern.match(item.name)
+        if match and item.is_dir() and not _pid_alive(int(match.group(1))):
+            remove_directory(str(item))
+            removed += 1
+            logger.info(f"已清理遗留暂存目录: {item}")
+    return removed
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """优先硬链接，跨设备或不支持时退回复制"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class StagedOutput:
+    """
+    暂存输出目录（上下文管理器）
+    
+    进入时创建同级暂存目录（已有目标目录时先以硬链接复制其内容，供增量写入比较），
+    正常退出时同步并重命名为目标目录；发生异常或被 Ctrl+C 中断时删除暂存目录，
+    目标目录保持原样。
+    
+    写入暂存目录的代码不能原地修改已存在的文件（会通过硬链接影响目标目录），
+    必须先删除再写入，OutputWriter 已按此方式处理。
+    
+    batch 策略下提交前同步暂存目录树：调用方在 written 中给出本次写入的文件时只同步这些文件
+    （从目标目录硬链接带入的未变化文件已经落盘），否则同步全部文件；目录项总是全部同步。
+    """
+    
+    def __init__(self, target_dir, fsync_policy: str = FSYNC_BATCH, reuse_existing: bool = True):
+        """
+        初始化暂存输出
+        
+        Args:
+            target_dir: 最终输出目录
+            fsync_policy: 持久化策略（none / always / batch）
+            reuse_existing: 目标目录已存在时是否将其内容带入暂存目录
+        """
+        self.target_dir = Path(target_dir)
+        self.fsync_policy = fsync_policy
+        self.reuse_existing = reuse_existing
+        self.staging_dir = None
+        self.written = None
+    
+    def __enter__(self) -> Path:
+        parent = self.target_dir.parent
+        name = self.target_dir.name
+        ensure_dir(str(parent))
+        remove_stale_staging_dirs(parent, name)
+        
+        self.staging_dir = parent / f".{name}{STAGING_MARKER}{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        if self.reuse_existing and self.target_dir.is_dir():
+            shutil.copytree(str(self.target_dir), str(self.staging_dir),
+                            symlinks=True, copy_function=_link_or_copy)
+        else:
+            self.staging_dir.mkdir()
+        return self.staging_dir
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+    
+    def commit(self) -> None:
+        """
+        提交暂存目录
+        
+        目标目录不存在时为一次原子重命名；已存在时先将旧目录移开再重命名，
+        失败则恢复旧目录
+        """
+        if self.fsync_policy == FSYNC_BATCH:
+            with span("staging.fsync"):
+                fsync_tree(str(self.staging_dir), self.written)
+        
+        if self.target_dir.exists():
+            backup = self.staging_dir.with_name(self.staging_dir.name.replace(STAGING_MARKER, BACKUP_MARKER, 1))
+            os.rename(self.target_dir, backup)
+            try:
+                os.rename(self.staging_dir, self.target_dir)
+            except OSError:
+                os.rename(backup, self.target_dir)
+                raise
+            remove_directory(str(backup))
+        else:
+            os.rename(self.staging_dir, self.target_dir)
+        
+        if self.fsync_policy != FSYNC_NONE:
+            fsync_directory(str(self.target_dir.parent))
+        logger.info(f"输出已提交: {self.target_dir}")
+    
+    def abort(self) -> None:
+        """放弃暂存目录"""
+        if self.staging_dir is not None:
+            remove_directory(str(self.staging_dir))
+            logger.info(f"生成未完成，已丢弃暂存目录: {self.staging_dir}")
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+模板缓存模块
+提供按模板内容哈希存储的Jinja2字节码磁盘缓存
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any
+
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+
+from ..utils.file_utils import ensure_dir
+
+
+# 默认缓存目录（项目根目录下的 .cache/jinja2）
+DEFAULT_BYTECODE_CACHE_DIR = Path(__file__).parent.parent.parent / ".cache" / "jinja2"
+
+# 影响编译结果的环境选项，纳入缓存键以免不同环境误用同一份字节码
+_ENV_OPTION_NAMES = (
+    "block_start_string", "block_end_string",
+    "variable_start_string", "variable_end_string",
+    "comment_start_string", "comment_end_string",
+    "line_statement_prefix", "line_comment_prefix",
+    "trim_blocks", "lstrip_blocks",
+    "newline_sequence", "keep_trailing_newline",
+    "optimized",
+)
+
+
+class HashedBytecodeCache(FileSystemBytecodeCache):
+    """
+    按内容哈希寻址的字节码缓存
+    
+    Jinja2默认以模板名称作为缓存键；从Markdown提取的模板没有稳定的文件名，
+    因此这里改为以"模板名称 + 模板源码 + 环境选项"的SHA-256作为缓存键，
+    模板内容未变时热启动可直接加载字节码，跳过解析和编译。
+    """
+    
+    def __init__(self, directory: str = None):
+        """
+        初始化字节码缓存
+        
+        Args:
+            directory: 缓存目录，默认为项目根目录下的 .cache/jinja2
+        """
+        directory = str(directory or DEFAULT_BYTECODE_CACHE_DIR)
+        ensure_dir(directory)
+        super().__init__(directory, pattern="__jinja2_%s.cache")
+        
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def get_bucket(self, environment, name, filename, source):
+        """按内容哈希获取缓存桶，并统计命中情况"""
+        key = self._content_key(environment, name, source)
+        bucket = Bucket(environment, key, key)
+        self.load_bytecode(bucket)
+        
+        with self._lock:
+            if bucket.code is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return bucket
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存命中统计
+        
+        Returns:
+            Dict[str, Any]: 命中数、未命中数和缓存目录
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "directory": self.directory
+            }
+    
+    @staticmethod
+    def _content_key(environment, name: str, source: str) -> str:
+        """计算模板内容哈希缓存键"""
+        options = "|".join(repr(getattr(environment, option, None)) for option in _ENV_OPTION_NAMES)
+        digest = hashlib.sha256()
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(options.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(source.encode("utf-8"))
+        return digest.hexdigest()
@@ -6,11 +6,25 @@
 
 import os
 import re
+import json
+import hashlib
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 from ..utils.file_utils import ensure_dir, file_exists, read_file, write_file
+from ..utils.tracing import span
+
+
+# 模板块匹配格式: ### template_name.j2\n```jinja2\n...\n```
+TEMPLATE_BLOCK_PATTERN = r'### ([^\n]+\.j2)\s*\n```jinja2\n(.*?)\n```'
+
+# 索引构建时的匹配格式（兼容CRLF换行）；在解码后的文本上匹配，空白的定义与
+# TEMPLATE_BLOCK_PATTERN 和 str.strip() 一致（含全角空格等Unicode空白），再换算为字节偏移
+_TEMPLATE_BLOCK_INDEX_RE = re.compile(r'### ([^\r\n]+\.j2)\s*\r?\n```jinja2\r?\n(.*?)\r?\n```', re.DOTALL)
+
+# 模板索引文件版本，索引格式或匹配规则变化时递增以强制重建
+TEMPLATE_INDEX_VERSION = 2
 
 
 class TemplateManager:
@@ -30,6 +44,9 @@ class TemplateManager:
         
         self.templates_dir = Path(templates_dir)
         
+        # 已加载的模板索引（按模板文件名缓存，失效由mtime和大小判断）
+        self._index_cache: Dict[str, Dict[str, Any]] = {}
+        
         # 确保模板目录存在
         ensure_dir(str(self.templates_dir))
     
@@ -79,7 +96,8 @@ class TemplateManager:
         if not file_exists(str(template_file)):
             raise FileNotFoundError(f"模板文件不存在：{template_file}")
         
-        return read_file(str(template_file))
+        with span("template.load", template=template_name):
+            return read_file(str(template_file))
     
     def save_template(self, content: str, template_name: str = None) -> str:
         """
@@ -129,6 +147,7 @@ class TemplateManager:
         if file_exists(str(template_file)):
             try:
                 os.remove(str(template_file))
+                self._remove_index(template_name)
                 return True
             except Exception:
                 return False
@@ -161,15 +180,122 @@ class TemplateManager:
         templates = {}
         
         # 使用正则表达式提取模板块
-        # 匹配格式: ### template_name.j2\n```jinja2\n...\n```
-        pattern = r'### ([^\n]+\.j2)\s*\n```jinja2\n(.*?)\n```'
-        matches = re.findall(pattern, content, re.DOTALL)
+        matches = re.findall(TEMPLATE_BLOCK_PATTERN, content, re.DOTALL)
         
         for template_name, template_content in matches:
             templates[template_name] = template_content.strip()
         
         return templates
     
+    def extract_templates(self, template_name: str) -> Dict[str, str]:
+        """
+        按索引从模板文件中提取所有模板块
+        
+        与 extract_templates_from_markdown 结果一致，但只在索引失效时才做全文正则扫描
+        
+        Args:
+            template_name: 模板文件名称（不包含.md扩展名）
+            
+        Returns:
+            Dict[str, str]: 模板名称到模板内容的映射
+            
+        Raises:
+            FileNotFoundError: 模板文件不存在
+        """
+        with span("template.extract", template=template_name):
+            index = self.get_template_index(template_name)
+            template_file = self.get_template_path(template_name)
+            
+            templates = {}
+            with open(template_file, 'rb') as f:
+                for entry in index["templates"]:
+                    templates[entry["name"]] = self._read_block(f, entry)
+            return templates
+    
+    def load_template_block(self, template_name: str, block_name: str) -> str:
+        """
+        按索引加载单个模板块（一次seek和一次read）
+        
+        Args:
+            template_name: 模板文件名称（不包含.md扩展名）
+            block_name: 模板块名称，如 pom.xml.j2
+            
+        Returns:
+            str: 模板块内容
+            
+        Raises:
+            FileNotFoundError: 模板文件或模板块不存在
+        """
+        entry = self._find_block_entry(template_name, block_name)
+        if entry is None:
+            raise FileNotFoundError(f"模板块不存在：{template_name}/{block_name}")
+        
+        with open(self.get_template_path(template_name), 'rb') as f:
+            return self._read_block(f, entry)
+    
+    def get_template_block_hash(self, template_name: str, block_name: str) -> Optional[str]:
+        """
+        获取模板块内容的SHA-256（直接取自索引，不读取模板内容）
+        
+        Args:
+            template_name: 模板文件名称（不包含.md扩展名）
+            block_name: 模板块名称
+            
+        Returns:
+            Optional[str]: 内容哈希，模板块不存在时返回None
+        """
+        entry = self._find_block_entry(template_name, block_name)
+        return entry["sha256"] if entry else None
+    
+    def list_template_blocks(self, template_name: str) -> List[str]:
+        """
+        列出模板文件中的模板块名称（取自索引）
+        
+        Args:
+            template_name: 模板文件名称（不包含.md扩展名）
+            
+        Returns:
+            List[str]: 模板块名称列表，按在文件中出现的顺序排列
+        """
+        index = self.get_template_index(template_name)
+        return list(dict.fromkeys(entry["name"] for entry in index["templates"]))
+    
+    def get_template_index(self, template_name: str) -> Dict[str, Any]:
+        """
+        获取模板文件的模板块索引
+        
+        索引保存在模板文件旁的 <name>.index.json 中，记录每个模板块的名称、
+        字节偏移、字节长度和内容哈希；模板文件的mtime或大小变化时自动重建。
+        
+        Args:
+            template_name: 模板文件名称（不包含.md扩展名）
+            
+        Returns:
+            Dict[str, Any]: 模板索引
+            
+        Raises:
+            FileNotFoundError: 模板文件不存在
+        """
+        template_name = self._sanitize_filename(template_name)
+        template_file = self.templates_dir / f"{template_name}.md"
+        
+        try:
+            stat = os.stat(template_file)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"模板文件不存在：{template_file}")
+        
+        cached = self._index_cache.get(template_name)
+        if cached and self._index_is_fresh(cached, stat):
+            return cached
+        
+        index = self._read_index_file(template_name)
+        if not index or not self._index_is_fresh(index, stat):
+            index = self._build_index(template_file, stat)
+            self._write_index_file(template_name, index)
+        
+        self._index_cache[template_name] = index
+        return index
+    
     def get_template_info(self, template_name: str) -> Dict[str, Any]:
         """
         获取模板文件信息
@@ -186,20 +312,18 @@ class TemplateManager:
             return {}
         
         try:
-            content = self.load_template(template_name)
-            stat = os.stat(template_file)
-            
-            # 提取模板信息
-            templates = self.extract_templates_from_markdown(content)
+            # 模板块信息取自索引，预览只读取文件开头
+            index = self.get_template_index(template_name)
+            template_names = list(dict.fromkeys(entry["name"] for entry in index["templates"]))
             
             return {
                 "name": template_name,
                 "path": template_file,
-                "template_count": len(templates),
-                "template_names": list(templates.keys()),
-                "file_size": stat.st_size,
-                "modified_time": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                "content_preview": content[:200] + "..." if len(content) > 200 else content
+                "template_count": len(template_names),
+                "template_names": template_names,
+                "file_size": index["size"],
+                "modified_time": datetime.fromtimestamp(index["mtime_ns"] / 1e9).isoformat(),
+                "content_preview": self._read_preview(template_file, 200)
             }
         except Exception:
             return {
@@ -280,6 +404,105 @@ class TemplateManager:
         except Exception as e:
             raise ValueError(f"导入模板文件失败：{str(e)}")
     
+    def _get_index_path(self, template_name: str) -> Path:
+        """获取模板索引文件路径"""
+        return self.templates_dir / f"{template_name}.index.json"
+    
+    def _find_block_entry(self, template_name: str, block_name: str) -> Optional[Dict[str, Any]]:
+        """在索引中查找模板块（同名模板块以最后出现的为准）"""
+        index = self.get_template_index(template_name)
+        for entry in reversed(index["templates"]):
+            if entry["name"] == block_name:
+                return entry
+        return None
+    
+    @staticmethod
+    def _index_is_fresh(index: Dict[str, Any], stat: os.stat_result) -> bool:
+        """判断索引是否与模板文件一致"""
+        return (index.get("version") == TEMPLATE_INDEX_VERSION
+                and index.get("mtime_ns") == stat.st_mtime_ns
+                and index.get("size") == stat.st_size)
+    
+    @staticmethod
+    def _build_index(template_file: Path, stat: os.stat_result) -> Dict[str, Any]:
+        """扫描模板文件，构建模板块索引"""
+        with open(template_file, 'rb') as f:
+            text = f.read().decode('utf-8')
+        
+        entries = []
+        # 已换算的字符位置及其对应的字节偏移，按匹配顺序递增换算
+        char_pos = byte_pos = 0
+        for match in _TEMPLATE_BLOCK_INDEX_RE.finditer(text):
+            start, end = match.span(2)
+            # 与 str.strip() 保持一致：去掉块内容首尾空白
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            
+            byte_pos += len(text[char_pos:start].encode('utf-8'))
+            content = text[start:end].encode('utf-8')
+            entries.append({
+                "name": match.group(1).strip(),
+                "offset": byte_pos,
+                "length": len(content),
+                "sha256": hashlib.sha256(content).hexdigest()
+            })
+            char_pos, byte_pos = end, byte_pos + len(content)
+        
+        return {
+            "version": TEMPLATE_INDEX_VERSION,
+            "source": template_file.name,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "templates": entries
+        }
+    
+    def _read_index_file(self, template_name: str) -> Optional[Dict[str, Any]]:
+        """读取索引文件，不存在或损坏时返回None"""
+        index_path = self._get_index_path(template_name)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_index_file(self, template_name: str, index: Dict[str, Any]) -> None:
+        """写入索引文件（先写临时文件再替换，避免并发读取到半截索引）"""
+        index_path = self._get_index_path(template_name)
+        tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            # 模板目录只读时仍可使用内存中的索引
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
+    def _remove_index(self, template_name: str) -> None:
+        """删除模板索引"""
+        self._index_cache.pop(template_name, None)
+        index_path = self._get_index_path(template_name)
+        if index_path.exists():
+            index_path.unlink()
+    
+    @staticmethod
+    def _read_block(f, entry: Dict[str, Any]) -> str:
+        """从已打开的模板文件中读取模板块"""
+        f.seek(entry["offset"])
+        content = f.read(entry["length"]).decode('utf-8')
+        return content.replace('\r\n', '\n').strip()
+    
+    @staticmethod
+    def _read_preview(template_file: str, max_chars: int) -> str:
+        """只读取文件开头生成内容预览"""
+        # UTF-8单个字符最多4字节，多读1字节用于判断是否被截断
+        with open(template_file, 'rb') as f:
+            head = f.read(max_chars * 4 + 1)
+        text = head.decode('utf-8', errors='ignore').replace('\r\n', '\n')
+        return text[:max_chars] + "..." if len(text) > max_chars else text
+    
     def _sanitize_filename(self, filename: str) -> str:
         """
         清理文件名，移除不安全字符
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+模板预编译模块
+compile-templates 命令把模板编译为Python模块（setup.py 构建时自动执行，写入构建目录随包发布；
+源码目录中运行时由 .gitignore 忽略），运行时源码键一致则直接导入编译结果，跳过模板解析和编译；
+未预编译或已过期的模板回退为常规编译
+"""
+
+import hashlib
+import logging
+import threading
+import importlib.util
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+import jinja2
+from jinja2 import BaseLoader
+
+from .template_cache import HashedBytecodeCache
+from ..utils.file_utils import ensure_dir, write_file
+
+logger = logging.getLogger(__name__)
+
+# 默认预编译目录（scripts/compiled_templates），按环境分子目录存放
+DEFAULT_COMPILED_DIR = Path(__file__).parent.parent / "compiled_templates"
+
+# 各生成器的预编译子目录
+CONTEXT_TEMPLATES = "context"
+PROJECT_TEMPLATES = "project"
+
+# 预编译模块首行记录源码键的注释前缀：导入前只读取首行即可判断模块是否过期，无需执行模块
+SOURCE_KEY_HEADER = "# __source_key__: "
+
+
+def compiled_key(environment, name: str, source: str) -> str:
+    """
+    计算预编译模块的源码键
+    
+    由模板名称、模板源码、影响编译结果的环境选项和Jinja2版本共同决定，任一变化都会使预编译模块失效
+    
+    Args:
+        environment: Jinja2环境
+        name: 模板名称
+        source: 模板源码
+    
+    Returns:
+        str: SHA-256十六进制摘要
+    """
+    content_key = HashedBytecodeCache._content_key(environment, name, source)
+    return hashlib.sha256(f"{jinja2.__version__}\0{content_key}".encode("utf-8")).hexdigest()
+
+
+def module_file_name(name: str) -> str:
+    """模板名称对应的模块文件名（与 jinja2.ModuleLoader 的命名规则一致）"""
+    return f"tmpl_{hashlib.sha1(name.encode('utf-8')).hexdigest()}.py"
+
+
+def compile_templates(environment, target_dir, names: Optional[Iterable[str]] = None) -> int:
+    """
+    把模板编译为Python模块
+    
+    Args:
+        environment: Jinja2环境（需已注册模板用到的过滤器）
+        target_dir: 输出目录，作为Python包（写入 __init__.py）
+        names: 需要编译的模板名称，默认为环境中的全部模板
+    
+    Returns:
+        int: 编译的模板数量
+    """
+    target_dir = Path(target_dir)
+    ensure_dir(str(target_dir))
+    init_file = target_dir / "__init__.py"
+    if not init_file.exists():
+        write_file(str(init_file), "# 由 compile-templates 生成的预编译模板，请勿手动修改\n")
+    
+    names = list(names) if names is not None else environment.list_templates()
+    for name in names:
+        source, filename, _ = environment.loader.get_source(environment, name)
+        code = environment.compile(source, name, filename, raw=True)
+        key = compiled_key(environment, name, source)
+        write_file(str(target_dir / module_file_name(name)), f"{SOURCE_KEY_HEADER}{key}\n{code}\n")
+    
+    logger.info(f"已预编译 {len(names)} 个模板到 {target_dir}")
+    return len(names)
+
+
+class PrecompiledLoader(BaseLoader):
+    """
+    优先使用预编译模块的模板加载器
+    
+    模板源码仍由被包装的加载器提供（只读取源码并计算哈希，不解析），
+    预编译模块存在且首行记录的源码键一致时才导入执行，否则回退为常规编译（可配合字节码缓存）。
+    导入结果按模板名称缓存，源码键不变时重复加载不再读取和执行模块文件。
+    """
+    
+    def __init__(self, loader: BaseLoader, compiled_dir):
+        """
+        初始化加载器
+        
+        Args:
+            loader: 提供模板源码的加载器
+            compiled_dir: 预编译模块目录
+        """
+        self.loader = loader
+        self.compiled_dir = Path(compiled_dir)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 模板名称 -> (源码键, 模块命名空间)
+        self._modules: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    
+    def __getattr__(self, name):
+        # 其余属性（如 DictLoader.mapping）转发给被包装的加载器
+        if name == "loader":
+            raise AttributeError(name)
+        return getattr(self.loader, name)
+
+    def get_source(self, environment, template):
+        return self.loader.get_source(environment, template)
+    
+    def list_templates(self):
+        return self.loader.list_templates()
+    
+    def load(self, environment, name, globals=None):
+        """加载模板：源码键一致时使用预编译模块，否则常规编译"""
+        source, filename, uptodate = self.get_source(environment, name)
+        namespace = self._import_module(environment, name, source)
+        
+        with self._lock:
+            if namespace is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        
+        if namespace is None:
+            return super().load(environment, name, globals)
+        
+        template = environment.template_class.from_module_dict(environment, namespace, globals or {})
+        # 保留源加载器的过期检查，模板文件修改后 auto_reload 仍然生效
+        template._uptodate = uptodate
+        return template
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取预编译模块命中统计
+        
+        Returns:
+            Dict[str, Any]: 命中数、未命中数和预编译目录
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "directory": str(self.compiled_dir)
+            }
+    
+    def _import_module(self, environment, name: str, source: str) -> Optional[Dict[str, Any]]:
+        """导入模板对应的预编译模块；不存在、已过期或导入失败时返回 None"""
+        key = compiled_key(environment, name, source)
+        with self._lock:
+            cached = self._modules.get(name)
+        if cached is not None and cached[0] == key and cached[1].get("environment") is environment:
+            return cached[1]
+        
+        module_file = self.compiled_dir / module_file_name(name)
+        if read_source_key(module_file) != key:
+            if module_file.is_file():
+                logger.info(f"预编译模板已过期，改为常规编译: {name}")
+            return None
+        
+        spec = importlib.util.spec_from_file_location(f"_compiled_templates.{module_file.stem}", module_file)
+        module = importlib.util.module_from_spec(spec)
+        # 编译结果在定义渲染函数时绑定 environment，执行前需注入（与 Template.from_code 一致）
+        module.environment = environment
+        try:
+            spec.loader.exec_module(module)
+        except Exception as e:
+            logger.warning(f"预编译模板导入失败，改为常规编译 {name}: {e}")
+            return None
+        
+        with self._lock:
+            self._modules[name] = (key, module.__dict__)
+        return module.__dict__
+
+
+def read_source_key(module_file) -> Optional[str]:
+    """
+    读取预编译模块首行记录的源码键（不执行模块）
+    
+    Args:
+        module_file: 预编译模块文件路径
+    
+    Returns:
+        Optional[str]: 源码键；文件不存在或首行不是源码键注释时返回 None
+    """
+    try:
+        with open(module_file, "r", encoding="utf-8") as f:
+            first_line = f.readline()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not first_line.startswith(SOURCE_KEY_HEADER):
+        return None
+    return first_line[len(SOURCE_KEY_HEADER):].strip()
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+监视模式模块
+监视提示词模板目录、片段模板目录和配置文件，变化后只重新生成受影响的项目；
+未变化的产物命中渲染缓存，内容未变化的文件不重写
+"""
+
+import json
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Callable
+
+from .prompt_fragments import FRAGMENTS_DIR
+from ..validators.config_validator import ConfigValidator
+
+# 可选：安装 watchdog 时使用文件系统事件（Linux上为inotify）唤醒，否则只按间隔轮询
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_DEBOUNCE_SECONDS = 0.3
+TEMPLATE_PATTERN = "*.md"
+
+
+class ChangeWatcher:
+    """
+    文件变化监视器
+    
+    按 (mtime_ns, size) 比较文件快照。变化被发现后继续等待，直到 debounce 秒内不再有新变化
+    才返回，编辑器保存时的多次写入只触发一次重新生成。
+    """
+    
+    def __init__(self, files: Iterable = (), directories: Iterable = (), pattern: str = TEMPLATE_PATTERN,
+                 interval: float = DEFAULT_POLL_INTERVAL, debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+                 recursive_directories: Iterable = ()):
+        """
+        初始化监视器
+        
+        Args:
+            files: 监视的文件
+            directories: 监视的目录（只监视匹配 pattern 的直接子文件）
+            pattern: 目录中的文件匹配模式
+            interval: 轮询间隔秒数
+            debounce: 去抖时间秒数
+            recursive_directories: 递归监视其中全部文件的目录（不限扩展名）
+        """
+        self.files = [Path(path) for path in files]
+        self.directories = [Path(path) for path in directories]
+        self.recursive_directories = [Path(path) for path in recursive_directories]
+        self.pattern = pattern
+        self.interval = interval
+        self.debounce = debounce
+        
+        self._snapshot = self.scan()
+        self._wake = threading.Event()
+        self._observer = self._start_observer() if WATCHDOG_AVAILABLE else None
+    
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """
+        获取当前文件快照
+        
+        Returns:
+            Dict[str, Tuple[int, int]]: 文件路径 → (mtime_ns, size)，不存在的文件不在快照中
+        """
+        paths = list(self.files)
+        for directory in self.directories:
+            if directory.is_dir():
+                paths.extend(directory.glob(self.pattern))
+        for directory in self.recursive_directories:
+            if directory.is_dir():
+                paths.extend(path for path in directory.rglob("*") if path.is_file())
+        
+        snapshot = {}
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    
+    def poll_changes(self) -> List[str]:
+        """
+        对比上次快照，返回新增、修改或删除的文件
+        
+        Returns:
+            List[str]: 变化的文件路径（已排序）
+        """
+        current = self.scan()
+        previous, self._snapshot = self._snapshot, current
+        return sorted(path for path in set(previous) | set(current) if previous.get(path) != current.get(path))
+    
+    def wait_for_changes(self, stop_event: Optional[threading.Event] = None) -> List[str]:
+        """
+        阻塞直到有文件变化（已去抖）或 stop_event 被设置
+        
+        Returns:
+            List[str]: 变化的文件路径；因停止而返回时为空列表
+        """
+        while not (stop_event and stop_event.is_set()):
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            
+            changed = set(self.poll_changes())
+            if not changed:
+                continue
+            
+            # 去抖：直到一个去抖周期内不再出现新变化
+            while True:
+                time.sleep(self.debounce)
+                more = self.poll_changes()
+                if not more:
+                    break
+                changed.update(more)
+            return sorted(changed)
+        return []
+    
+    def close(self) -> None:
+        """停止文件系统事件监听"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+    
+    def _start_observer(self):
+        """启动 watchdog 监听，事件只用于提前唤醒轮询"""
+        wake = self._wake
+        
+        class _WakeHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+        
+        directories = {path.parent for path in self.files} | set(self.directories)
+        observer = Observer()
+        for directory in directories:
+            if directory.is_dir():
+                observer.schedule(_WakeHandler(), str(directory), recursive=False)
+        for directory in self.recursive_directories:
+            if directory.is_dir():
+                observer.schedule(_WakeHandler(), str(directory), recursive=True)
+        observer.daemon = True
+        observer.start()
+        logger.info("监视模式使用文件系统事件唤醒")
+        return observer
+
+
+@dataclass
+class WatchCycleResult:
+    """一轮重新生成的结果"""
+    changed_paths: List[str] = field(default_factory=list)
+    rendered: Dict[str, List[str]] = field(default_factory=dict)   # 配置文件 → 重新渲染的产物
+    written: Dict[str, List[str]] = field(default_factory=dict)    # 配置文件 → 新增或变更的文件
+    errors: Dict[str, str] = field(default_factory=dict)           # 配置文件 → 错误信息
+    elapsed_seconds: float = 0.0
+    
+    def describe(self) -> str:
+        """生成一行摘要"""
+        rendered = sum(len(names) for names in self.rendered.values())
+        written = sum(len(names) for names in self.written.values())
+        text = (f"{len(self.rendered)} 个项目，重新渲染 {rendered} 个产物，写入 {written} 个文件，"
+                f"耗时 {self.elapsed_seconds * 1000:.1f}ms")
+        if self.errors:
+            text += f"，失败 {len(self.errors)} 个"
+        return text
+
+
+class WatchSession:
+    """
+    监视模式会话
+    
+    模板目录或片段模板目录（含子目录和 .claude/.gemini 片段）中的文件变化时重新生成全部配置；
+    配置文件变化时只重新生成该配置。
+    同一个 ContextGenerator 贯穿整个会话，渲染缓存保证只有依赖发生变化的产物被重新渲染。
+    """
+    
+    def __init__(self, config_paths: Iterable, generator, interval: float = DEFAULT_POLL_INTERVAL,
+                 debounce: float = DEFAULT_DEBOUNCE_SECONDS):
+        """
+        初始化会话
+        
+        Args:
+            config_paths: 监视的配置文件（JSON）
+            generator: ContextGenerator 实例
+            interval: 轮询间隔秒数
+            debounce: 去抖时间秒数
+        """
+        self.config_paths = [str(Path(path)) for path in config_paths]
+        self.generator = generator
+        self.watcher = ChangeWatcher(
+            files=self.config_paths,
+            directories=[generator.templates_dir],
+            interval=interval,
+            debounce=debounce,
+            recursive_directories=[FRAGMENTS_DIR]
+        )
+    
+    def run_cycle(self, changed_paths: Optional[List[str]] = None) -> WatchCycleResult:
+        """
+        执行一轮重新生成
+        
+        Args:
+            changed_paths: 变化的文件；None 表示首次运行，生成全部配置
+        
+        Returns:
+            WatchCycleResult: 本轮结果
+        """
+        result = WatchCycleResult(changed_paths=list(changed_paths or []))
+        start = time.perf_counter()
+        
+        for config_path in self._affected_configs(changed_paths):
+            try:
+                config = self._load_config(config_path)
+                self.generator.generate(config)
+            except Exception as e:
+                # 与批量生成一样按配置记录失败（包括模板语法错误等），监视循环继续运行
+                result.errors[config_path] = f"{type(e).__name__}: {e}"
+                logger.warning(f"监视模式重新生成失败 {config_path}: {type(e).__name__}: {e}")
+                continue
+            
+            summary = self.generator.last_summary
+            result.rendered[config_path] = list(self.generator.last_rendered)
+            result.written[config_path] = sorted(summary.added + summary.changed)
+        
+        result.elapsed_seconds = time.perf_counter() - start
+        return result
+    
+    def run(self, on_cycle: Callable[[WatchCycleResult], None] = None,
+            stop_event: Optional[threading.Event] = None) -> None:
+        """
+        首次生成全部配置，然后持续监视直到 stop_event 被设置
+        
+        Args:
+            on_cycle: 每轮结束后的回调
+            stop_event: 停止事件
+        """
+        try:
+            result = self.run_cycle()
+            if on_cycle:
+                on_cycle(result)
+            
+            while not (stop_event and stop_event.is_set()):
+                changed = self.watcher.wait_for_changes(stop_event)
+                if not changed:
+                    continue
+                result = self.run_cycle(changed)
+                if on_cycle:
+                    on_cycle(result)
+        finally:
+            self.watcher.close()
+    
+    def _affected_configs(self, changed_paths: Optional[List[str]]) -> List[str]:
+        """根据变化的文件确定需要重新生成的配置"""
+        if changed_paths is None:
+            return list(self.config_paths)
+        
+        changed = set(changed_paths)
+        templates_dir = Path(self.generator.templates_dir)
+        fragments_dir = FRAGMENTS_DIR.resolve()
+        for path in changed:
+            if path in self.config_paths:
+                continue
+            path = Path(path)
+            if path.parent == templates_dir or fragments_dir in path.resolve().parents:
+                return list(self.config_paths)
+        return [path for path in self.config_paths if path in changed]
+    
+    @staticmethod
+    def _load_config(config_path: str) -> Dict[str, Any]:
+        """读取并验证配置文件，失败时抛出 ValueError"""
+        with open(config_path, 'r', encoding='utf-8') as f:
+            try:
+                config = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"配置JSON格式错误：{e}")
+        
+        errors = ConfigValidator().validate_config(config)
+        if errors:
+            raise ValueError(f"配置验证失败：{'; '.join(errors)}")
+        return config
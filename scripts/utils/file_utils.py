@@ -7,8 +7,14 @@
 import os
 import shutil
 import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
+
+# 写入持久化策略
+FSYNC_NONE = "none"      # 不主动同步，由操作系统决定落盘时机
+FSYNC_ALWAYS = "always"  # 每个文件写入后立即fsync
+FSYNC_BATCH = "batch"    # 写入时不同步，提交前统一同步一次
 
 
 def ensure_dir(path: str) -> None:
@@ -77,17 +83,120 @@ def read_file(path: str, encoding: str = 'utf-8') -> str:
         return f.read()
 
 
-def write_file(path: str, content: str, encoding: str = 'utf-8') -> None:
+def write_file(path: str, content: str, encoding: str = 'utf-8', fsync: bool = False) -> None:
     """写入文件内容
     
     Args:
         path: 文件路径
         content: 文件内容
         encoding: 文件编码
+        fsync: 写入后是否立即同步到磁盘
     """
     ensure_dir(os.path.dirname(path))
     with open(path, 'w', encoding=encoding) as f:
         f.write(content)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def write_bytes(path: str, data: bytes, fsync: bool = False) -> None:
+    """写入二进制文件内容（不做换行符转换）
+    
+    Args:
+        path: 文件路径
+        data: 文件内容
+        fsync: 写入后是否立即同步到磁盘
+    """
+    ensure_dir(os.path.dirname(path))
+    with open(path, 'wb') as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def fsync_tree(path: str, files: Optional[Iterable[str]] = None) -> None:
+    """将目录树中已写入的文件和全部目录项批量同步到磁盘
+    
+    只同步该目录树自身的数据，不发起系统级同步（os.sync 会把其他进程和文件系统的脏页一并写回）
+    
+    Args:
+        path: 目录路径
+        files: 需要同步的文件（相对于 path 的路径），不存在的文件跳过；为 None 时同步目录树中的全部文件
+    """
+    directories = []
+    for root, _, names in os.walk(path):
+        directories.append(root)
+        if files is None:
+            for name in names:
+                _fsync_file(os.path.join(root, name))
+    
+    if files is not None:
+        for relative_path in files:
+            file_path = os.path.join(path, relative_path)
+            if os.path.isfile(file_path):
+                _fsync_file(file_path)
+    
+    # 子目录在前，上级目录在后
+    for directory in reversed(directories):
+        fsync_directory(directory)
+
+
+def _fsync_file(path: str) -> None:
+    """同步单个文件的内容（Windows 上 fsync 需要写权限，因此以读写方式打开）"""
+    with open(path, 'rb+') as f:
+        os.fsync(f.fileno())
+
+
+def fsync_directory(path: str) -> None:
+    """同步目录项（使重命名、创建等操作持久化），不支持的平台上忽略
+    
+    Args:
+        path: 目录路径
+    """
+    if os.name != 'posix':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(path: str):
+    """基于锁文件的进程间排他锁（建议性锁），阻塞直到获得锁
+    
+    POSIX 使用 fcntl.flock，Windows 使用 msvcrt.locking；锁随文件关闭自动释放
+    
+    Args:
+        path: 锁文件路径（不存在时自动创建）
+    """
+    ensure_dir(os.path.dirname(path))
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK 重试约10秒后仍失败会抛出异常，继续等待
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
 
 
 def read_json(path: str) -> Dict[str, Any]:
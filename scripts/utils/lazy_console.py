@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+延迟创建的控制台模块
+首次使用时才导入 rich 并创建 Console，无界面的命令行调用不必承担 rich 的导入开销
+"""
+
+
+class LazyConsole:
+    """
+    rich.console.Console 的延迟代理
+    
+    首次访问任何属性（如 print）时才导入 rich 并创建真正的 Console，
+    之后的属性访问直接转发给该实例。
+    """
+    
+    def __init__(self, **console_kwargs):
+        """初始化代理
+        
+        Args:
+            **console_kwargs: 传给 rich.console.Console 的参数（如 stderr=True）
+        """
+        self._console_kwargs = console_kwargs
+        self._console = None
+    
+    def __getattr__(self, name):
+        # 只有实例上不存在的属性才会进入这里
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console(**self._console_kwargs)
+        return getattr(self._console, name)
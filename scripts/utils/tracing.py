@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+性能追踪工具模块
+记录生成过程各阶段的嵌套耗时区间，并导出为Chrome trace事件格式（可用 chrome://tracing 或 Perfetto 打开）
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+
+class _NullSpan:
+    """追踪未启用时使用的空区间，进入和退出均不做任何事"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+# 当前启用的追踪器；None 表示未启用
+_tracer = None
+
+
+class Tracer:
+    """
+    耗时区间收集器（线程安全）
+    
+    每个区间记录为一个完整事件（ph="X"），同一线程中的区间按时间范围自然嵌套。
+    进程池子进程中的区间不会被收集。
+    """
+    
+    def __init__(self):
+        """初始化追踪器"""
+        self.pid = os.getpid()
+        self._origin_ns = time.perf_counter_ns()
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def span(self, name: str, category: str = "generator", **args):
+        """记录一个耗时区间
+        
+        Args:
+            name: 区间名称
+            category: 事件分类
+            **args: 附加到事件上的参数（需可JSON序列化）
+        """
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end_ns = time.perf_counter_ns()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start_ns - self._origin_ns) / 1000,
+                "dur": (end_ns - start_ns) / 1000,
+                "pid": self.pid,
+                "tid": threading.get_ident()
+            }
+            if args:
+                event["args"] = args
+            with self._lock:
+                self._events.append(event)
+    
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """已记录的事件（按开始时间排序）"""
+        with self._lock:
+            return sorted(self._events, key=lambda event: event["ts"])
+    
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """转换为Chrome trace事件格式
+        
+        Returns:
+            Dict[str, Any]: 包含 traceEvents 的字典
+        """
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+    
+    def write(self, path: str) -> None:
+        """将追踪结果写入JSON文件
+        
+        Args:
+            path: 输出文件路径
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+
+
+def enable_tracing() -> Tracer:
+    """启用追踪（已启用时返回当前追踪器）
+    
+    Returns:
+        Tracer: 当前追踪器
+    """
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """停用追踪
+    
+    Returns:
+        Optional[Tracer]: 停用前的追踪器，未启用时为 None
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """获取当前追踪器，未启用时返回 None"""
+    return _tracer
+
+
+def span(name: str, category: str = "generator", **args):
+    """记录一个耗时区间
+    
+    追踪未启用时返回共享的空区间，只有一次全局变量判断的开销。
+    
+    Args:
+        name: 区间名称
+        category: 事件分类
+        **args: 附加到事件上的参数
+    
+    Returns:
+        上下文管理器
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, category, **args)
@@ -11,9 +11,11 @@
 
 import re
 from typing import Dict, List, Any
-from rich.console import Console
 
-console = Console()
+from ..utils.tracing import span
+from ..utils.lazy_console import LazyConsole
+
+console = LazyConsole()
 
 
 class ConfigValidator:
@@ -50,22 +52,23 @@ class ConfigValidator:
         """
         errors = []
         
-        try:
-            # 验证必需字段
-            errors.extend(self._validate_required_fields(config))
-            
-            # 验证项目基本信息格式
-            errors.extend(self._validate_project_info(config))
-            
-            # 验证技术栈兼容性
-            errors.extend(self._validate_tech_compatibility(config))
-            
-            # 验证多模块配置
-            if config.get('is_multi_module', False):
-                errors.extend(self._validate_multi_module_config(config))
+        with span("config.validate"):
+            try:
+                # 验证必需字段
+                errors.extend(self._validate_required_fields(config))
+                
+                # 验证项目基本信息格式
+                errors.extend(self._validate_project_info(config))
+                
+                # 验证技术栈兼容性
+                errors.extend(self._validate_tech_compatibility(config))
                 
-        except Exception as e:
-            errors.append(f"配置验证过程中发生错误: {str(e)}")
+                # 验证多模块配置
+                if config.get('is_multi_module', False):
+                    errors.extend(self._validate_multi_module_config(config))
+                    
+            except Exception as e:
+                errors.append(f"配置验证过程中发生错误: {str(e)}")
         
         return errors
     
@@ -1,4 +1,30 @@
+import os
+import sys
+import subprocess
+
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+# 预编译模板目录（相对于包根目录），由 compile-templates 生成，随包发布
+COMPILED_TEMPLATES_DIR = os.path.join("scripts", "compiled_templates")
+
+
+class BuildPyWithCompiledTemplates(build_py):
+    """构建时把全部模板预编译为Python模块，写入构建目录随包发布"""
+    
+    def run(self):
+        super().run()
+        if self.dry_run:
+            return
+        
+        target = os.path.join(os.path.abspath(self.build_lib), COMPILED_TEMPLATES_DIR)
+        root = os.path.dirname(os.path.abspath(__file__))
+        try:
+            subprocess.check_call([sys.executable, "main.py", "compile-templates", "--out", target], cwd=root)
+        except (OSError, subprocess.CalledProcessError) as e:
+            # 预编译只是启动优化：失败时照常构建，运行时回退为常规编译
+            self.warn(f"模板预编译失败，安装包将不含预编译模板: {e}")
+
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -38,6 +64,9 @@ setup(
     },
     include_package_data=True,
     package_data={
-        "scripts": ["templates/**/*", "validators/**/*"],
+        "scripts": ["templates/**/*", "validators/**/*", "compiled_templates/**/*"],
+    },
+    cmdclass={
+        "build_py": BuildPyWithCompiledTemplates,
     },
 )
\ No newline at end of file
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 批量生成器测试
+"""
+
+import unittest
+import json
+import time
+import tempfile
+import shutil
+import multiprocessing
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.batch_generator import BatchGenerator, BatchTaskResult, load_manifest, load_generator_settings
+
+
+def make_config(project_name):
+    """构造测试用项目配置"""
+    return {
+        'project_name': project_name,
+        'package_name': 'com.example.test',
+        'version': '1.0.0',
+        'description': 'Test project',
+        'jdk_version': '17',
+        'build_tool': 'Maven',
+        'spring_boot_version': '3.2.0',
+        'database': 'MySQL',
+        'orm_framework': 'MyBatis',
+        'cache': 'Redis',
+        'message_queue': '无消息队列',
+        'include_swagger': True,
+        'include_security': False,
+        'include_actuator': True,
+        'generate_sample_code': True,
+        'generate_tests': True,
+        'generate_docker': True,
+        'generate_readme': True,
+        'is_multi_module': False,
+        'modules': []
+    }
+
+
+def slow_generate_project(index, config, output_base_dir, use_blob_store=False):
+    """模拟耗时的生成任务：等待后写入标记文件"""
+    time.sleep(1.5)
+    marker = Path(output_base_dir) / config['project_name']
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.write_text("late", encoding='utf-8')
+    return BatchTaskResult(index=index, project_name=config['project_name'], success=True,
+                           output_path=str(marker))
+
+
+class TestLoadManifest(unittest.TestCase):
+    """清单读取测试类"""
+
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_load_json_array(self):
+        """测试读取JSON数组清单"""
+        manifest = Path(self.temp_dir) / "manifest.json"
+        manifest.write_text(json.dumps([make_config('project-a'), make_config('project-b')]), encoding='utf-8')
+
+        configs = load_manifest(str(manifest))
+        self.assertEqual([c['project_name'] for c in configs], ['project-a', 'project-b'])
+
+    def test_load_jsonl(self):
+        """测试读取JSONL清单"""
+        manifest = Path(self.temp_dir) / "manifest.jsonl"
+        lines = [json.dumps(make_config('project-a')), "", json.dumps(make_config('project-b'))]
+        manifest.write_text("\n".join(lines), encoding='utf-8')
+
+        configs = load_manifest(str(manifest))
+        self.assertEqual(len(configs), 2)
+
+    def test_load_invalid_jsonl(self):
+        """测试无效JSONL行报错"""
+        manifest = Path(self.temp_dir) / "manifest.jsonl"
+        manifest.write_text(json.dumps(make_config('project-a')) + "\n{bad json", encoding='utf-8')
+
+        with self.assertRaises(ValueError):
+            load_manifest(str(manifest))
+
+    def test_load_missing_manifest(self):
+        """测试清单文件不存在"""
+        with self.assertRaises(FileNotFoundError):
+            load_manifest(str(Path(self.temp_dir) / "missing.json"))
+
+
+class TestBatchGenerator(unittest.TestCase):
+    """批量生成器测试类"""
+
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = str(Path(self.temp_dir) / "output")
+
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_settings_from_system_config(self):
+        """测试从system.json读取并发设置"""
+        settings = load_generator_settings()
+        self.assertEqual(settings['max_concurrent_tasks'], 4)
+        self.assertEqual(settings['timeout_seconds'], 300)
+
+    def test_generate_all_in_pool(self):
+        """测试进程池批量生成，单个失败不影响其他项目"""
+        invalid = make_config('123-invalid')
+        configs = [make_config('project-a'), invalid, make_config('project-b')]
+
+        generator = BatchGenerator(max_workers=2, output_base_dir=self.output_dir)
+        report = generator.generate_all(configs)
+
+        self.assertEqual(report.max_workers, 2)
+        self.assertEqual([r.index for r in report.results], [0, 1, 2])
+        self.assertEqual(len(report.succeeded), 2)
+        self.assertEqual(len(report.failed), 1)
+        self.assertEqual(report.failed[0].project_name, '123-invalid')
+
+        for result in report.succeeded:
+            self.assertTrue((Path(result.output_path) / "config.json").exists())
+            self.assertGreaterEqual(result.elapsed_seconds, 0)
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), "需要fork启动方式")
+    def test_timeout_terminates_workers(self):
+        """测试批次超时后终止仍在运行的工作进程，超时项目不会在之后写入输出（单工作进程同样生效）"""
+        context = multiprocessing.get_context('fork')
+        for max_workers in (2, 1):
+            with self.subTest(max_workers=max_workers):
+                output_dir = Path(self.output_dir) / str(max_workers)
+                generator = BatchGenerator(max_workers=max_workers, timeout_seconds=0.3,
+                                           output_base_dir=str(output_dir))
+                with patch('scripts.core.batch_generator._generate_project', slow_generate_project), \
+                        patch('scripts.core.batch_generator.multiprocessing.Pool', context.Pool):
+                    report = generator.generate_all([make_config('slow-a'), make_config('slow-b')])
+
+                self.assertEqual(len(report.failed), 2)
+                self.assertIn('超时', report.failed[0].error)
+
+                time.sleep(2)
+                self.assertFalse((output_dir / 'slow-a').exists())
+                self.assertFalse((output_dir / 'slow-b').exists())
+
+    def test_generate_single_worker(self):
+        """测试单工作进程批量生成"""
+        generator = BatchGenerator(max_workers=1, output_base_dir=self.output_dir)
+        report = generator.generate_all([make_config('project-a')])
+
+        self.assertEqual(len(report.succeeded), 1)
+        self.assertEqual(report.to_dict()['total'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
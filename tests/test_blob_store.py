@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 内容寻址存储测试
+"""
+
+import unittest
+import os
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.blob_store import BlobStore, BLOB_DIR_NAME
+from scripts.core.output_writer import OutputWriter
+from scripts.core.staging import StagedOutput
+from scripts.utils.file_utils import FSYNC_NONE
+
+
+class TestBlobStore(unittest.TestCase):
+    """内容寻址存储测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_root = Path(self.temp_dir)
+        self.store = BlobStore(self.output_root)
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def _generate(self, project_name, files):
+        with StagedOutput(self.output_root / project_name, FSYNC_NONE) as staging_dir:
+            writer = OutputWriter(staging_dir, blob_store=self.store)
+            for relative_path, content in files.items():
+                writer.write_text(relative_path, content)
+            writer.finalize()
+        return self.output_root / project_name
+    
+    def test_identical_files_share_inode(self):
+        """测试不同项目中内容相同的文件共享同一个blob"""
+        project_a = self._generate("a", {".gitignore": "target/", "README.md": "# a"})
+        project_b = self._generate("b", {".gitignore": "target/", "README.md": "# b"})
+        
+        self.assertEqual((project_a / ".gitignore").stat().st_ino, (project_b / ".gitignore").stat().st_ino)
+        self.assertNotEqual((project_a / "README.md").stat().st_ino, (project_b / "README.md").stat().st_ino)
+        
+        stats = self.store.get_stats()
+        self.assertEqual(stats["blobs"], 3)
+        self.assertEqual(stats["saved_bytes"], len("target/"))
+    
+    def test_changed_file_does_not_affect_other_projects(self):
+        """测试重新生成时修改文件不会通过硬链接影响其他项目"""
+        self._generate("a", {"README.md": "# shared"})
+        project_b = self._generate("b", {"README.md": "# shared"})
+        project_a = self._generate("a", {"README.md": "# changed"})
+        
+        self.assertEqual((project_a / "README.md").read_text(encoding='utf-8'), "# changed")
+        self.assertEqual((project_b / "README.md").read_text(encoding='utf-8'), "# shared")
+    
+    def test_gc_removes_unreferenced_blobs(self):
+        """测试gc只删除不再被引用的blob"""
+        self._generate("a", {".gitignore": "target/", "README.md": "# a"})
+        self._generate("b", {".gitignore": "target/"})
+        
+        result = self.store.gc()
+        self.assertEqual(result.removed, 0)
+        self.assertEqual(result.kept, 2)
+        
+        shutil.rmtree(self.output_root / "a")
+        result = self.store.gc()
+        self.assertEqual(result.removed, 1)
+        self.assertEqual(result.kept, 1)
+        
+        shutil.rmtree(self.output_root / "b")
+        self.assertEqual(self.store.gc().removed, 1)
+        self.assertEqual(list((self.output_root / BLOB_DIR_NAME).iterdir()), [])
+    
+    def test_link_recovers_from_collected_blob(self):
+        """测试blob被并发gc删除后链接时重新存入"""
+        content_hash = "ab" + "0" * 62
+        blob = self.store.put(content_hash, b"data")
+        os.remove(blob)
+        
+        target = self.output_root / "file.txt"
+        self.assertTrue(self.store.link(content_hash, b"data", target))
+        self.assertEqual(target.read_bytes(), b"data")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 缓存友好布局测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.cache_layout import (
+    PROJECT_CONTENT_MARKER, render_cache_layout, split_prefix, build_config_matrix, check_prefix_stability
+)
+from scripts.core.context_generator import ContextGenerator
+from scripts.core.prompt_fragments import clear_fragment_cache
+
+
+class TestCacheLayoutRendering(unittest.TestCase):
+    """片段模板缓存友好布局测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "plan.md").write_text("# ${name} 计划\n\n生成时间: ${time}\n\n正文 ${name}\n", encoding='utf-8')
+        (self.temp_dir / "static.md").write_text("# 静态\n", encoding='utf-8')
+        clear_fragment_cache()
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+        clear_fragment_cache()
+    
+    def test_values_moved_after_marker(self):
+        """测试槽位替换为占位符，取值按首次出现的顺序放在标记之后"""
+        content = render_cache_layout("plan.md", {"name": "demo", "time": "2024-01-01"}, self.temp_dir)
+        prefix, project = split_prefix(content)
+        
+        self.assertEqual(prefix, "# {name} 计划\n\n生成时间: {time}\n\n正文 {name}\n\n")
+        self.assertTrue(project.startswith(PROJECT_CONTENT_MARKER))
+        self.assertTrue(project.endswith("- name: demo\n- time: 2024-01-01\n"))
+    
+    def test_static_template_unchanged(self):
+        """测试没有槽位的模板原样返回，整个内容都是前缀"""
+        content = render_cache_layout("static.md", None, self.temp_dir)
+        self.assertEqual(split_prefix(content), ("# 静态\n", ""))
+    
+    def test_missing_value(self):
+        """测试缺少槽位值时报错"""
+        with self.assertRaises(ValueError):
+            render_cache_layout("plan.md", {"name": "demo"}, self.temp_dir)
+
+
+class TestPrefixStability(unittest.TestCase):
+    """前缀稳定性检查测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.base = {
+            'project_name': 'cache-demo',
+            'package_name': 'com.example.cache',
+            'version': '1.0.0',
+            'description': '缓存布局测试',
+            'jdk_version': '17',
+            'build_tool': 'Maven',
+            'spring_boot_version': '3.2.0',
+            'database': 'MySQL',
+            'orm_framework': 'MyBatis',
+            'cache': 'Redis',
+            'message_queue': 'RabbitMQ',
+            'include_swagger': True,
+            'include_security': False,
+            'include_actuator': True,
+            'generate_sample_code': True,
+            'generate_tests': False,
+            'generate_docker': True,
+            'generate_readme': True,
+            'is_multi_module': False,
+            'modules': []
+        }
+    
+    def test_config_matrix(self):
+        """测试配置矩阵逐项替换配置，并包含多模块和全部替换的组合"""
+        matrix = build_config_matrix(self.base)
+        
+        self.assertEqual(matrix[0], self.base)
+        self.assertTrue(any(config['build_tool'] == 'Gradle' for config in matrix))
+        self.assertTrue(any(config['include_security'] for config in matrix))
+        self.assertTrue(any(config['is_multi_module'] and config['modules'] for config in matrix))
+        combined = matrix[-1]
+        self.assertTrue(all(combined[key] != self.base[key] for key in self.base if key != 'modules'))
+        self.assertFalse(self.base['modules'])
+    
+    def test_prefix_stable_across_matrix(self):
+        """测试缓存友好布局下各产物（含合并文件）的前缀在配置矩阵上逐字节一致"""
+        generator = ContextGenerator(verbose=False, create_dirs=False, cache_layout=True, bundle=True)
+        report = check_prefix_stability(build_config_matrix(self.base), generator)
+        
+        self.assertTrue(report.stable, report.describe())
+        self.assertIn('execution_plan.md', report.prefix_sizes)
+        self.assertIn('context_bundle.md', report.prefix_sizes)
+        for name, size in report.prefix_sizes.items():
+            with self.subTest(artifact=name):
+                self.assertGreater(size, report.total_sizes[name] // 2)
+    
+    def test_prefix_stable_with_compact_bundle(self):
+        """测试精简模式、合并文件和缓存友好布局同时开启时共享文件和合并文件的前缀一致"""
+        generator = ContextGenerator(verbose=False, create_dirs=False, compact=True, cache_layout=True, bundle=True)
+        report = check_prefix_stability(build_config_matrix(self.base), generator)
+        
+        self.assertTrue(report.stable, report.describe())
+        self.assertIn('shared_context.md', report.prefix_sizes)
+        self.assertIn('context_bundle.md', report.prefix_sizes)
+        shared = split_prefix(generator.generate_in_memory(self.base).read_text('shared_context.md'))
+        self.assertNotIn('cache-demo', shared[0])
+        self.assertIn('cache-demo', shared[1])
+    
+    def test_generated_at_after_prefix(self):
+        """测试执行计划的生成时间和项目配置都在标记之后"""
+        generator = ContextGenerator(verbose=False, create_dirs=False, cache_layout=True)
+        tree = generator.generate_in_memory(self.base)
+        for name in ('execution_plan.md', 'system_prompt.md', 'project_structure.md'):
+            with self.subTest(artifact=name):
+                prefix, project = split_prefix(tree.read_text(name))
+                self.assertNotIn('cache-demo', prefix)
+                self.assertIn('cache-demo', project)
+        self.assertIn('generated_at: ', split_prefix(tree.read_text('execution_plan.md'))[1])
+    
+    def test_token_budget_keeps_project_section(self):
+        """测试按token预算裁剪时项目专属内容原样保留，前缀在配置矩阵上仍然一致"""
+        plain = ContextGenerator(verbose=False, create_dirs=False, cache_layout=True).generate_in_memory(self.base)
+        generator = ContextGenerator(verbose=False, create_dirs=False, cache_layout=True, token_budget=300)
+        tree = generator.generate_in_memory(self.base)
+        report = check_prefix_stability(build_config_matrix(self.base)[:4], generator)
+        
+        for name in ('system_prompt.md', 'execution_plan.md', 'project_generator.claude', 'project_generator.gemini'):
+            with self.subTest(artifact=name):
+                project = split_prefix(tree.read_text(name))[1]
+                self.assertEqual(project, split_prefix(plain.read_text(name))[1])
+                self.assertIn('cache-demo', project)
+        for artifact in generator.last_compact_result.artifacts:
+            self.assertNotIn('项目专属取值', artifact.trimmed)
+        self.assertTrue(report.stable, report.describe())
+    
+    def test_default_layout_is_unstable(self):
+        """测试默认布局的前缀随配置变化，检查能发现不一致的产物"""
+        
+        class DefaultLayoutGenerator:
+            cache_layout = True
+            
+            def __init__(self):
+                self.generator = ContextGenerator(verbose=False, create_dirs=False)
+            
+            def generate_in_memory(self, config):
+                return self.generator.generate_in_memory(config)
+        
+        report = check_prefix_stability(build_config_matrix(self.base)[:2], DefaultLayoutGenerator())
+        self.assertFalse(report.stable)
+        self.assertEqual(report.unstable['project_structure.md'], 1)
+        self.assertIn('前缀不一致', report.describe())
+    
+    def test_invalid_arguments(self):
+        """测试空配置列表和未启用缓存友好布局的生成器"""
+        with self.assertRaises(ValueError):
+            check_prefix_stability([])
+        with self.assertRaises(ValueError):
+            check_prefix_stability([self.base], ContextGenerator(verbose=False, create_dirs=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
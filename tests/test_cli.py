@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 命令行入口测试
+"""
+
+import unittest
+import io
+import json
+import subprocess
+import tempfile
+import shutil
+from contextlib import redirect_stdout, redirect_stderr
+from unittest.mock import patch
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import main
+
+
+class TestHeadlessGenerate(unittest.TestCase):
+    """无交互生成命令测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = Path(self.temp_dir) / "config.json"
+        self.output_dir = Path(self.temp_dir) / "out"
+        self.config = {
+            'project_name': 'headless-demo',
+            'package_name': 'com.example.demo',
+            'version': '1.0.0',
+            'description': 'Headless demo',
+            'jdk_version': '17',
+            'build_tool': 'Maven',
+            'spring_boot_version': '3.2.0',
+            'database': 'MySQL',
+            'orm_framework': 'MyBatis',
+            'cache': 'Redis',
+            'message_queue': '无消息队列',
+            'include_swagger': True,
+            'include_security': False,
+            'include_actuator': True,
+            'generate_sample_code': True,
+            'generate_tests': True,
+            'generate_docker': True,
+            'generate_readme': True,
+            'is_multi_module': False,
+            'modules': []
+        }
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def run_main(self, config, *extra_args):
+        """运行 generate 命令，返回 (退出码, 标准输出)"""
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False)
+        
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with patch.object(main, 'setup_logging'), redirect_stdout(stdout), redirect_stderr(stderr):
+            with self.assertRaises(SystemExit) as context:
+                main.main(['generate', '--config', str(self.config_file), '--out', str(self.output_dir),
+                           *extra_args])
+        return context.exception.code, stdout.getvalue()
+    
+    def test_generate_prints_only_output_path(self):
+        """测试生成成功时标准输出只有项目路径"""
+        code, stdout = self.run_main(self.config)
+        
+        self.assertEqual(code, 0)
+        self.assertEqual(stdout.strip(), str(self.output_dir / 'headless-demo'))
+        self.assertTrue((self.output_dir / 'headless-demo' / 'config.json').exists())
+    
+    def test_invalid_config_fails(self):
+        """测试配置无效时返回非零退出码且不生成"""
+        code, stdout = self.run_main(dict(self.config, package_name='Invalid Package'))
+        
+        self.assertEqual(code, 1)
+        self.assertEqual(stdout, '')
+        self.assertFalse((self.output_dir / 'headless-demo').exists())
+    
+    @patch('scripts.core.context_generator.console.print')
+    def test_token_threshold_exceeded_fails(self, mock_print):
+        """测试token总数超过阈值时返回非零退出码，产物照常写入"""
+        code, stdout = self.run_main(self.config, '--max-tokens', '100')
+        
+        self.assertEqual(code, 1)
+        self.assertTrue((self.output_dir / 'headless-demo' / 'token_stats.json').exists())
+    
+    @patch('main.console.print')
+    def test_other_value_error_not_reported_as_threshold(self, mock_print):
+        """测试其他 ValueError 不按超出token阈值处理"""
+        with patch('scripts.core.context_generator.ContextGenerator.generate',
+                   side_effect=ValueError("缺少片段插槽")):
+            with patch.object(main, 'print_token_report') as mock_report:
+                code, stdout = self.run_main(self.config, '--max-tokens', '100')
+        
+        self.assertEqual(code, 1)
+        mock_report.assert_not_called()
+        self.assertIn('未知错误: 缺少片段插槽', str(mock_print.call_args_list))
+    
+    def test_import_is_lazy(self):
+        """测试导入入口模块时不加载 rich 和 jinja2"""
+        code = "import sys, main; print(any(m.split('.')[0] in ('rich', 'jinja2') for m in sys.modules))"
+        result = subprocess.run([sys.executable, '-c', code], cwd=str(project_root),
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 上下文合并测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.context_bundle import build_bundle, BUNDLE_SECTIONS
+
+
+class TestContextBundle(unittest.TestCase):
+    """上下文合并测试类"""
+    
+    def test_sections_in_fixed_order(self):
+        """测试按固定顺序合并，与传入顺序无关，缺少的来源跳过"""
+        bundle = build_bundle({
+            "project_structure.md": "# 结构\n",
+            "config.json": '{"a": 1}',
+            "system_prompt.md": "# 系统\n"
+        }, "demo")
+        
+        self.assertTrue(bundle.startswith("# demo 上下文合并文件\n"))
+        self.assertIn("1. [项目配置](#config) - config.json\n", bundle)
+        self.assertIn("```json\n{\"a\": 1}\n```", bundle)
+        self.assertLess(bundle.index('<a id="system-prompt"></a>'), bundle.index('<a id="project-structure"></a>'))
+        self.assertIn("## 3. 项目结构说明（project_structure.md）\n\n# 结构\n", bundle)
+        self.assertNotIn("user-prompt", bundle)
+    
+    def test_shared_references_point_inside_bundle(self):
+        """测试共享说明的引用改为合并文件内的锚点"""
+        bundle = build_bundle({
+            "shared_context.md": '<a id="project-location"></a>\n## 项目创建位置\n',
+            "user_prompt.md": "> 📎 见 项目创建位置（shared_context.md#project-location）\n"
+        }, "demo")
+        self.assertIn("（#project-location）", bundle)
+        self.assertNotIn("shared_context.md#", bundle)
+    
+    def test_anchors_unique(self):
+        """测试章节锚点不重复"""
+        anchors = [section.anchor for section in BUNDLE_SECTIONS]
+        self.assertEqual(len(anchors), len(set(anchors)))
+    
+    def test_no_sources(self):
+        """测试没有来源文件时报错"""
+        with self.assertRaises(ValueError):
+            build_bundle({"README.md": "x"}, "demo")
+
+
+if __name__ == '__main__':
+    unittest.main()
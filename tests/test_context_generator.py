@@ -7,6 +7,7 @@
 import unittest
 import json
 import tempfile
+import threading
 import shutil
 from unittest.mock import patch, MagicMock
 from pathlib import Path
@@ -16,7 +17,8 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from scripts.core.context_generator import ContextGenerator
+from scripts.core.context_generator import ContextGenerator, ARTIFACT_DEPENDENCIES, TokenThresholdExceeded
+from scripts.utils.token_counter import estimate_tokens
 
 
 class TestContextGenerator(unittest.TestCase):
@@ -177,6 +179,231 @@ class TestContextGenerator(unittest.TestCase):
             file_path = output_dir / file_name
             self.assertTrue(file_path.exists(), f"文件 {file_name} 应该存在")
             self.assertTrue(file_path.stat().st_size > 0, f"文件 {file_name} 不应该为空")
+    
+    @patch('scripts.core.context_generator.console.print')
+    def test_generate_in_memory(self, mock_print):
+        """测试在内存中生成上下文工程"""
+        tree = self.generator.generate_in_memory(self.test_config)
+        
+        self.assertEqual(len(tree), 9)
+        self.assertEqual(json.loads(tree.read_text('config.json')), self.test_config)
+        self.assertFalse((self.generator.output_base_dir / 'test-project').exists())
+    
+    @patch('scripts.core.context_generator.console.print')
+    def test_regenerate_is_incremental(self, mock_print):
+        """测试重新生成时跳过内容未变化的文件"""
+        self.generator.generate(self.test_config)
+        first = self.generator.last_summary
+        self.assertEqual(len(first.added), 9)
+        
+        self.generator.generate(self.test_config)
+        self.assertIn('config.json', self.generator.last_summary.unchanged)
+        self.assertIn('user_prompt.md', self.generator.last_summary.unchanged)
+        
+        changed_config = dict(self.test_config, include_security=True)
+        self.generator.generate(changed_config)
+        self.assertIn('config.json', self.generator.last_summary.changed)
+
+    
+    @patch('scripts.core.context_generator.console.print')
+    def test_render_memo_reuses_artifacts(self, mock_print):
+        """测试重复生成时复用渲染结果，只重新渲染依赖变化的产物"""
+        first = self.generator.generate_in_memory(self.test_config)
+        stats = self.generator.get_render_stats()
+        self.assertEqual(stats['misses'], 7)
+        self.assertEqual(stats['hits'], 0)
+        
+        second = self.generator.generate_in_memory(self.test_config)
+        self.assertEqual(self.generator.get_render_stats()['hits'], 7)
+        self.assertEqual(first.read_text('user_prompt.md'), second.read_text('user_prompt.md'))
+        
+        # include_security 只影响 system_prompt.md 和 README.md
+        changed_config = dict(self.test_config, include_security=not self.test_config.get('include_security'))
+        self.generator.generate_in_memory(changed_config)
+        stats = self.generator.get_render_stats()
+        self.assertEqual(stats['misses'], 9)
+        self.assertEqual(stats['hits'], 12)
+    
+    def test_dry_run_does_not_create_directories(self):
+        """测试预演生成返回每个产物的字节数，且不创建输出目录"""
+        output_base_dir = Path(self.temp_dir) / "dry-run-output"
+        generator = ContextGenerator(output_base_dir=output_base_dir, verbose=False, create_dirs=False)
+        
+        plan = generator.dry_run(self.test_config)
+        tree = generator.generate_in_memory(self.test_config)
+        
+        self.assertEqual(sorted(item.path for item in plan.files), tree.list_files())
+        sizes = {item.path: item.size for item in plan.files}
+        self.assertEqual(sizes['user_prompt.md'], len(tree.read_text('user_prompt.md').encode('utf-8')))
+        self.assertEqual(plan.total_bytes, sum(sizes.values()))
+        self.assertFalse(output_base_dir.exists())
+    
+    def test_compact_mode_writes_shared_context(self):
+        """测试精简模式写入共享说明文件并报告精简前后的token数"""
+        generator = ContextGenerator(output_base_dir=self.temp_dir, verbose=False, token_budget=1500)
+        self.assertTrue(generator.compact)
+        
+        tree = generator.generate_in_memory(self.test_config)
+        result = generator.last_compact_result
+        
+        self.assertIn('shared_context.md', tree.list_files())
+        self.assertIn('shared_context.md#project-location', tree.read_text('project_generator.gemini'))
+        self.assertEqual(tree.read_text('shared_context.md'), result.shared_content)
+        for item in result.artifacts:
+            with self.subTest(artifact=item.name):
+                self.assertEqual(tree.read_text(item.name), result.contents[item.name])
+                self.assertLessEqual(item.tokens_after, item.tokens_before)
+                self.assertFalse(item.over_budget)
+        self.assertLess(result.tokens_after, result.tokens_before)
+        
+        # 关闭精简模式后共享说明文件不再生成
+        plain = ContextGenerator(output_base_dir=self.temp_dir, verbose=False).generate_in_memory(self.test_config)
+        self.assertNotIn('shared_context.md', plain.list_files())
+    
+    def test_token_stats_written(self):
+        """测试写入各产物的token数统计"""
+        tree = self.generator.generate_in_memory(self.test_config)
+        stats = json.loads(tree.read_text('token_stats.json'))
+        
+        self.assertEqual(stats, self.generator.last_token_stats)
+        self.assertNotIn('config.json', stats['files'])
+        self.assertNotIn('token_stats.json', stats['files'])
+        self.assertEqual(stats['files']['user_prompt.md'], estimate_tokens(tree.read_text('user_prompt.md')))
+        self.assertEqual(stats['total'], sum(stats['files'].values()))
+        self.assertIsNone(stats['threshold'])
+    
+    @patch('scripts.core.context_generator.console.print')
+    def test_token_stats_concurrent_generates(self, mock_print):
+        """测试同一实例并发生成不同项目时，各项目的token统计互不影响"""
+        configs = [
+            dict(self.test_config, project_name=f'token-{index}', description='描述' * (index * 50))
+            for index in range(8)
+        ]
+        expected = {
+            config['project_name']: self.generator.generate_in_memory(config).read_text('token_stats.json')
+            for config in configs
+        }
+        
+        errors = []
+        
+        def run(config):
+            try:
+                for _ in range(5):
+                    self.generator.generate(config)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=run, args=(config,)) for config in configs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        for name, stats in expected.items():
+            with self.subTest(project=name):
+                stats_file = self.generator.output_base_dir / name / 'token_stats.json'
+                self.assertEqual(stats_file.read_text(encoding='utf-8'), stats)
+    
+    @patch('scripts.core.context_generator.console.print')
+    def test_token_threshold_exceeded(self, mock_print):
+        """测试token总数超过阈值时生成失败，但产物和统计文件照常写入"""
+        generator = ContextGenerator(output_base_dir=self.temp_dir, verbose=False, token_threshold=100)
+        with self.assertRaises(TokenThresholdExceeded) as ctx:
+            generator.generate(self.test_config)
+        
+        self.assertIn('超过阈值 100', str(ctx.exception))
+        stats_file = Path(self.temp_dir) / 'test-project' / 'token_stats.json'
+        self.assertEqual(json.loads(stats_file.read_text(encoding='utf-8'))['threshold'], 100)
+        
+        # 阈值足够大时正常生成
+        generator = ContextGenerator(output_base_dir=self.temp_dir, verbose=False, token_threshold=10 ** 6)
+        self.assertTrue(generator.generate(self.test_config).endswith('test-project'))
+    
+    def test_bundle_mode(self):
+        """测试合并模式按顺序合并上下文文件，斜杠命令只引用合并文件"""
+        generator = ContextGenerator(output_base_dir=self.temp_dir, verbose=False, bundle=True)
+        tree = generator.generate_in_memory(self.test_config)
+        bundle = tree.read_text('context_bundle.md')
+        
+        anchors = ['config', 'system-prompt', 'user-prompt', 'execution-plan', 'project-structure']
+        positions = [bundle.index(f'<a id="{anchor}"></a>') for anchor in anchors]
+        self.assertEqual(positions, sorted(positions))
+        self.assertIn(tree.read_text('system_prompt.md').strip(), bundle)
+        self.assertIn(tree.read_text('project_structure.md').strip(), bundle)
+        self.assertNotIn('shared-context', bundle)
+        
+        for name in ('project_generator.claude', 'project_generator.gemini'):
+            with self.subTest(commands=name):
+                commands = tree.read_text(name)
+                self.assertIn('context_bundle.md', commands)
+                self.assertNotIn('system_prompt.md', commands)
+                self.assertIn('test-project/src/main/java', commands)
+        
+        # 共用渲染缓存时，关闭合并模式后斜杠命令恢复为原内容
+        generator.bundle = False
+        plain = generator.generate_in_memory(self.test_config)
+        self.assertNotIn('context_bundle.md', plain.list_files())
+        self.assertIn('system_prompt.md', plain.read_text('project_generator.claude'))
+    
+    def test_bundle_with_compact_mode(self):
+        """测试精简模式下共享说明一并合并，引用改为合并文件内的锚点"""
+        generator = ContextGenerator(output_base_dir=self.temp_dir, verbose=False, bundle=True, compact=True)
+        bundle = generator.generate_in_memory(self.test_config).read_text('context_bundle.md')
+        
+        self.assertLess(bundle.index('<a id="shared-context"></a>'), bundle.index('<a id="system-prompt"></a>'))
+        self.assertIn('<a id="project-location"></a>', bundle)
+        self.assertIn('（#project-location）', bundle)
+        self.assertNotIn('shared_context.md#', bundle)
+    
+    def test_bundle_concurrent_generates(self):
+        """测试同一实例并发生成时，合并文件只包含本项目的产物"""
+        generator = ContextGenerator(output_base_dir=self.temp_dir, verbose=False, bundle=True)
+        names = [f'bundle-{index}' for index in range(8)]
+        errors = []
+        
+        def run(name):
+            try:
+                for _ in range(5):
+                    generator.generate(dict(self.test_config, project_name=name))
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=run, args=(name,)) for name in names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        for name in names:
+            with self.subTest(project=name):
+                bundle = (Path(self.temp_dir) / name / 'context_bundle.md').read_text(encoding='utf-8')
+                others = [other for other in names if other != name and f'"project_name": "{other}"' in bundle]
+                self.assertEqual(others, [])
+                self.assertIn(f'"project_name": "{name}"', bundle)
+                self.assertEqual(bundle.count('<a id="config"></a>'), 1)
+    
+    def test_artifact_dependencies_are_complete(self):
+        """测试产物依赖表覆盖构建方法读取的全部配置键"""
+        builders = {
+            'project_generator.gemini': self.generator._build_gemini_commands,
+            'project_generator.claude': self.generator._build_claude_commands,
+            'execution_plan.md': lambda config: self.generator._build_execution_plan(config, generated_at='-'),
+            'project_structure.md': self.generator._build_project_structure,
+            'README.md': lambda config: self.generator._build_readme(config, generated_at='-')
+        }
+        
+        for artifact_name, builder in builders.items():
+            with self.subTest(artifact=artifact_name):
+                keys = ARTIFACT_DEPENDENCIES[artifact_name]
+                expected = builder(self.test_config)
+                # 修改依赖之外的配置键不应影响输出
+                mutated = {
+                    key: (value if key in keys else 'mutated-value')
+                    for key, value in self.test_config.items()
+                }
+                self.assertEqual(builder(mutated), expected)
 
 
 class TestContextGeneratorTemplateEngine(unittest.TestCase):
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 预演输出计划测试
+"""
+
+import json
+import time
+import unittest
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.dry_run import DryRunPlan, summarize_plans
+from scripts.core.output_writer import STATUS_ADDED
+
+
+class TestDryRunPlan(unittest.TestCase):
+    """预演输出计划测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.plan = DryRunPlan("demo")
+    
+    def test_records_paths_and_sizes(self):
+        """测试记录路径和UTF-8字节数"""
+        self.assertEqual(self.plan.write_text("a/b.txt", "中文"), STATUS_ADDED)
+        self.plan.write_bytes("c.bin", b"\x00\x01")
+        self.plan.make_dirs(["a", "d/e"])
+        
+        self.assertEqual([item.path for item in self.plan.files], ["a/b.txt", "c.bin"])
+        self.assertEqual(self.plan.total_bytes, 8)
+        self.assertEqual(self.plan.list_directories(), ["a", "d", "d/e"])
+        self.assertEqual(self.plan.finalize().added, ["a/b.txt", "c.bin"])
+    
+    def test_render_time_since_previous_write(self):
+        """测试每个文件的耗时为上一次写入到本次写入之间的时间"""
+        self.plan.write_text("fast.txt", "x")
+        time.sleep(0.02)
+        self.plan.write_text("slow.txt", "y")
+        
+        timings = {item.path: item.render_seconds for item in self.plan.files}
+        self.assertGreaterEqual(timings["slow.txt"], 0.02)
+        self.assertLess(timings["fast.txt"], timings["slow.txt"])
+    
+    def test_to_dict_and_summary(self):
+        """测试序列化和多项目汇总"""
+        self.plan.write_text("README.md", "abc")
+        self.plan.finalize()
+        other = DryRunPlan("other")
+        other.write_text("x/y.md", "de")
+        other.finalize()
+        
+        data = json.loads(json.dumps(self.plan.to_dict()))
+        self.assertEqual(data["project"], "demo")
+        self.assertEqual(data["files"][0]["size"], 3)
+        
+        summary = summarize_plans([self.plan, other])
+        self.assertEqual(summary["projects"], 2)
+        self.assertEqual(summary["files"], 2)
+        self.assertEqual(summary["directories"], 1)
+        self.assertEqual(summary["total_bytes"], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
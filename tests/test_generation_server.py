@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 常驻生成服务测试
+"""
+
+import unittest
+import io
+import os
+import socket
+import tarfile
+import tempfile
+import shutil
+import threading
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.generation_server import GenerationService, create_server, is_loopback_host
+from scripts.core.generation_client import GenerationClient
+from scripts.core.template_manager import TemplateManager
+
+
+def make_context_config(project_name='served-demo', **overrides):
+    """构造测试用上下文工程配置"""
+    config = {
+        'project_name': project_name,
+        'package_name': 'com.example.demo',
+        'version': '1.0.0',
+        'description': 'Served demo',
+        'jdk_version': '17',
+        'build_tool': 'Maven',
+        'spring_boot_version': '3.2.0',
+        'database': 'MySQL',
+        'orm_framework': 'MyBatis',
+        'cache': 'Redis',
+        'message_queue': '无消息队列',
+        'include_swagger': True,
+        'include_security': False,
+        'include_actuator': True,
+        'generate_sample_code': True,
+        'generate_tests': True,
+        'generate_docker': True,
+        'generate_readme': True,
+        'is_multi_module': False,
+        'modules': []
+    }
+    config.update(overrides)
+    return config
+
+
+class TestGenerationServer(unittest.TestCase):
+    """常驻生成服务测试类"""
+    
+    def setUp(self):
+        """测试初始化：在后台线程中启动服务（端口自动分配）"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = Path(self.temp_dir) / "output"
+        self.service = GenerationService(
+            output_base_dir=str(self.output_dir),
+            template_manager=TemplateManager(str(Path(self.temp_dir) / "templates"))
+        )
+        self.service.warm_up()
+        self.server = self.start_server(port=0)
+        host, port = self.server.server_address
+        self.client = GenerationClient(server_url=f"http://{host}:{port}")
+    
+    def tearDown(self):
+        """测试清理"""
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir)
+    
+    def start_server(self, **kwargs):
+        server = create_server(self.service, **kwargs)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return server
+    
+    def test_generate_to_disk(self):
+        """测试生成到磁盘并返回输出路径，重复请求复用常驻生成器"""
+        output_path = self.client.generate(make_context_config())
+        self.assertEqual(Path(output_path), self.output_dir / 'served-demo')
+        self.assertTrue((Path(output_path) / 'system_prompt.md').exists())
+        
+        self.client.generate(make_context_config())
+        status = self.client.health()
+        self.assertEqual(status['requests'], 2)
+        self.assertEqual(status['render_stats'][0]['hits'], 7)
+    
+    def test_archive(self):
+        """测试在内存中生成并返回tar.gz归档"""
+        data = self.client.archive(make_context_config('archived-demo'))
+        
+        with tarfile.open(fileobj=io.BytesIO(data), mode='r:gz') as tar:
+            names = tar.getnames()
+        self.assertIn('archived-demo/config.json', names)
+        self.assertFalse((self.output_dir / 'archived-demo').exists())
+    
+    def test_invalid_config_is_rejected(self):
+        """测试配置无效时返回400并在客户端抛出 ValueError"""
+        with self.assertRaises(ValueError):
+            self.client.generate(make_context_config(package_name='Invalid Package'))
+        self.assertEqual(self.client.health()['failures'], 1)
+    
+    def test_services_share_project_environment(self):
+        """测试服务的项目生成器使用共享环境：模板相同的两个服务共用同一个 Environment"""
+        other = GenerationService(
+            output_base_dir=str(self.output_dir),
+            template_manager=TemplateManager(str(Path(self.temp_dir) / "templates"))
+        )
+        first = self.service._project_generator.jinja_env
+        second = other._project_generator.jinja_env
+        self.assertIs(first, second)
+        self.assertIs(first.get_template("README.md.j2"), second.get_template("README.md.j2"))
+    
+    def test_output_dir_outside_root_is_rejected(self):
+        """测试输出目录超出服务的输出根目录时返回400，根目录内的子目录可用"""
+        outside = Path(self.temp_dir) / 'elsewhere'
+        with self.assertRaises(ValueError):
+            self.client.generate(make_context_config(), output_base_dir=str(outside))
+        with self.assertRaises(ValueError):
+            self.client.generate(make_context_config(), output_base_dir=str(self.output_dir / '..' / 'elsewhere'))
+        with self.assertRaises(ValueError):
+            self.service.generate('project', {'name': 'demo', 'output_dir': str(outside)})
+        self.assertFalse(outside.exists())
+        
+        output_path = self.client.generate(make_context_config(), output_base_dir=str(self.output_dir / 'team'))
+        self.assertEqual(Path(output_path), self.output_dir / 'team' / 'served-demo')
+    
+    def test_concurrent_generates(self):
+        """测试同一生成器上的并发请求各自得到完整的产物"""
+        names = [f'concurrent-{index}' for index in range(6)]
+        errors = []
+        
+        def worker(name):
+            try:
+                self.service.generate('context', make_context_config(name))
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(name,)) for name in names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        for name in names:
+            self.assertIn(name, (self.output_dir / name / 'config.json').read_text(encoding='utf-8'))
+            self.assertTrue((self.output_dir / name / 'token_stats.json').exists())
+    
+    def test_non_loopback_host_is_rejected(self):
+        """测试默认拒绝监听非回环地址"""
+        self.assertTrue(is_loopback_host('127.0.0.1'))
+        self.assertTrue(is_loopback_host('localhost'))
+        self.assertFalse(is_loopback_host('0.0.0.0'))
+        self.assertFalse(is_loopback_host(''))
+        with self.assertRaises(ValueError):
+            create_server(self.service, host='0.0.0.0', port=0)
+    
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "当前平台不支持Unix套接字")
+    def test_unix_socket(self):
+        """测试通过Unix套接字发送请求，关闭后删除套接字文件"""
+        socket_path = os.path.join(self.temp_dir, 'gen.sock')
+        server = self.start_server(socket_path=socket_path)
+        try:
+            client = GenerationClient(socket_path=socket_path)
+            output_path = client.generate(make_context_config('socket-demo'))
+            self.assertTrue((Path(output_path) / 'README.md').exists())
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertFalse(os.path.exists(socket_path))
+    
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "当前平台不支持Unix套接字")
+    def test_unix_socket_path_protected(self):
+        """测试套接字路径为普通文件或已有服务监听时拒绝启动，残留的套接字文件被替换"""
+        regular_file = os.path.join(self.temp_dir, 'notes.txt')
+        Path(regular_file).write_text('keep', encoding='utf-8')
+        with self.assertRaises(ValueError):
+            create_server(self.service, socket_path=regular_file)
+        self.assertEqual(Path(regular_file).read_text(encoding='utf-8'), 'keep')
+        
+        socket_path = os.path.join(self.temp_dir, 'gen.sock')
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+        server = self.start_server(socket_path=socket_path)
+        try:
+            with self.assertRaises(ValueError):
+                create_server(self.service, socket_path=socket_path)
+            self.assertEqual(GenerationClient(socket_path=socket_path).health()['status'], 'ok')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
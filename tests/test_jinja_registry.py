@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - Jinja2环境注册表测试
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from jinja2 import Environment, DictLoader
+
+from scripts.core.jinja_registry import EnvironmentRegistry, register_filters, TEMPLATE_FILTERS
+from scripts.core.context_generator import ContextGenerator
+from scripts.core.project_generator import ProjectGenerator
+from scripts.core.template_manager import TemplateManager
+
+
+class TestEnvironmentRegistry(unittest.TestCase):
+    """环境注册表测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.registry = EnvironmentRegistry(max_entries=2)
+        self.created = 0
+    
+    def _factory(self):
+        self.created += 1
+        return Environment(loader=DictLoader({"a.j2": "{{ name|pascal_case }}"}))
+    
+    def test_same_key_shares_environment(self):
+        """测试相同键返回同一个环境并注册过滤器"""
+        first = self.registry.get_or_create(("a",), self._factory)
+        second = self.registry.get_or_create(("a",), self._factory)
+        
+        self.assertIs(first, second)
+        self.assertEqual(self.created, 1)
+        self.assertEqual(first.get_template("a.j2").render(name="user_order"), "UserOrder")
+        self.assertEqual(self.registry.get_stats()["hits"], 1)
+    
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的环境"""
+        env_a = self.registry.get_or_create("a", self._factory)
+        self.registry.get_or_create("b", self._factory)
+        self.registry.get_or_create("a", self._factory)
+        self.registry.get_or_create("c", self._factory)
+        
+        stats = self.registry.get_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["size"], 2)
+        self.assertIs(self.registry.get_or_create("a", self._factory), env_a)
+        self.registry.get_or_create("b", self._factory)
+        self.assertEqual(self.created, 4)
+    
+    def test_register_filters(self):
+        """测试过滤器注册"""
+        env = Environment()
+        register_filters(env)
+        for name in TEMPLATE_FILTERS:
+            self.assertIn(name, env.filters)
+        self.assertEqual(env.filters["snake_case"]("UserOrder"), "user_order")
+        self.assertEqual(env.filters["package_to_path"]("com.example"), "com/example")
+
+
+class TestGeneratorsShareEnvironment(unittest.TestCase):
+    """生成器共享环境测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.template_manager = TemplateManager(str(self.temp_dir / "templates"))
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_context_generators_share_environment(self):
+        """测试上下文生成器实例共享同一个环境"""
+        first = ContextGenerator(output_base_dir=self.temp_dir / "output", verbose=False)
+        second = ContextGenerator(output_base_dir=self.temp_dir / "other", verbose=False)
+        
+        if first.jinja_env is None:
+            self.skipTest("Jinja2不可用")
+        self.assertIs(first.jinja_env, second.jinja_env)
+        self.assertIn("camel_case", first.jinja_env.filters)
+    
+    def test_project_generators_share_template_cache(self):
+        """测试项目生成器实例默认共享环境，复用已编译的模板"""
+        def new_generator():
+            return ProjectGenerator(template_manager=self.template_manager, use_bytecode_cache=False)
+        
+        first = new_generator()
+        second = new_generator()
+        
+        self.assertIs(first.jinja_env, second.jinja_env)
+        self.assertIs(first.jinja_env.get_template("README.md.j2"), second.jinja_env.get_template("README.md.j2"))
+    
+    def test_project_generators_private_on_opt_out(self):
+        """测试关闭共享后每个项目生成器实例使用独立环境"""
+        first = ProjectGenerator(template_manager=self.template_manager, use_bytecode_cache=False,
+                                 shared_environment=False)
+        second = ProjectGenerator(template_manager=self.template_manager, use_bytecode_cache=False,
+                                  shared_environment=False)
+        
+        self.assertIsNot(first.jinja_env, second.jinja_env)
+        self.assertIn("camel_case", first.jinja_env.filters)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 目录布局规划测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.layout_planner import expand_directories, plan_project_layout, STANDARD_DIRECTORIES
+
+
+class TestLayoutPlanner(unittest.TestCase):
+    """目录布局规划测试类"""
+    
+    def test_expand_parents_first(self):
+        """测试展开结果包含上级目录，去重且上级在前"""
+        directories = expand_directories(["a/b/c", "a/b", "./a/d", Path("a/b/c"), ""])
+        self.assertEqual(directories, ["a", "a/b", "a/b/c", "a/d"])
+    
+    def test_single_module_layout(self):
+        """测试单模块项目布局"""
+        directories = plan_project_layout()
+        self.assertEqual(len(directories), 9)
+        for base_dir in STANDARD_DIRECTORIES:
+            self.assertIn(base_dir, directories)
+    
+    def test_multi_module_layout(self):
+        """测试多模块项目布局，每个模块一套标准目录"""
+        directories = plan_project_layout(["demo-api", "demo-service"])
+        
+        self.assertEqual(len(directories), 9 + 2 * 10)
+        self.assertEqual(len(set(directories)), len(directories))
+        self.assertIn("demo-service/src/test/resources", directories)
+        
+        position = {path: i for i, path in enumerate(directories)}
+        for path in directories:
+            parent = path.rpartition("/")[0]
+            if parent:
+                self.assertLess(position[parent], position[path])
+    
+    def test_thousands_of_modules(self):
+        """测试数千个模块时目录数量与模块数成线性关系"""
+        modules = [f"module-{i}" for i in range(3000)]
+        self.assertEqual(len(plan_project_layout(modules)), 9 + 3000 * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 内存输出树测试
+"""
+
+import unittest
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.output_tree import MemoryOutputTree
+
+
+class UnseekableStream(io.RawIOBase):
+    """模拟标准输出等不可寻址的二进制流"""
+    
+    def __init__(self):
+        self.buffer = bytearray()
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self.buffer.extend(data)
+        return len(data)
+
+
+class TestMemoryOutputTree(unittest.TestCase):
+    """内存输出树测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.tree = MemoryOutputTree("demo")
+        self.tree.make_dirs(["src/main/resources/static"])
+        self.tree.write_text("README.md", "# 示例项目")
+        self.tree.write_text("src/main/java/App.java", "class App {}")
+    
+    def test_write_and_read(self):
+        """测试写入、读取和写入状态"""
+        self.assertEqual(self.tree.read_text("README.md"), "# 示例项目")
+        self.assertIn("src/main/java/App.java", self.tree)
+        self.assertEqual(self.tree.write_text("README.md", "# 示例项目"), "unchanged")
+        self.assertEqual(self.tree.write_text("./README.md", "# changed"), "changed")
+        self.assertEqual(len(self.tree), 2)
+        
+        with self.assertRaises(FileNotFoundError):
+            self.tree.read_text("missing.md")
+        with self.assertRaises(ValueError):
+            self.tree.write_text("../outside.md", "x")
+    
+    def test_list_directories_parents_first(self):
+        """测试目录列表包含上级目录且上级在前"""
+        directories = self.tree.list_directories()
+        self.assertIn("src/main/resources/static", directories)
+        self.assertIn("src/main/java", directories)
+        self.assertLess(directories.index("src"), directories.index("src/main"))
+    
+    def test_export_tar_gz_to_stream(self):
+        """测试导出tar.gz到不可寻址的流"""
+        stream = UnseekableStream()
+        self.tree.export(stream, "tar.gz")
+        
+        with tarfile.open(fileobj=io.BytesIO(bytes(stream.buffer)), mode="r:gz") as archive:
+            names = archive.getnames()
+            readme = archive.extractfile("demo/README.md").read().decode('utf-8')
+        
+        self.assertIn("demo/src/main/resources/static", names)
+        self.assertIn("demo/src/main/java/App.java", names)
+        self.assertEqual(readme, "# 示例项目")
+    
+    def test_export_zip_to_stream(self):
+        """测试导出zip到不可寻址的流"""
+        stream = UnseekableStream()
+        self.tree.export(stream, "zip")
+        
+        with zipfile.ZipFile(io.BytesIO(bytes(stream.buffer))) as archive:
+            names = archive.namelist()
+            self.assertEqual(archive.read("demo/src/main/java/App.java"), b"class App {}")
+        
+        self.assertIn("demo/src/main/resources/static/", names)
+    
+    def test_export_invalid_format(self):
+        """测试不支持的归档格式"""
+        with self.assertRaises(ValueError):
+            self.tree.export(io.BytesIO(), "rar")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 增量输出写入器测试
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.output_writer import OutputWriter, MANIFEST_FILE_NAME, hash_config, hash_text
+from scripts.core.blob_store import BlobStore
+
+
+class TestOutputWriter(unittest.TestCase):
+    """增量输出写入器测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = Path(self.temp_dir) / "project"
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def _generate(self, files, config=None):
+        writer = OutputWriter(self.root, config or {"name": "demo"})
+        for relative_path, content in files.items():
+            writer.write_text(relative_path, content, template_hash="t")
+        return writer.finalize()
+    
+    def test_first_run_adds_files(self):
+        """测试首次生成全部记为新增并写入清单"""
+        summary = self._generate({"README.md": "# demo", "src/App.java": "class App {}"})
+        
+        self.assertEqual(summary.counts(), {"added": 2, "changed": 0, "unchanged": 0, "removed": 0})
+        
+        with open(self.root / MANIFEST_FILE_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest["config_hash"], hash_config({"name": "demo"}))
+        self.assertEqual(sorted(manifest["files"]), ["README.md", "src/App.java"])
+        self.assertEqual(manifest["files"]["README.md"]["template_hash"], "t")
+        self.assertEqual(len(manifest["files"]["README.md"]["content_hash"]), 64)
+    
+    def test_unchanged_files_not_rewritten(self):
+        """测试内容未变化的文件不重写，mtime保持不变"""
+        self._generate({"README.md": "# demo", "pom.xml": "<project/>"})
+        readme = self.root / "README.md"
+        os.utime(readme, ns=(1000, 1000))
+        
+        summary = self._generate({"README.md": "# demo", "pom.xml": "<project>changed</project>"})
+        
+        self.assertEqual(summary.unchanged, ["README.md"])
+        self.assertEqual(summary.changed, ["pom.xml"])
+        self.assertEqual(readme.stat().st_mtime_ns, 1000)
+        self.assertEqual((self.root / "pom.xml").read_text(encoding='utf-8'), "<project>changed</project>")
+    
+    def test_external_modification_detected(self):
+        """测试清单之外被修改的文件会被重新写入"""
+        self._generate({"README.md": "# demo"})
+        (self.root / "README.md").write_text("# edit", encoding='utf-8')
+        
+        summary = self._generate({"README.md": "# demo"})
+        
+        self.assertEqual(summary.changed, ["README.md"])
+        self.assertEqual((self.root / "README.md").read_text(encoding='utf-8'), "# demo")
+    
+    def test_stale_files_removed(self):
+        """测试本次不再生成的文件被删除，非生成文件保留"""
+        self._generate({"README.md": "# demo", "Dockerfile": "FROM openjdk:17"})
+        (self.root / "notes.txt").write_text("user file", encoding='utf-8')
+        
+        summary = self._generate({"README.md": "# demo"})
+        
+        self.assertEqual(summary.removed, ["Dockerfile"])
+        self.assertFalse((self.root / "Dockerfile").exists())
+        self.assertTrue((self.root / "notes.txt").exists())
+    
+    def test_manifest_paths_outside_root_ignored(self):
+        """测试清单中指向输出目录之外的路径不会被删除"""
+        outside = Path(self.temp_dir) / "outside.txt"
+        outside.write_text("keep", encoding='utf-8')
+        self._generate({"README.md": "# demo"})
+        
+        manifest_path = self.root / MANIFEST_FILE_NAME
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        manifest["files"]["../outside.txt"] = {"content_hash": "x"}
+        manifest_path.write_text(json.dumps(manifest), encoding='utf-8')
+        
+        summary = self._generate({"README.md": "# demo"})
+        self.assertEqual(summary.removed, [])
+        self.assertTrue(outside.exists())
+
+    
+    def _stream(self, relative_path, chunks, blob_store=None):
+        writer = OutputWriter(self.root, {"name": "demo"}, blob_store=blob_store)
+        status = writer.write_stream(relative_path, chunks, template_hash="t")
+        writer.finalize()
+        return status
+    
+    def test_write_stream_matches_write_text(self):
+        """测试流式写入的内容和清单与一次性写入一致"""
+        chunks = ["# 标题\n", "", "正文" * 1000, b"\nend"]
+        content = "# 标题\n" + "正文" * 1000 + "\nend"
+        
+        self.assertEqual(self._stream("docs/README.md", chunks), "added")
+        
+        self.assertEqual((self.root / "docs/README.md").read_text(encoding='utf-8'), content)
+        manifest = json.loads((self.root / MANIFEST_FILE_NAME).read_text(encoding='utf-8'))
+        self.assertEqual(manifest["files"]["docs/README.md"]["content_hash"], hash_text(content))
+        self.assertEqual(list(self.root.glob("docs/*.tmp")), [])
+    
+    def test_write_stream_unchanged_not_rewritten(self):
+        """测试流式写入内容未变化时不写入任何数据"""
+        self._stream("README.md", ["abc", "def"])
+        readme = self.root / "README.md"
+        os.utime(readme, ns=(1000, 1000))
+        
+        self.assertEqual(self._stream("README.md", ["ab", "cdef"]), "unchanged")
+        self.assertEqual(readme.stat().st_mtime_ns, 1000)
+        self.assertEqual([p.name for p in self.root.iterdir() if p.name.endswith(".tmp")], [])
+    
+    def test_write_stream_changes(self):
+        """测试流式写入在中途不同、变短和变长时都正确替换文件"""
+        cases = [
+            (["abc", "def"], ["abc", "xyz"], "abcxyz"),
+            (["abc", "def"], ["abc"], "abc"),
+            (["abc"], ["abc", "def"], "abcdef"),
+        ]
+        for old, new, expected in cases:
+            with self.subTest(new=new):
+                self._stream("file.txt", old)
+                self.assertEqual(self._stream("file.txt", new), "changed")
+                self.assertEqual((self.root / "file.txt").read_text(encoding='utf-8'), expected)
+    
+    def test_write_stream_failure_keeps_old_file(self):
+        """测试渲染中途失败时旧文件保持不变且不残留临时文件"""
+        self._stream("file.txt", ["old content"])
+        
+        def failing_chunks():
+            yield "new"
+            raise RuntimeError("render failed")
+        
+        writer = OutputWriter(self.root, {"name": "demo"})
+        with self.assertRaises(RuntimeError):
+            writer.write_stream("file.txt", failing_chunks())
+        self.assertEqual((self.root / "file.txt").read_text(encoding='utf-8'), "old content")
+        self.assertEqual([p.name for p in self.root.iterdir() if p.name.endswith(".tmp")], [])
+    
+    def test_write_stream_with_blob_store(self):
+        """测试流式写入的文件硬链接到blob"""
+        store = BlobStore(self.temp_dir)
+        self._stream("README.md", ["shared ", "content"], blob_store=store)
+        
+        blob = store.blob_path(hash_text("shared content"))
+        self.assertTrue(blob.is_file())
+        self.assertTrue(os.path.samefile(blob, self.root / "README.md"))
+        self.assertEqual(blob.stat().st_nlink, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
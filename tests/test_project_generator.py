@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 项目生成器测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.project_generator import ProjectGenerator, RenderTask
+from scripts.core.template_manager import TemplateManager
+from scripts.core.output_writer import MANIFEST_FILE_NAME
+
+
+# 测试用的完整模板库：每个模板输出自己的名称和项目名称，便于校验
+TEMPLATE_NAMES = [
+    "pom.xml.j2", "module-pom.xml.j2", "Application.java.j2",
+    "controller/HelloController.java.j2", "entity/User.java.j2",
+    "repository/UserRepository.java.j2", "mapper/UserMapper.java.j2",
+    "mapper/UserMapper.xml.j2", "test/ApplicationTest.java.j2",
+    "application.yml.j2", "logback-spring.xml.j2", "README.md.j2",
+    ".gitignore.j2", "Dockerfile.j2", "docker-compose.yml.j2"
+]
+
+
+def make_template_library():
+    """构造测试用 spring-boot-templates.md 内容"""
+    blocks = ["# Spring Boot 模板库\n"]
+    for name in TEMPLATE_NAMES:
+        blocks.append(f"### {name}\n```jinja2\n{name}: {{{{ config.name }}}}{{% if module %}} {{{{ module.name }}}}{{% endif %}}\n```\n")
+    return "\n".join(blocks)
+
+
+def make_project_config(output_dir, **overrides):
+    """构造测试用项目配置"""
+    config = {
+        "name": "demo-project",
+        "package": "com.example.demo",
+        "version": "1.0.0",
+        "project_type": "single",
+        "tech_stack": {"database": "mysql", "orm": "jpa"},
+        "output_dir": output_dir,
+        "generate_sample_code": True,
+        "generate_tests": True,
+        "generate_docker": True
+    }
+    config.update(overrides)
+    return config
+
+
+class TestProjectGeneratorBytecodeCache(unittest.TestCase):
+    """项目生成器字节码缓存测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = str(Path(self.temp_dir) / "cache")
+        self.template_manager = TemplateManager(str(Path(self.temp_dir) / "templates"))
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def _new_generator(self):
+        # 每个实例独立创建环境，模拟新进程从磁盘缓存加载
+        return ProjectGenerator(template_manager=self.template_manager, bytecode_cache_dir=self.cache_dir,
+                                shared_environment=False)
+    
+    def test_warm_run_hits_cache(self):
+        """测试热启动时从磁盘缓存加载字节码"""
+        cold = self._new_generator()
+        cold.jinja_env.get_template("README.md.j2")
+        self.assertEqual(cold.get_cache_stats()["misses"], 1)
+        self.assertEqual(cold.get_cache_stats()["hits"], 0)
+        
+        warm = self._new_generator()
+        template = warm.jinja_env.get_template("README.md.j2")
+        self.assertEqual(warm.get_cache_stats()["hits"], 1)
+        self.assertEqual(warm.get_cache_stats()["misses"], 0)
+        self.assertIn("demo", template.render(config={"name": "demo"}))
+    
+    def test_changed_template_misses_cache(self):
+        """测试模板内容变化后不会命中旧缓存"""
+        self._new_generator().jinja_env.get_template("README.md.j2")
+        
+        generator = self._new_generator()
+        generator.jinja_env.loader.mapping["README.md.j2"] = "# {{ config.name }} changed"
+        template = generator.jinja_env.get_template("README.md.j2")
+        
+        self.assertEqual(generator.get_cache_stats()["misses"], 1)
+        self.assertEqual(template.render(config={"name": "demo"}), "# demo changed")
+    
+    def test_cache_disabled(self):
+        """测试禁用字节码缓存"""
+        generator = ProjectGenerator(template_manager=self.template_manager, use_bytecode_cache=False)
+        self.assertEqual(generator.get_cache_stats(), {"enabled": False})
+
+
+
+class TestProjectGeneratorRenderPlan(unittest.TestCase):
+    """项目生成器渲染计划测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = str(Path(self.temp_dir) / "output")
+        self.template_manager = TemplateManager(str(Path(self.temp_dir) / "templates"))
+        self.template_manager.save_template(make_template_library(), "spring-boot-templates")
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def _new_generator(self, max_workers=4):
+        return ProjectGenerator(template_manager=self.template_manager, use_bytecode_cache=False,
+                                max_workers=max_workers)
+    
+    def test_plan_single_module(self):
+        """测试单模块项目的渲染计划"""
+        project_path = Path(self.output_dir) / "demo-project"
+        plan = self._new_generator().build_render_plan(make_project_config(self.output_dir), project_path)
+        
+        self.assertTrue(all(isinstance(task, RenderTask) for task in plan))
+        relative = [str(task.output_path.relative_to(project_path)) for task in plan]
+        self.assertEqual(relative, [
+            "pom.xml",
+            "src/main/java/com/example/demo/Application.java",
+            "src/main/java/com/example/demo/controller/HelloController.java",
+            "src/main/java/com/example/demo/entity/User.java",
+            "src/main/java/com/example/demo/repository/UserRepository.java",
+            "src/test/java/com/example/demo/ApplicationTest.java",
+            "src/main/resources/application.yml",
+            "src/main/resources/logback-spring.xml",
+            "README.md",
+            ".gitignore",
+            "Dockerfile",
+            "docker-compose.yml"
+        ])
+    
+    def test_plan_multi_module(self):
+        """测试多模块项目为每个模块规划pom.xml"""
+        config = make_project_config(
+            self.output_dir,
+            project_type="multi",
+            modules=[{"name": "demo-api"}, {"name": "demo-service"}],
+            tech_stack={"database": "mysql", "orm": "mybatis"},
+            generate_docker=False
+        )
+        project_path = Path(self.output_dir) / "demo-project"
+        plan = self._new_generator().build_render_plan(config, project_path)
+        
+        module_tasks = [task for task in plan if task.template_name == "module-pom.xml.j2"]
+        self.assertEqual([task.context["module"]["name"] for task in module_tasks], ["demo-api", "demo-service"])
+        self.assertNotIn("Application.java.j2", [task.template_name for task in plan])
+        self.assertIn("mapper/UserMapper.xml.j2", [task.template_name for task in plan])
+    
+    def test_parallel_matches_sequential(self):
+        """测试并发渲染与单线程渲染输出一致"""
+        outputs = []
+        for workers in (1, 4):
+            output_dir = str(Path(self.output_dir) / f"workers-{workers}")
+            project_path = Path(self._new_generator(workers).generate_from_config(
+                make_project_config(output_dir), use_sequential_naming=False
+            ))
+            outputs.append({
+                str(path.relative_to(project_path)): path.read_text(encoding='utf-8')
+                for path in project_path.rglob("*") if path.is_file() and path.name != MANIFEST_FILE_NAME
+            })
+        
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(len(outputs[0]), 12)
+        self.assertEqual(outputs[0]["pom.xml"], "pom.xml.j2: demo-project")
+    
+    def test_regenerate_reports_summary(self):
+        """测试原地重新生成时只写入变化的文件并删除不再生成的文件"""
+        generator = self._new_generator()
+        generator.generate_from_config(make_project_config(self.output_dir), use_sequential_naming=False)
+        self.assertEqual(generator.last_summary.counts()["added"], 12)
+        
+        generator.generate_from_config(make_project_config(self.output_dir, generate_docker=False),
+                                       use_sequential_naming=False)
+        counts = generator.last_summary.counts()
+        self.assertEqual(counts["unchanged"], 10)
+        self.assertEqual(sorted(generator.last_summary.removed), ["Dockerfile", "docker-compose.yml"])
+        self.assertFalse((Path(self.output_dir) / "demo-project" / "Dockerfile").exists())
+    
+    def test_generate_in_memory(self):
+        """测试在内存中生成项目，不写入输出目录"""
+        tree = self._new_generator().generate_in_memory(make_project_config(self.output_dir))
+        
+        self.assertEqual(len(tree), 12)
+        self.assertEqual(tree.read_text("pom.xml"), "pom.xml.j2: demo-project")
+        self.assertIn("src/test/resources", tree.list_directories())
+        self.assertFalse(Path(self.output_dir).exists())
+    
+    def test_dry_run(self):
+        """测试预演生成只返回输出计划，不创建任何目录或文件"""
+        plan = self._new_generator().dry_run(make_project_config(self.output_dir))
+        
+        self.assertEqual(len(plan.files), 12)
+        sizes = {item.path: item.size for item in plan.files}
+        self.assertEqual(sizes["pom.xml"], len("pom.xml.j2: demo-project"))
+        self.assertTrue(all(item.render_seconds >= 0 for item in plan.files))
+        self.assertIn("src/test/resources", plan.list_directories())
+        self.assertFalse(Path(self.output_dir).exists())
+    
+    def test_generate_multi_module_project(self):
+        """测试多模块项目生成能正常结束并创建每个模块的目录"""
+        modules = [{"name": f"module-{i}"} for i in range(20)]
+        config = make_project_config(self.output_dir, project_type="multi", modules=modules)
+        project_path = Path(self._new_generator().generate_from_config(config, use_sequential_naming=False))
+        
+        for module in modules:
+            self.assertTrue((project_path / module["name"] / "src/main/resources/static").is_dir())
+            self.assertTrue((project_path / module["name"] / "pom.xml").is_file())
+    
+    def test_streaming_render_keeps_memory_flat(self):
+        """测试流式渲染大文件时内存峰值远小于输出大小"""
+        import tracemalloc
+        from scripts.core.output_writer import OutputWriter
+        
+        # 需要修改模板，关闭环境共享
+        generator = ProjectGenerator(template_manager=self.template_manager, use_bytecode_cache=False,
+                                     shared_environment=False)
+        generator.templates["big.j2"] = "{% for i in range(n) %}line {{ i }} of the generated file\n{% endfor %}"
+        generator.jinja_env.get_template("big.j2")
+        root = Path(self.output_dir) / "big-project"
+        root.mkdir(parents=True)
+        
+        tracemalloc.start()
+        try:
+            plan = [RenderTask("big.j2", {"n": 100000}, root / "big.txt")]
+            generator.execute_render_plan(plan, writer=OutputWriter(root))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        
+        size = (root / "big.txt").stat().st_size
+        self.assertGreater(size, 3_000_000)
+        self.assertLess(peak, size // 10)
+    
+    def test_missing_template_fails_before_writing(self):
+        """测试模板缺失时在写入任何文件前失败"""
+        generator = self._new_generator()
+        project_path = Path(self.output_dir) / "demo-project"
+        plan = [
+            RenderTask("README.md.j2", {"config": {"name": "demo"}}, project_path / "README.md"),
+            RenderTask("missing.j2", {"config": {"name": "demo"}}, project_path / "missing.txt")
+        ]
+        
+        from jinja2 import TemplateNotFound
+        with self.assertRaises(TemplateNotFound):
+            generator.execute_render_plan(plan)
+        self.assertFalse((project_path / "README.md").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
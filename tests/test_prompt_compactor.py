@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 提示词精简测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.cache_layout import project_section, split_prefix
+from scripts.core.prompt_compactor import (
+    PromptCompactor, SHARED_CONTEXT_FILE, extract_shared, drop_duplicate_sections, trim_to_budget, split_blocks
+)
+from scripts.utils.token_counter import estimate_tokens
+
+
+class TestPromptCompactor(unittest.TestCase):
+    """提示词精简测试类"""
+    
+    def test_split_blocks_keeps_code_fences(self):
+        """测试代码块内的空行不切分"""
+        blocks = split_blocks("# 标题\n\n```\na\n\nb\n```\n\n正文\n")
+        self.assertEqual(blocks, [["# 标题"], ["```", "a", "", "b", "```"], ["正文"]])
+    
+    def test_extract_shared_replaces_with_reference(self):
+        """测试共享说明整块删除并合并为一行引用"""
+        text = (
+            "# 用户需求\n\n"
+            "### 项目创建位置\n**必须在新的文件夹中创建项目。**\n\n"
+            "**禁止在当前目录直接生成项目文件。**\n\n"
+            "## 其他要求\n保持代码整洁\n"
+        )
+        compacted, anchors = extract_shared(text)
+        
+        self.assertEqual(anchors, ["project-location"])
+        self.assertEqual(compacted, (
+            "# 用户需求\n\n"
+            f"> 📎 见 项目创建位置（{SHARED_CONTEXT_FILE}#project-location）\n\n"
+            "## 其他要求\n保持代码整洁\n"
+        ))
+    
+    def test_extract_shared_keeps_unrelated_lines(self):
+        """测试部分匹配时保留其余行，冒号结尾的匹配行连同其后的列表一起移除"""
+        text = (
+            "**配置信息读取：**\n"
+            "所有项目配置信息请从config.json文件中动态读取，包括：\n"
+            "- 项目名称、包名\n"
+            "- 技术栈配置\n"
+            "请按执行计划生成项目。\n"
+        )
+        compacted, anchors = extract_shared(text)
+        
+        self.assertEqual(anchors, ["config-source"])
+        self.assertEqual(compacted, (
+            "**配置信息读取：**\n"
+            "请按执行计划生成项目。\n"
+            f"> 📎 见 配置读取规则（{SHARED_CONTEXT_FILE}#config-source）\n"
+        ))
+    
+    def test_extract_shared_skips_commands_and_code(self):
+        """测试斜杠命令块和代码块不处理"""
+        text = "/user\n请在新的文件夹中创建项目\n\n```\n当前目录直接创建\n```\n"
+        self.assertEqual(extract_shared(text), (text, []))
+    
+    def test_drop_duplicate_sections(self):
+        """测试完全重复的章节（含子章节）只保留第一次出现"""
+        text = (
+            "# 计划\n\n## 注意\n- a\n\n### 细节\n- b\n\n"
+            "## 步骤\n- c\n\n"
+            "## 注意\n- a\n\n### 细节\n- b\n\n"
+            "## 注意\n- 不同内容\n"
+        )
+        compacted, duplicates = drop_duplicate_sections(text)
+        
+        self.assertEqual(duplicates, ["注意"])
+        self.assertEqual(compacted, "# 计划\n\n## 注意\n- a\n\n### 细节\n- b\n\n## 步骤\n- c\n\n## 注意\n- 不同内容\n")
+    
+    def test_trim_to_budget_by_priority(self):
+        """测试按优先级裁剪：先删低优先级章节，文件标题章节不删"""
+        text = (
+            "# 标题\n\n开头说明\n\n"
+            "## 核心要求\n" + "必须遵守的规则。" * 20 + "\n\n"
+            "## 示例代码\n" + "示例内容。" * 40 + "\n\n"
+            "## 注意事项\n" + "注意内容。" * 20 + "\n"
+        )
+        budget = estimate_tokens(text) - 100
+        compacted, trimmed = trim_to_budget(text, budget)
+        
+        self.assertEqual(trimmed, ["示例代码"])
+        self.assertIn("## 注意事项", compacted)
+        self.assertIn("省略章节：示例代码", compacted)
+        self.assertLessEqual(estimate_tokens(compacted), budget)
+        
+        # 预算过小时只保留文件标题章节
+        compacted, trimmed = trim_to_budget(text, 1)
+        self.assertEqual(trimmed, ["示例代码", "注意事项", "核心要求"])
+        self.assertTrue(compacted.startswith("# 标题\n\n开头说明\n\n"))
+    
+    def test_trim_keeps_project_section(self):
+        """测试缓存友好布局的项目专属内容从不裁剪"""
+        project = project_section([("project_name", "demo")])
+        text = "# 标题\n\n## 示例代码\n" + "示例内容。" * 40 + "\n\n" + project
+        
+        compacted, trimmed = trim_to_budget(text, 1)
+        self.assertEqual(trimmed, ["示例代码"])
+        self.assertTrue(compacted.endswith(project))
+        self.assertEqual(split_prefix(compacted)[1], project)
+    
+    def test_within_budget_unchanged(self):
+        """测试未超出预算时不裁剪"""
+        self.assertEqual(trim_to_budget("# 标题\n", 100), ("# 标题\n", []))
+    
+    def test_compact_report(self):
+        """测试精简报告和按产物指定的预算"""
+        contents = {
+            "a.md": "# A\n\n**必须在新的文件夹中创建项目。**\n\n## 示例\n" + "示例。" * 50 + "\n",
+            "b.md": "# B\n\n正文\n"
+        }
+        result = PromptCompactor({"a.md": 20}).compact(contents, "demo")
+        
+        report = {item.name: item for item in result.artifacts}
+        self.assertEqual(report["a.md"].shared, ["project-location"])
+        self.assertEqual(report["a.md"].trimmed, ["示例"])
+        self.assertIsNone(report["b.md"].budget)
+        self.assertEqual(result.contents["b.md"], contents["b.md"])
+        self.assertIn("demo/src/main/java/...", result.shared_content)
+        
+        data = result.to_dict()
+        self.assertEqual(data["shared_file"], SHARED_CONTEXT_FILE)
+        self.assertEqual(data["tokens_after"], sum(item.tokens_after for item in result.artifacts) + result.shared_tokens)
+        self.assertIn("tokens", result.describe())
+
+
+if __name__ == '__main__':
+    unittest.main()
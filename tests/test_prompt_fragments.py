@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 提示词片段模板测试
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.context_generator import ContextGenerator
+from scripts.core.prompt_fragments import (
+    FragmentTemplate, FRAGMENTS_DIR, load_fragment_template, render_fragments,
+    clear_fragment_cache, get_fragment_stats
+)
+
+
+class TestFragmentTemplate(unittest.TestCase):
+    """片段模板测试类"""
+    
+    def test_split_fragments_and_slots(self):
+        """测试切分静态片段和槽位"""
+        template = FragmentTemplate("a ${x} b $y c ${x}")
+        
+        self.assertEqual(template.fragments, ("a ", " b ", " c ", ""))
+        self.assertEqual(template.slots, ("x", "y", "x"))
+        self.assertEqual(template.render({"x": 1, "y": "Y"}), "a 1 b Y c 1")
+    
+    def test_static_text_is_literal(self):
+        """测试静态文本原样输出：$$ 为字面量 $，大括号和引号不做处理"""
+        template = FragmentTemplate("cost $$5 {{x}} {y} '\"\\ ${name}")
+        
+        self.assertEqual(template.render({"name": "n"}), "cost $5 {{x}} {y} '\"\\ n")
+        self.assertEqual(FragmentTemplate("no slots {}").render({}), "no slots {}")
+    
+    def test_invalid_placeholder(self):
+        """测试无效占位符报错"""
+        with self.assertRaises(ValueError):
+            FragmentTemplate("line\n$ 1", "bad.md")
+    
+    def test_missing_slot(self):
+        """测试缺少槽位值时报错"""
+        with self.assertRaises(ValueError):
+            FragmentTemplate("${a}${b}", "t.md").render({"a": 1})
+
+
+class TestFragmentCache(unittest.TestCase):
+    """片段模板缓存测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "greeting.md").write_text("hello ${name}\n", encoding='utf-8')
+        clear_fragment_cache()
+    
+    def tearDown(self):
+        """测试清理"""
+        clear_fragment_cache()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_template_loaded_once(self):
+        """测试模板文件未修改时在进程内只读取一次"""
+        first = load_fragment_template("greeting.md", self.temp_dir)
+        second = load_fragment_template("greeting.md", self.temp_dir)
+        
+        self.assertIs(first, second)
+        self.assertEqual(render_fragments("greeting.md", {"name": "a"}, self.temp_dir), "hello a\n")
+        self.assertEqual(get_fragment_stats(), {"loads": 1, "size": 1})
+    
+    def test_modified_template_reloaded(self):
+        """测试模板文件修改后重新读取，源码哈希随之变化"""
+        path = self.temp_dir / "greeting.md"
+        first = load_fragment_template("greeting.md", self.temp_dir)
+        path.write_text("changed ${name}\n", encoding='utf-8')
+        os.utime(path, ns=(first.signature[0] + 10 ** 9, first.signature[0] + 10 ** 9))
+        
+        second = load_fragment_template("greeting.md", self.temp_dir)
+        self.assertIsNot(first, second)
+        self.assertNotEqual(first.source_hash, second.source_hash)
+        self.assertEqual(render_fragments("greeting.md", {"name": "a"}, self.temp_dir), "changed a\n")
+        self.assertEqual(get_fragment_stats(), {"loads": 2, "size": 1})
+    
+    def test_missing_template(self):
+        """测试模板不存在"""
+        with self.assertRaises(FileNotFoundError):
+            load_fragment_template("missing.md", self.temp_dir)
+
+
+class TestContextFragments(unittest.TestCase):
+    """上下文产物片段模板测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.generator = ContextGenerator(output_base_dir=self.temp_dir, verbose=False)
+        self.config = {
+            'project_name': 'fragment-demo',
+            'package_name': 'com.example.fragment',
+            'version': '2.0.0',
+            'description': 'Fragment $demo {x}',
+            'jdk_version': '21',
+            'build_tool': 'Gradle',
+            'spring_boot_version': '3.2.0',
+            'database': 'PostgreSQL',
+            'orm_framework': 'JPA',
+            'cache': '无缓存',
+            'message_queue': 'Kafka',
+            'generate_sample_code': True,
+            'generate_tests': False,
+            'generate_docker': True,
+            'generate_readme': False
+        }
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_all_fragment_templates_compile(self):
+        """测试随程序发布的片段模板都能切分"""
+        names = sorted(path.name for path in FRAGMENTS_DIR.iterdir() if path.is_file())
+        self.assertEqual(names, [
+            "execution_plan.md", "project_generator.bundle.claude", "project_generator.bundle.gemini",
+            "project_generator.claude", "project_generator.gemini", "project_structure.md", "shared_context.md",
+            "user_prompt.md"
+        ])
+        for name in names:
+            load_fragment_template(name)
+    
+    def test_execution_plan_slots(self):
+        """测试执行计划填充配置槽位"""
+        plan = self.generator._build_execution_plan(self.config, generated_at='2024-01-01 00:00:00')
+        
+        self.assertIn('> 生成时间: 2024-01-01 00:00:00', plan)
+        self.assertIn('src/test/java/com/example/fragment/', plan)
+        self.assertIn('├── FragmentdemoApplicationTests.java', plan)
+        self.assertIn('- 项目描述: `Fragment $demo {x}`', plan)
+        self.assertIn('- JDK版本: Java 21', plan)
+        self.assertIn('- 示例代码: 是', plan)
+        self.assertIn('- 测试代码: 否', plan)
+        self.assertNotIn('${', plan)
+    
+    def test_commands_slots(self):
+        """测试斜杠命令填充项目名称"""
+        for builder in (self.generator._build_gemini_commands, self.generator._build_claude_commands):
+            commands = builder(self.config)
+            self.assertIn('fragment-demo/src/main/java/...', commands)
+            self.assertNotIn('${', commands)
+    
+    def test_user_prompt_is_static(self):
+        """测试用户提示词不依赖配置"""
+        other = dict(self.config, project_name='other')
+        self.assertEqual(self.generator._build_user_prompt(self.config), self.generator._build_user_prompt(other))
+
+
+if __name__ == '__main__':
+    unittest.main()
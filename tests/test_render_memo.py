@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 渲染缓存测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.render_memo import RenderMemo, config_fingerprint
+
+
+class TestRenderMemo(unittest.TestCase):
+    """渲染缓存测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.memo = RenderMemo(max_entries=2)
+        self.calls = []
+    
+    def render(self, value):
+        """记录调用次数的渲染函数"""
+        def _render():
+            self.calls.append(value)
+            return value.upper()
+        return _render
+    
+    def test_hit_and_miss(self):
+        """测试命中时不重新渲染"""
+        self.assertEqual(self.memo.get_or_render("a", self.render("a")), "A")
+        self.assertEqual(self.memo.get_or_render("a", self.render("a")), "A")
+        
+        stats = self.memo.get_stats()
+        self.assertEqual(self.calls, ["a"])
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+    
+    def test_lru_eviction(self):
+        """测试超出容量时淘汰最久未使用的条目"""
+        self.memo.get_or_render("a", self.render("a"))
+        self.memo.get_or_render("b", self.render("b"))
+        self.memo.get_or_render("a", self.render("a"))
+        self.memo.get_or_render("c", self.render("c"))
+        
+        # b 最久未使用，已被淘汰
+        self.memo.get_or_render("a", self.render("a"))
+        self.memo.get_or_render("b", self.render("b"))
+        self.assertEqual(self.calls, ["a", "b", "c", "b"])
+        self.assertEqual(self.memo.get_stats()["size"], 2)
+        self.assertEqual(self.memo.get_stats()["evictions"], 2)
+    
+    def test_disabled_memo(self):
+        """测试容量为0时不缓存"""
+        memo = RenderMemo(max_entries=0)
+        memo.get_or_render("a", self.render("a"))
+        memo.get_or_render("a", self.render("a"))
+        self.assertEqual(self.calls, ["a", "a"])
+    
+    def test_config_fingerprint(self):
+        """测试配置指纹与键顺序无关，且只包含指定的键"""
+        config = {"project_name": "demo", "cache": "Redis", "modules": ["a", "b"]}
+        reordered = {"modules": ["a", "b"], "cache": "Redis", "project_name": "demo"}
+        self.assertEqual(config_fingerprint(config), config_fingerprint(reordered))
+        self.assertNotEqual(config_fingerprint(config), config_fingerprint(dict(config, modules=["b", "a"])))
+        
+        changed = dict(config, cache="无缓存")
+        self.assertEqual(config_fingerprint(config, ["project_name"]), config_fingerprint(changed, ["project_name"]))
+        self.assertNotEqual(config_fingerprint(config, ["cache"]), config_fingerprint(changed, ["cache"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
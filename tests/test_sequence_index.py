@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 序号索引测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.sequence_index import SequenceIndex, INDEX_DIR_NAME
+
+
+def allocate_in_process(output_dir):
+    """进程池任务：在独立进程中分配序号"""
+    return SequenceIndex(output_dir).allocate("demo")
+
+
+class TestSequenceIndex(unittest.TestCase):
+    """序号索引测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = SequenceIndex(self.temp_dir)
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_sequential_allocation(self):
+        """测试按项目名称独立递增"""
+        self.assertEqual(self.index.allocate("demo"), 1)
+        self.assertEqual(self.index.allocate("demo"), 2)
+        self.assertEqual(self.index.allocate("other"), 1)
+        
+        self.assertEqual(self.index.counter_path("demo").read_text(encoding='utf-8'), "2")
+        self.assertEqual(self.index.counter_path("other").read_text(encoding='utf-8'), "1")
+    
+    def test_allocate_touches_only_own_counter(self):
+        """测试分配序号只改写该项目的计数文件"""
+        for index in range(50):
+            self.index.allocate(f"project-{index}")
+        other = self.index.counter_path("project-0")
+        mtime = other.stat().st_mtime_ns
+        
+        self.index.allocate("demo")
+        self.index.allocate("demo")
+        
+        self.assertEqual(other.stat().st_mtime_ns, mtime)
+        self.assertEqual(len(list((Path(self.temp_dir) / INDEX_DIR_NAME).iterdir())), 51)
+    
+    def test_unusual_project_name(self):
+        """测试包含路径分隔符等字符的项目名称使用编码后的计数文件名"""
+        self.assertEqual(self.index.allocate("a/b c"), 1)
+        self.assertEqual(self.index.counter_path("a/b c").parent, Path(self.temp_dir) / INDEX_DIR_NAME)
+        self.assertTrue(self.index.counter_path("a/b c").is_file())
+    
+    def test_scan_once_when_counter_missing(self):
+        """测试计数文件缺失时扫描已有目录恢复序号"""
+        for name in ("3-demo", "7-demo", "demo", "2-my-app", ".5-demo.staging-1-abc"):
+            (Path(self.temp_dir) / name).mkdir()
+        
+        self.assertEqual(self.index.allocate("demo"), 8)
+        self.assertEqual(self.index.allocate("my-app"), 3)
+        
+        # 计数目录存在后不再扫描目录
+        (Path(self.temp_dir) / "20-demo").mkdir()
+        self.assertEqual(self.index.allocate("demo"), 9)
+    
+    def test_skip_existing_directory(self):
+        """测试不会分配到已存在的目录"""
+        self.index.allocate("demo")
+        (Path(self.temp_dir) / "2-demo").mkdir()
+        self.assertEqual(self.index.allocate("demo"), 3)
+    
+    def test_concurrent_threads_unique(self):
+        """测试多线程并发分配序号不重复"""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sequences = list(executor.map(lambda _: SequenceIndex(self.temp_dir).allocate("demo"), range(40)))
+        self.assertEqual(sorted(sequences), list(range(1, 41)))
+    
+    def test_concurrent_processes_unique(self):
+        """测试多进程并发分配序号不重复"""
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            sequences = list(executor.map(allocate_in_process, [self.temp_dir] * 20))
+        self.assertEqual(sorted(sequences), list(range(1, 21)))
+
+
+if __name__ == '__main__':
+    unittest.main()
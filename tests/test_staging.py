@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 暂存输出测试
+"""
+
+import unittest
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.staging import StagedOutput, remove_stale_staging_dirs, is_staging_name
+from scripts.core.output_writer import OutputWriter
+from scripts.utils.file_utils import FSYNC_NONE, fsync_tree
+
+
+class TestStagedOutput(unittest.TestCase):
+    """暂存输出测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.target = Path(self.temp_dir) / "demo"
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def _entries(self):
+        return sorted(item.name for item in Path(self.temp_dir).iterdir())
+    
+    def test_commit_new_directory(self):
+        """测试首次生成提交后目标目录出现，暂存目录消失"""
+        with StagedOutput(self.target) as staging_dir:
+            self.assertTrue(is_staging_name(staging_dir.name))
+            self.assertFalse(self.target.exists())
+            (staging_dir / "README.md").write_text("# demo", encoding='utf-8')
+        
+        self.assertEqual((self.target / "README.md").read_text(encoding='utf-8'), "# demo")
+        self.assertEqual(self._entries(), ["demo"])
+    
+    def test_exception_keeps_previous_output(self):
+        """测试生成失败时保留原有输出并删除暂存目录"""
+        self.target.mkdir()
+        (self.target / "README.md").write_text("# old", encoding='utf-8')
+        
+        with self.assertRaises(RuntimeError):
+            with StagedOutput(self.target, FSYNC_NONE) as staging_dir:
+                (staging_dir / "README.md").unlink()
+                (staging_dir / "README.md").write_text("# half", encoding='utf-8')
+                raise RuntimeError("boom")
+        
+        self.assertEqual((self.target / "README.md").read_text(encoding='utf-8'), "# old")
+        self.assertEqual(self._entries(), ["demo"])
+    
+    def test_keyboard_interrupt_discards_staging(self):
+        """测试Ctrl+C中断时不留下半成品目录"""
+        with self.assertRaises(KeyboardInterrupt):
+            with StagedOutput(self.target, FSYNC_NONE) as staging_dir:
+                (staging_dir / "README.md").write_text("# half", encoding='utf-8')
+                raise KeyboardInterrupt()
+        
+        self.assertEqual(self._entries(), [])
+    
+    def test_regenerate_preserves_unchanged_files(self):
+        """测试替换已有目录时未变化文件保持原mtime，旧文件不被原地修改"""
+        for content in ("# v1", "# v2"):
+            with StagedOutput(self.target, FSYNC_NONE) as staging_dir:
+                writer = OutputWriter(staging_dir)
+                writer.write_text("config.json", "{}")
+                writer.write_text("README.md", content)
+                writer.finalize()
+            
+            if content == "# v1":
+                os.utime(self.target / "config.json", ns=(1000, 1000))
+                old_readme = os.open(self.target / "README.md", os.O_RDONLY)
+        
+        try:
+            # 旧版本文件通过打开的描述符仍能读到原内容，说明变化的文件是新写入而非原地修改
+            self.assertEqual(os.read(old_readme, 100), b"# v1")
+        finally:
+            os.close(old_readme)
+        
+        self.assertEqual((self.target / "README.md").read_text(encoding='utf-8'), "# v2")
+        self.assertEqual((self.target / "config.json").stat().st_mtime_ns, 1000)
+        self.assertEqual(self._entries(), ["demo"])
+    
+    def test_batch_fsync_only_written_files(self):
+        """测试batch策略只同步本次写入的文件和暂存目录项，不发起系统级同步"""
+        self.target.mkdir()
+        (self.target / "old.txt").write_text("old", encoding='utf-8')
+        
+        with patch('scripts.utils.file_utils._fsync_file') as fsync_file, \
+                patch('scripts.utils.file_utils.fsync_directory') as fsync_directory, \
+                patch('os.sync', create=True) as os_sync:
+            staged = StagedOutput(self.target)
+            with staged as staging_dir:
+                writer = OutputWriter(staging_dir)
+                writer.write_text("sub/new.txt", "new")
+                writer.finalize()
+                staged.written = writer.written_paths()
+        
+        synced = sorted(Path(call.args[0]).name for call in fsync_file.call_args_list)
+        self.assertEqual(synced, [".generation-manifest.json", "new.txt"])
+        directories = [Path(call.args[0]) for call in fsync_directory.call_args_list]
+        self.assertEqual([path.name for path in directories], ["sub", staging_dir.name])
+        os_sync.assert_not_called()
+        self.assertEqual((self.target / "sub" / "new.txt").read_text(encoding='utf-8'), "new")
+    
+    def test_fsync_tree_without_file_list(self):
+        """测试未给出文件列表时同步目录树中的全部文件"""
+        (Path(self.temp_dir) / "a").mkdir()
+        (Path(self.temp_dir) / "a" / "one.txt").write_text("1", encoding='utf-8')
+        (Path(self.temp_dir) / "two.txt").write_text("2", encoding='utf-8')
+        
+        with patch('scripts.utils.file_utils._fsync_file') as fsync_file:
+            fsync_tree(self.temp_dir)
+        
+        synced = sorted(Path(call.args[0]).name for call in fsync_file.call_args_list)
+        self.assertEqual(synced, ["one.txt", "two.txt"])
+    
+    @patch('scripts.core.staging._pid_alive', return_value=False)
+    def test_remove_stale_staging_dirs(self, mock_alive):
+        """测试清理已退出进程遗留的暂存目录"""
+        (Path(self.temp_dir) / ".demo.staging-999999-abcdef12").mkdir()
+        (Path(self.temp_dir) / ".other.staging-999999-abcdef12").mkdir()
+        
+        self.assertEqual(remove_stale_staging_dirs(self.temp_dir, "demo"), 1)
+        self.assertEqual(self._entries(), [".other.staging-999999-abcdef12"])
+
+
+if __name__ == '__main__':
+    unittest.main()
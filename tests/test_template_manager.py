@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 模板管理器测试
+"""
+
+import unittest
+import os
+import json
+import hashlib
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.template_manager import TemplateManager
+
+
+TEMPLATE_CONTENT = """# Spring Boot 模板库
+
+说明文字，包含中文字符。
+
+### pom.xml.j2
+```jinja2
+<project>
+  <name>{{ config.name }}</name>
+</project>
+```
+
+### README.md.j2
+```jinja2
+# {{ config.name }}
+
+项目描述：{{ config.description }}
+```
+
+### .gitignore.j2
+```jinja2
+target/
+```
+"""
+
+
+class TestTemplateManagerIndex(unittest.TestCase):
+    """模板索引测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = TemplateManager(self.temp_dir)
+        self.manager.save_template(TEMPLATE_CONTENT, "spring-boot-templates")
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_extract_templates_matches_regex(self):
+        """测试索引提取结果与全文正则提取一致"""
+        expected = self.manager.extract_templates_from_markdown(TEMPLATE_CONTENT)
+        self.assertEqual(self.manager.extract_templates("spring-boot-templates"), expected)
+        self.assertEqual(len(expected), 3)
+    
+    def test_index_file_written(self):
+        """测试索引文件保存在模板旁边"""
+        self.manager.get_template_index("spring-boot-templates")
+        index_file = Path(self.temp_dir) / "spring-boot-templates.index.json"
+        self.assertTrue(index_file.exists())
+        
+        with open(index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        names = [entry["name"] for entry in index["templates"]]
+        self.assertEqual(names, ["pom.xml.j2", "README.md.j2", ".gitignore.j2"])
+        for entry in index["templates"]:
+            self.assertIn("offset", entry)
+            self.assertIn("length", entry)
+            self.assertEqual(len(entry["sha256"]), 64)
+        
+        # 索引文件不应被当作模板列出
+        self.assertEqual(self.manager.list_templates(), ["spring-boot-templates"])
+    
+    def test_unicode_whitespace_matches_regex(self):
+        """测试全角空格等Unicode空白的处理与全文正则提取一致"""
+        content = (TEMPLATE_CONTENT
+                   + "\n### banner.txt.j2\u3000\n```jinja2\n\u3000{{ config.name }}\u3000\n```\n"
+                   + "\n### application.yml.j2\n```jinja2\n\u3000\nserver:\n  port: 8080\u3000\n```\n")
+        self.manager.save_template(content, "unicode-templates")
+        
+        expected = self.manager.extract_templates_from_markdown(content)
+        self.assertEqual(expected["banner.txt.j2"], "{{ config.name }}")
+        self.assertEqual(self.manager.extract_templates("unicode-templates"), expected)
+        self.assertEqual(self.manager.load_template_block("unicode-templates", "application.yml.j2"),
+                         "server:\n  port: 8080")
+        self.assertEqual(self.manager.get_template_block_hash("unicode-templates", "banner.txt.j2"),
+                         hashlib.sha256("{{ config.name }}".encode('utf-8')).hexdigest())
+    
+    def test_load_single_block(self):
+        """测试按索引加载单个模板块"""
+        content = self.manager.load_template_block("spring-boot-templates", "README.md.j2")
+        self.assertEqual(content, "# {{ config.name }}\n\n项目描述：{{ config.description }}")
+        
+        with self.assertRaises(FileNotFoundError):
+            self.manager.load_template_block("spring-boot-templates", "missing.j2")
+    
+    def test_index_invalidated_on_change(self):
+        """测试模板文件变化后索引自动重建"""
+        self.manager.get_template_index("spring-boot-templates")
+        
+        changed = TEMPLATE_CONTENT + "\n### Dockerfile.j2\n```jinja2\nFROM openjdk:17\n```\n"
+        self.manager.save_template(changed, "spring-boot-templates")
+        template_file = Path(self.temp_dir) / "spring-boot-templates.md"
+        os.utime(template_file, ns=(1, 1))
+        
+        self.assertIn("Dockerfile.j2", self.manager.list_template_blocks("spring-boot-templates"))
+        self.assertEqual(
+            self.manager.load_template_block("spring-boot-templates", "Dockerfile.j2"),
+            "FROM openjdk:17"
+        )
+    
+    def test_get_template_info_from_index(self):
+        """测试模板信息取自索引"""
+        info = self.manager.get_template_info("spring-boot-templates")
+        
+        self.assertEqual(info["template_count"], 3)
+        self.assertEqual(info["template_names"], ["pom.xml.j2", "README.md.j2", ".gitignore.j2"])
+        self.assertEqual(info["file_size"], len(TEMPLATE_CONTENT.encode('utf-8')))
+        self.assertEqual(info["content_preview"], TEMPLATE_CONTENT[:200] + "...")
+    
+    def test_delete_template_removes_index(self):
+        """测试删除模板时同时删除索引"""
+        self.manager.get_template_index("spring-boot-templates")
+        self.assertTrue(self.manager.delete_template("spring-boot-templates"))
+        self.assertFalse((Path(self.temp_dir) / "spring-boot-templates.index.json").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
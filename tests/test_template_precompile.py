@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 模板预编译测试
+"""
+
+import os
+import shutil
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from jinja2 import Environment, DictLoader, FileSystemLoader
+
+from scripts.core.template_precompile import (
+    PrecompiledLoader, compile_templates, module_file_name, read_source_key
+)
+from scripts.core.project_generator import ProjectGenerator
+from scripts.core.template_manager import TemplateManager
+
+
+class TestPrecompiledLoader(unittest.TestCase):
+    """预编译模板加载器测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.compiled_dir = self.temp_dir / "compiled"
+        self.templates = {"hello.j2": "Hello {{ name|upper }}{% for i in items %}-{{ i }}{% endfor %}"}
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def _new_env(self):
+        loader = PrecompiledLoader(DictLoader(self.templates), self.compiled_dir)
+        return Environment(loader=loader, trim_blocks=True), loader
+    
+    def test_uses_precompiled_module(self):
+        """测试源码未变化时使用预编译模块，渲染结果与常规编译一致"""
+        env, _ = self._new_env()
+        self.assertEqual(compile_templates(env, self.compiled_dir), 1)
+        self.assertTrue((self.compiled_dir / "__init__.py").is_file())
+        self.assertTrue((self.compiled_dir / module_file_name("hello.j2")).is_file())
+        
+        env, loader = self._new_env()
+        rendered = env.get_template("hello.j2").render(name="demo", items=[1, 2])
+        self.assertEqual(rendered, "Hello DEMO-1-2")
+        self.assertEqual(loader.get_stats()["hits"], 1)
+        self.assertEqual(loader.get_stats()["misses"], 0)
+    
+    def test_stale_module_falls_back(self):
+        """测试源码变化后预编译模块失效，改为常规编译"""
+        env, _ = self._new_env()
+        compile_templates(env, self.compiled_dir)
+        
+        self.templates["hello.j2"] = "Bye {{ name }}"
+        env, loader = self._new_env()
+        self.assertEqual(env.get_template("hello.j2").render(name="demo"), "Bye demo")
+        self.assertEqual(loader.get_stats()["misses"], 1)
+    
+    def test_stale_module_not_executed(self):
+        """测试只读取首行源码键判断过期，过期模块不会被执行"""
+        env, _ = self._new_env()
+        compile_templates(env, self.compiled_dir)
+        self.assertIsNotNone(read_source_key(self.compiled_dir / module_file_name("hello.j2")))
+        
+        self.templates["hello.j2"] = "Bye {{ name }}"
+        env, loader = self._new_env()
+        with patch('scripts.core.template_precompile.importlib.util.spec_from_file_location') as spec:
+            self.assertEqual(env.get_template("hello.j2").render(name="demo"), "Bye demo")
+        spec.assert_not_called()
+        self.assertEqual(loader.get_stats()["misses"], 1)
+    
+    def test_module_imported_once_per_name(self):
+        """测试同一模板重复加载时复用已导入的模块"""
+        env, _ = self._new_env()
+        compile_templates(env, self.compiled_dir)
+        
+        loader = PrecompiledLoader(DictLoader(self.templates), self.compiled_dir)
+        env = Environment(loader=loader, trim_blocks=True, cache_size=0)
+        with patch('scripts.core.template_precompile.importlib.util.spec_from_file_location',
+                   wraps=importlib.util.spec_from_file_location) as spec:
+            for _ in range(3):
+                self.assertEqual(env.get_template("hello.j2").render(name="a", items=[]), "Hello A")
+        self.assertEqual(spec.call_count, 1)
+        self.assertEqual(loader.get_stats()["hits"], 3)
+    
+    def test_environment_options_invalidate(self):
+        """测试影响编译结果的环境选项不同时不使用预编译模块"""
+        env, _ = self._new_env()
+        compile_templates(env, self.compiled_dir)
+        
+        loader = PrecompiledLoader(DictLoader(self.templates), self.compiled_dir)
+        env = Environment(loader=loader, trim_blocks=False)
+        env.get_template("hello.j2")
+        self.assertEqual(loader.get_stats()["misses"], 1)
+    
+    def test_auto_reload_after_source_change(self):
+        """测试使用预编译模块后，模板文件修改仍会被重新加载"""
+        templates_dir = self.temp_dir / "templates"
+        templates_dir.mkdir()
+        template_file = templates_dir / "page.md"
+        template_file.write_text("v1 {{ name }}", encoding="utf-8")
+        
+        def new_env():
+            loader = PrecompiledLoader(FileSystemLoader(str(templates_dir)), self.compiled_dir)
+            return Environment(loader=loader), loader
+        
+        env, _ = new_env()
+        compile_templates(env, self.compiled_dir, ["page.md"])
+        
+        env, loader = new_env()
+        self.assertEqual(env.get_template("page.md").render(name="a"), "v1 a")
+        self.assertEqual(loader.get_stats()["hits"], 1)
+        
+        template_file.write_text("v2 {{ name }}", encoding="utf-8")
+        stat = template_file.stat()
+        os.utime(template_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(env.get_template("page.md").render(name="a"), "v2 a")
+
+
+class TestProjectGeneratorPrecompiled(unittest.TestCase):
+    """项目生成器预编译模板测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.template_manager = TemplateManager(str(self.temp_dir / "templates"))
+        self.compiled_dir = self.temp_dir / "compiled"
+    
+    def tearDown(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+    
+    def _new_generator(self):
+        return ProjectGenerator(template_manager=self.template_manager, use_bytecode_cache=False,
+                                precompiled_dir=str(self.compiled_dir))
+    
+    def test_compile_and_render(self):
+        """测试预编译全部模板后渲染时全部命中"""
+        count = self._new_generator().compile_templates()
+        
+        generator = self._new_generator()
+        for name in generator.templates:
+            generator.jinja_env.get_template(name)
+        stats = generator.precompiled_loader.get_stats()
+        self.assertEqual(stats["hits"], count)
+        self.assertEqual(stats["misses"], 0)
+    
+    def test_disabled(self):
+        """测试关闭预编译时使用常规加载器"""
+        generator = ProjectGenerator(template_manager=self.template_manager, use_bytecode_cache=False,
+                                     use_precompiled=False)
+        self.assertIsNone(generator.precompiled_loader)
+        self.assertIsInstance(generator.jinja_env.loader, DictLoader)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - token数估算测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.utils.token_counter import estimate_tokens, estimate_many
+
+
+class TestTokenCounter(unittest.TestCase):
+    """token数估算测试类"""
+    
+    def test_empty_text(self):
+        """测试空文本"""
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens(" \n\t"), 0)
+    
+    def test_character_classes(self):
+        """测试各类字符的估算规则"""
+        self.assertEqual(estimate_tokens("你好世界"), 4)
+        self.assertEqual(estimate_tokens("hello"), 2)
+        self.assertEqual(estimate_tokens("spring boot"), 3)
+        self.assertEqual(estimate_tokens("2024"), 2)
+        self.assertEqual(estimate_tokens("，！#"), 3)
+        self.assertEqual(estimate_tokens("🚀"), 2)
+    
+    def test_mixed_text(self):
+        """测试中英文混排"""
+        self.assertEqual(estimate_tokens("使用Spring Boot 3.2"), 2 + 2 + 1 + 1 + 1 + 1)
+    
+    def test_estimate_many(self):
+        """测试批量估算"""
+        self.assertEqual(estimate_many([("a.md", "你好"), ("b.md", "")]), {"a.md": 2, "b.md": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 性能追踪测试
+"""
+
+import unittest
+import json
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.utils import tracing
+from scripts.utils.tracing import span, enable_tracing, disable_tracing, get_tracer
+from scripts.core.context_generator import ContextGenerator
+
+
+class TestTracing(unittest.TestCase):
+    """性能追踪测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = tempfile.mkdtemp()
+        disable_tracing()
+    
+    def tearDown(self):
+        """测试清理"""
+        disable_tracing()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_disabled_span_is_shared_noop(self):
+        """测试未启用时返回共享的空区间且不记录事件"""
+        self.assertIsNone(get_tracer())
+        self.assertIs(span("a"), span("b", path="x"))
+        with span("a"):
+            pass
+        self.assertIsNone(get_tracer())
+    
+    def test_nested_spans(self):
+        """测试嵌套区间的时间范围包含关系"""
+        tracer = enable_tracing()
+        with span("outer"):
+            with span("inner", path="a.txt"):
+                pass
+        
+        outer, inner = tracer.events
+        self.assertEqual((outer["name"], inner["name"]), ("outer", "inner"))
+        self.assertEqual(inner["args"], {"path": "a.txt"})
+        self.assertEqual(outer["ph"], "X")
+        self.assertLessEqual(outer["ts"], inner["ts"])
+        self.assertGreaterEqual(outer["ts"] + outer["dur"], inner["ts"] + inner["dur"])
+    
+    def test_span_recorded_on_exception(self):
+        """测试异常退出时仍记录区间"""
+        tracer = enable_tracing()
+        with self.assertRaises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+        self.assertEqual([event["name"] for event in tracer.events], ["failing"])
+    
+    def test_write_chrome_trace(self):
+        """测试生成上下文工程并导出Chrome trace文件"""
+        tracer = enable_tracing()
+        generator = ContextGenerator(output_base_dir=self.temp_dir, verbose=False)
+        generator.generate({
+            'project_name': 'trace-demo',
+            'package_name': 'com.example.demo',
+            'version': '1.0.0',
+            'description': 'Trace demo',
+            'jdk_version': '17',
+            'build_tool': 'Maven',
+            'spring_boot_version': '3.2.0',
+            'database': 'MySQL',
+            'orm_framework': 'MyBatis',
+            'cache': 'Redis',
+            'message_queue': '无消息队列',
+            'include_swagger': True,
+            'include_security': False,
+            'include_actuator': True,
+            'generate_sample_code': True,
+            'generate_tests': True,
+            'generate_docker': True,
+            'generate_readme': True,
+            'is_multi_module': False,
+            'modules': []
+        })
+        
+        trace_file = Path(self.temp_dir) / "trace.json"
+        tracer.write(str(trace_file))
+        with open(trace_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        names = [event["name"] for event in data["traceEvents"]]
+        self.assertIn("context.generate", names)
+        self.assertEqual(names.count("context.render"), 7)
+        self.assertEqual(names.count("write"), 9)
+        self.assertIs(tracing.disable_tracing(), tracer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例 - 监视模式测试
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.core.context_generator import ContextGenerator
+from scripts.core.watcher import ChangeWatcher, WatchSession, WatchCycleResult
+from scripts.core.prompt_fragments import FRAGMENTS_DIR, clear_fragment_cache
+
+
+def touch(path, content):
+    """写入文件并推进修改时间，避免文件系统时间精度导致变化未被发现"""
+    path = Path(path)
+    previous = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(content, encoding='utf-8')
+    mtime = max(path.stat().st_mtime_ns, previous + 1_000_000_000)
+    os.utime(path, ns=(mtime, mtime))
+
+
+class TestChangeWatcher(unittest.TestCase):
+    """文件变化监视器测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.templates_dir = self.temp_dir / "templates"
+        self.templates_dir.mkdir()
+        self.config_file = self.temp_dir / "config.json"
+        touch(self.config_file, "{}")
+        touch(self.templates_dir / "a.md", "a")
+        
+        self.watcher = ChangeWatcher(
+            files=[self.config_file],
+            directories=[self.templates_dir],
+            interval=0.01,
+            debounce=0.05
+        )
+    
+    def tearDown(self):
+        """测试清理"""
+        self.watcher.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_poll_changes(self):
+        """测试发现修改、新增和删除的文件"""
+        self.assertEqual(self.watcher.poll_changes(), [])
+        
+        touch(self.config_file, '{"a": 1}')
+        touch(self.templates_dir / "b.md", "b")
+        (self.templates_dir / "a.md").unlink()
+        # 不匹配模式的文件不监视
+        touch(self.templates_dir / "notes.txt", "x")
+        
+        changed = self.watcher.poll_changes()
+        self.assertEqual(changed, sorted([
+            str(self.config_file),
+            str(self.templates_dir / "a.md"),
+            str(self.templates_dir / "b.md")
+        ]))
+        self.assertEqual(self.watcher.poll_changes(), [])
+    
+    def test_recursive_directories(self):
+        """测试递归监视目录中任意扩展名的文件"""
+        fragments_dir = self.temp_dir / "fragments"
+        (fragments_dir / "sub").mkdir(parents=True)
+        touch(fragments_dir / "sub" / "x.claude", "a")
+        watcher = ChangeWatcher(recursive_directories=[fragments_dir], interval=0.01, debounce=0.05)
+        self.addCleanup(watcher.close)
+        
+        touch(fragments_dir / "sub" / "x.claude", "b")
+        self.assertEqual(watcher.poll_changes(), [str(fragments_dir / "sub" / "x.claude")])
+    
+    def test_wait_for_changes_debounces(self):
+        """测试去抖：连续写入合并为一次变化"""
+        def edit():
+            touch(self.config_file, '{"a": 1}')
+            touch(self.templates_dir / "a.md", "a2")
+        
+        timer = threading.Timer(0.05, edit)
+        timer.start()
+        changed = self.watcher.wait_for_changes()
+        timer.join()
+        
+        self.assertEqual(changed, sorted([str(self.config_file), str(self.templates_dir / "a.md")]))
+    
+    def test_wait_for_changes_stops(self):
+        """测试设置停止事件后返回空列表"""
+        stop_event = threading.Event()
+        stop_event.set()
+        self.assertEqual(self.watcher.wait_for_changes(stop_event), [])
+
+
+class TestWatchSession(unittest.TestCase):
+    """监视模式会话测试类"""
+    
+    def setUp(self):
+        """测试初始化"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.generator = ContextGenerator(verbose=False)
+        self.generator.output_base_dir = self.temp_dir / "output"
+        self.generator.templates_dir = self.temp_dir / "templates"
+        self.generator.output_base_dir.mkdir()
+        self.generator.templates_dir.mkdir()
+        
+        self.template_file = self.generator.templates_dir / "system_prompt_template.md"
+        touch(self.template_file, "# {{project_name}} v1\n")
+        if self.generator.jinja_env:
+            from jinja2 import Environment, FileSystemLoader
+            self.generator.jinja_env = Environment(loader=FileSystemLoader(str(self.generator.templates_dir)))
+        
+        self.config = {
+            'project_name': 'watch-project',
+            'package_name': 'com.example.watch',
+            'version': '1.0.0',
+            'description': 'Watch project',
+            'jdk_version': '17',
+            'build_tool': 'Maven',
+            'spring_boot_version': '3.2.0',
+            'database': 'MySQL',
+            'orm_framework': 'MyBatis',
+            'cache': 'Redis',
+            'message_queue': '无消息队列',
+            'include_swagger': True,
+            'include_security': False,
+            'include_actuator': True,
+            'generate_sample_code': True,
+            'generate_tests': True,
+            'generate_docker': True,
+            'generate_readme': True,
+            'is_multi_module': False,
+            'modules': []
+        }
+        self.config_file = self.temp_dir / "watch.json"
+        touch(self.config_file, json.dumps(self.config))
+        
+        self.session = WatchSession([self.config_file], self.generator, interval=0.01, debounce=0.05)
+        # 校验器的提示输出与本测试无关
+        self.print_patcher = patch('scripts.validators.config_validator.console.print')
+        self.print_patcher.start()
+    
+    def tearDown(self):
+        """测试清理"""
+        self.print_patcher.stop()
+        self.session.watcher.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_initial_cycle_renders_everything(self):
+        """测试首轮生成全部产物"""
+        result = self.session.run_cycle()
+        
+        rendered = result.rendered[str(self.config_file)]
+        self.assertEqual(len(rendered), 7)
+        self.assertIn('system_prompt.md', rendered)
+        self.assertTrue((self.generator.output_base_dir / "watch-project" / "system_prompt.md").exists())
+        self.assertEqual(result.errors, {})
+    
+    def test_template_change_rerenders_only_system_prompt(self):
+        """测试模板变化只重新渲染系统提示词"""
+        if not self.generator.jinja_env:
+            self.skipTest("Jinja2不可用，跳过模板测试")
+        self.session.run_cycle()
+        
+        touch(self.template_file, "# {{project_name}} v2\n")
+        result = self.session.run_cycle([str(self.template_file)])
+        
+        self.assertEqual(result.rendered[str(self.config_file)], ['system_prompt.md'])
+        self.assertIn('system_prompt.md', result.written[str(self.config_file)])
+        content = (self.generator.output_base_dir / "watch-project" / "system_prompt.md").read_text(encoding='utf-8')
+        self.assertIn("v2", content)
+    
+    def test_config_change_rerenders_dependent_artifacts(self):
+        """测试配置变化只重新渲染依赖该配置键的产物"""
+        self.session.run_cycle()
+        
+        touch(self.config_file, json.dumps(dict(self.config, include_security=True)))
+        result = self.session.run_cycle([str(self.config_file)])
+        
+        rendered = result.rendered[str(self.config_file)]
+        self.assertIn('system_prompt.md', rendered)
+        self.assertNotIn('user_prompt.md', rendered)
+        self.assertNotIn('project_structure.md', rendered)
+    
+    def test_fragment_change_rerenders_artifact(self):
+        """测试片段模板变化（含 .claude 等非 .md 文件）被发现，只重新渲染使用该片段的产物"""
+        fragments_dir = self.temp_dir / "fragments"
+        shutil.copytree(FRAGMENTS_DIR, fragments_dir)
+        clear_fragment_cache()
+        self.addCleanup(clear_fragment_cache)
+        with patch('scripts.core.watcher.FRAGMENTS_DIR', fragments_dir), \
+                patch('scripts.core.prompt_fragments.FRAGMENTS_DIR', fragments_dir):
+            session = WatchSession([self.config_file], self.generator, interval=0.01, debounce=0.05)
+            self.addCleanup(session.watcher.close)
+            session.run_cycle()
+            
+            for name, artifact in (("user_prompt.md", "user_prompt.md"),
+                                   ("project_generator.claude", "project_generator.claude")):
+                with self.subTest(fragment=name):
+                    path = fragments_dir / name
+                    touch(path, path.read_text(encoding='utf-8') + "\n片段已修改\n")
+                    changed = session.watcher.poll_changes()
+                    self.assertEqual(changed, [str(path)])
+                    
+                    result = session.run_cycle(changed)
+                    self.assertEqual(result.rendered[str(self.config_file)], [artifact])
+                    output = self.generator.output_base_dir / "watch-project" / artifact
+                    self.assertIn("片段已修改", output.read_text(encoding='utf-8'))
+    
+    def test_unrelated_change_skips_configs(self):
+        """测试未监视的配置不重新生成"""
+        result = self.session.run_cycle([str(self.temp_dir / "other.json")])
+        self.assertEqual(result.rendered, {})
+    
+    def test_invalid_config_reports_error(self):
+        """测试配置无效时记录错误并继续监视"""
+        touch(self.config_file, "{not json")
+        result = self.session.run_cycle([str(self.config_file)])
+        
+        self.assertIn(str(self.config_file), result.errors)
+        self.assertIn("失败 1 个", result.describe())
+    
+    def test_unexpected_error_reports_error(self):
+        """测试生成中的任意异常记录为本轮失败，监视不中断，下一轮恢复生成"""
+        with patch.object(self.generator, 'generate', side_effect=KeyError('slot')):
+            result = self.session.run_cycle()
+        self.assertEqual(result.errors, {str(self.config_file): "KeyError: 'slot'"})
+        self.assertEqual(result.rendered, {})
+        
+        result = self.session.run_cycle([str(self.config_file)])
+        self.assertEqual(result.errors, {})
+        self.assertEqual(len(result.rendered[str(self.config_file)]), 7)
+    
+    def test_run_stops_on_event(self):
+        """测试 run 在停止事件设置后返回"""
+        stop_event = threading.Event()
+        results = []
+        
+        def on_cycle(result):
+            results.append(result)
+            if len(results) == 1:
+                touch(self.config_file, json.dumps(dict(self.config, description='changed')))
+            else:
+                stop_event.set()
+        
+        thread = threading.Thread(target=self.session.run, args=(on_cycle, stop_event))
+        thread.start()
+        thread.join(timeout=10)
+        
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[1].changed_paths, [str(self.config_file)])
+        self.assertIsInstance(results[1], WatchCycleResult)
+
+
+if __name__ == '__main__':
+    unittest.main()